@@ -561,6 +561,11 @@ async def list_tools() -> list[Tool]:
                         "type": "string",
                         "description": "File type filter (e.g., 'py', 'js')",
                     },
+                    "count_only": {
+                        "type": "boolean",
+                        "default": False,
+                        "description": "Return per-file reference counts instead of every matching line",
+                    },
                 },
                 "required": ["symbol"],
             },
@@ -2704,28 +2709,30 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
         # Cache successful pairs + Generate agreements
         if arguments["outcome"] == "success" and session and session.query_frame:
             try:
-                from tools.learned_pairs import cache_successful_pair
+                from tools.learned_pairs import cache_successful_pairs
                 from tools.agreements import AgreementData, get_agreements_manager
 
                 qf = session.query_frame
                 repo_path = session.repo_path
 
                 if qf.target_feature and qf.mapped_symbols:
-                    cached_count = 0
+                    # 1. learned_pairs.jsonl に一括追加（書き込みは1回）
+                    cached_count = cache_successful_pairs(
+                        (
+                            (
+                                qf.target_feature,
+                                sym.name,
+                                sym.confidence,
+                                sym.evidence.result_summary if sym.evidence else None,
+                                session_id,
+                            )
+                            for sym in qf.mapped_symbols
+                        ),
+                        project_root=repo_path,
+                    )
                     agreement_files = []
 
                     for sym in qf.mapped_symbols:
-                        # 1. learned_pairs.json に追加
-                        cache_successful_pair(
-                            nl_term=qf.target_feature,
-                            symbol=sym.name,
-                            similarity=sym.confidence,
-                            code_evidence=sym.evidence.result_summary if sym.evidence else None,
-                            session_id=session_id,
-                            project_root=repo_path,
-                        )
-                        cached_count += 1
-
                         # agreements/ に Markdown を生成
                         agreement_data = AgreementData(
                             nl_term=qf.target_feature,
@@ -3313,6 +3320,7 @@ async def call_tool(name: str, arguments: dict) -> list[TextContent]:
             path=arguments.get("path", "."),
             language=arguments.get("language"),
             session=session,
+            count_only=arguments.get("count_only", False),
         )
 
         # Add cache stats to result
@@ -347,6 +347,7 @@ GITIGNORE_ENTRIES="
 .code-intel/sync_state.json
 .code-intel/.last_sync
 .code-intel/learned_pairs.json
+.code-intel/learned_pairs.jsonl
 .code-intel/logs/
 "
 
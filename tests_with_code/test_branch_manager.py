@@ -0,0 +1,343 @@
+"""
+Tests for Branch Manager module.
+
+Tests:
+- Lazily decoded git results
+- Environment passed to git
+- Splitting a multi-file diff into per-file chunks
+- Parsing NUL-delimited `git status` / `git diff --name-status` output
+- Session setup
+- get_changes against a temporary git repository
+- Reverting discarded files in finalize
+- Merging back to the base branch
+- Stale task branch listing and cleanup
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tools import branch_manager
+from tools.branch_manager import BranchManager, _GitResult
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(tmp_path: Path) -> Path:
+    """A git repository on `main` with one initial commit."""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-b", "main")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "Test User")
+    (repo / "a.txt").write_text("a\n")
+    (repo / "b.txt").write_text("b\n")
+    (repo / "bin.dat").write_bytes(b"\x00\x01")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-m", "init")
+    return repo
+
+
+class TestGitResult:
+    """Tests for the lazily decoded git result."""
+
+    def test_decodes_on_access(self):
+        result = _GitResult(["git", "diff"], 0, "é\n".encode(), b"")
+
+        assert result._stdout is None
+        assert (result.stdout, result.stderr) == ("é\n", "")
+        assert result.stdout is result.stdout
+
+
+class TestGitEnv:
+    """Tests for the environment passed to git."""
+
+    @pytest.mark.asyncio
+    async def test_status_skips_optional_locks(self, repo: Path, monkeypatch):
+        """Read-only status does not rewrite the index; the caller's env is kept."""
+        monkeypatch.setenv("BRANCH_MANAGER_TEST", "1")
+        manager = BranchManager(str(repo))
+        (repo / "a.txt").touch()
+        index_mtime = (repo / ".git" / "index").stat().st_mtime_ns
+
+        result = await manager._run_git(["status", "--porcelain=v2"])
+
+        assert result.returncode == 0
+        assert (repo / ".git" / "index").stat().st_mtime_ns == index_mtime
+        assert manager._env["BRANCH_MANAGER_TEST"] == "1"
+        assert manager._env.get("LC_ALL") == os.environ.get("LC_ALL")
+
+    @pytest.mark.asyncio
+    async def test_uses_resolved_git_binary(self, repo: Path, monkeypatch):
+        """Git is run from GIT_BIN, resolved once instead of searched on PATH."""
+        assert Path(BranchManager.GIT_BIN).is_absolute()
+        monkeypatch.setattr(BranchManager, "GIT_BIN", str(repo / "no-such-git"))
+
+        with pytest.raises(FileNotFoundError):
+            await BranchManager(str(repo))._run_git(["status"])
+
+
+class TestSplitDiff:
+    """Tests for per-file diff splitting."""
+
+    def test_split_by_header(self):
+        """Each chunk starts at its diff --git header; paths may contain spaces."""
+        diff = (
+            "diff --git a/x.py b/x.py\n--- a/x.py\n+++ b/x.py\n@@ -1 +1 @@\n-a\n+b\n"
+            "diff --git a/sp ace.txt b/sp ace.txt\nBinary files a/sp ace.txt and b/sp ace.txt differ\n"
+        )
+
+        chunks = BranchManager._split_diff_by_file(diff)
+
+        assert list(chunks) == ["x.py", "sp ace.txt"]
+        assert chunks["x.py"].endswith("+b\n")
+        assert BranchManager._is_binary_diff(chunks["sp ace.txt"])
+        assert not BranchManager._is_binary_diff(chunks["x.py"])
+
+    def test_quoted_paths_are_unquoted(self):
+        """Quoted paths are keyed by the real path."""
+        diff = 'diff --git "a/t\\303\\251 \\"q\\".txt" "b/t\\303\\251 \\"q\\".txt"\n--- x\n'
+
+        assert list(BranchManager._split_diff_by_file(diff)) == ['té "q".txt']
+
+
+class TestParseStatus:
+    """Tests for parsing -z git output."""
+
+    def test_porcelain_v2_records(self):
+        """Ordinary, renamed, unmerged and untracked records map to status letters."""
+        data = b"\0".join([
+            b"1 .M N... 100644 100644 100644 h1 h1 mod ified.txt",
+            b"1 A. N... 000000 100644 100644 h0 h1 added.txt",
+            b"1 AD N... 000000 100644 000000 h0 h1 gone.txt",
+            b"1 .D N... 100644 100644 000000 h1 h1 deleted.txt",
+            b"2 R. N... 100644 100644 100644 h1 h1 R100 new.txt",
+            b"old.txt",
+            b"u UU N... 100644 100644 100644 100644 h1 h2 h3 conflict.txt",
+            b"? tab\tname.txt",
+            b"",
+        ])
+
+        changes, untracked = BranchManager._parse_status_z(data)
+
+        assert changes == {
+            "mod ified.txt": "M", "added.txt": "A", "deleted.txt": "D",
+            "new.txt": "R", "conflict.txt": "U",
+        }
+        assert untracked == ["tab\tname.txt"]
+
+    def test_name_status(self):
+        """Renames and copies take the new path."""
+        data = b"M\0a.txt\0R100\0old.txt\0new.txt\0D\0b c.txt\0"
+
+        assert BranchManager._parse_name_status_z(data) == {"a.txt": "M", "new.txt": "R100", "b c.txt": "D"}
+
+
+class TestSetupSession:
+    """Tests for setup_session."""
+
+    @pytest.mark.asyncio
+    async def test_records_current_branch_as_base(self, repo: Path):
+        """The branch checked out at setup becomes the base branch."""
+        _git(repo, "checkout", "-q", "-b", "feature/login")
+        manager = BranchManager(str(repo))
+
+        result = await manager.setup_session("20260101_000000")
+
+        assert result.success
+        assert (result.base_branch, manager.base_branch) == ("feature/login", "feature/login")
+        assert result.branch_name == "llm_task_20260101_000000_from_feature__login"
+
+    @pytest.mark.asyncio
+    async def test_refuses_when_on_task_branch(self, repo: Path):
+        """A second session is refused while a task branch is checked out."""
+        await BranchManager(str(repo)).setup_session("20260101_000000")
+
+        result = await BranchManager(str(repo)).setup_session("20260101_000001")
+
+        assert not result.success and "Already on task branch" in result.error
+
+
+class TestGetChanges:
+    """Tests for get_changes on a real repository."""
+
+    @pytest.mark.asyncio
+    async def test_committed_uncommitted_and_untracked(self, repo: Path):
+        """Every kind of change is reported with its own diff."""
+        manager = BranchManager(str(repo))
+        assert (await manager.setup_session("20260101_000000")).success
+
+        (repo / "a.txt").write_text("a2\n")
+        (repo / "bin.dat").write_bytes(b"\x00\x02")
+        _git(repo, "commit", "-am", "work")
+        (repo / "b.txt").write_text("b2\n")
+        (repo / "new.txt").write_text("new\n")
+
+        changes = {c.path: c for c in (await manager.get_changes()).changes}
+
+        assert sorted(changes) == ["a.txt", "b.txt", "bin.dat", "new.txt"]
+        assert changes["a.txt"].diff.startswith("diff --git a/a.txt b/a.txt\n")
+        assert changes["a.txt"].diff.endswith("+a2\n")
+        assert "+b2" in changes["b.txt"].diff and "a.txt" not in changes["b.txt"].diff
+        assert changes["bin.dat"].is_binary and changes["bin.dat"].diff is None
+        assert changes["new.txt"].change_type == "added" and "+new" in changes["new.txt"].diff
+
+    @pytest.mark.asyncio
+    async def test_streamed_diff_split_across_reads(self, repo: Path, monkeypatch):
+        """Per-file diffs are the same when headers straddle read boundaries."""
+        manager = BranchManager(str(repo))
+        await manager.setup_session("20260101_000000")
+        for i in range(20):
+            (repo / f"f{i}.txt").write_text(f"line {i}\n" * i)
+        _git(repo, "add", "-A")
+        expected = BranchManager._split_diff_by_file(
+            subprocess.run(["git", "diff", "--no-renames", "main"], cwd=repo, capture_output=True, text=True).stdout
+        )
+        monkeypatch.setattr(BranchManager, "DIFF_READ_SIZE", 7)
+
+        chunks = await manager._run_git_diff_by_file(["diff", "--no-renames", "main"])
+
+        assert len(chunks) == 20 and chunks == expected
+        assert await manager._run_git_diff_by_file(["diff", "no-such-ref"]) == {}
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_committed_diff(self, repo: Path):
+        """A file restored in the working tree still shows its committed diff."""
+        manager = BranchManager(str(repo))
+        await manager.setup_session("20260101_000000")
+        (repo / "a.txt").write_text("a2\n")
+        _git(repo, "commit", "-am", "work")
+        (repo / "a.txt").write_text("a\n")
+
+        [change] = (await manager.get_changes()).changes
+
+        assert change.path == "a.txt" and "+a2" in change.diff
+
+    @pytest.mark.asyncio
+    async def test_special_paths_and_renames(self, repo: Path):
+        """Non-ASCII paths are reported unquoted; a rename is a delete plus an add."""
+        manager = BranchManager(str(repo))
+        await manager.setup_session("20260101_000000")
+        _git(repo, "mv", "b.txt", "moved.txt")
+        _git(repo, "commit", "-m", "move")
+        (repo / "té.txt").write_text("t\n")
+
+        changes = {c.path: c for c in (await manager.get_changes()).changes}
+
+        assert {path: c.change_type for path, c in changes.items()} == {
+            "b.txt": "deleted", "moved.txt": "added", "té.txt": "added",
+        }
+        assert "+t" in changes["té.txt"].diff and "+b" in changes["moved.txt"].diff
+
+
+class TestFinalize:
+    """Tests for finalize."""
+
+    @pytest.mark.asyncio
+    async def test_discarded_files_reverted_in_one_checkout(self, repo: Path, monkeypatch):
+        """Discarded files on the base branch are restored with a single checkout."""
+        manager = BranchManager(str(repo))
+        await manager.setup_session("20260101_000000")
+        (repo / "a.txt").write_text("a2\n")
+        (repo / "b.txt").write_text("b2\n")
+        (repo / "bin.dat").unlink()
+        (repo / "keep.txt").write_text("keep\n")
+        (repo / "debug.log").write_text("garbage\n")
+
+        calls = []
+        run_git = manager._run_git
+
+        async def recording_run_git(args):
+            calls.append(args)
+            return await run_git(args)
+
+        monkeypatch.setattr(manager, "_run_git", recording_run_git)
+
+        result = await manager.finalize(
+            discard_files=["a.txt", "b.txt", "bin.dat", "debug.log"], execute_commit=False,
+        )
+
+        assert result.success and result.kept_files == ["keep.txt"]
+        assert (repo / "a.txt").read_text() == "a\n" and (repo / "b.txt").read_text() == "b\n"
+        assert (repo / "bin.dat").exists()
+        checkouts = [args for args in calls if args[0] == "checkout"]
+        assert checkouts == [["checkout", "main", "--", "a.txt", "b.txt", "bin.dat"]]
+        assert not [args for args in calls if args[0] == "diff" and "--name-status" not in args]
+
+
+class TestMergeToBase:
+    """Tests for merge_to_base."""
+
+    @pytest.mark.asyncio
+    async def test_merges_and_deletes_task_branch(self, repo: Path, monkeypatch):
+        """Checkout, merge and delete take one git call each."""
+        manager = BranchManager(str(repo))
+        await manager.setup_session("20260101_000000")
+        (repo / "a.txt").write_text("a2\n")
+        _git(repo, "commit", "-qam", "work")
+
+        calls = []
+        run_git = manager._run_git
+
+        async def recording_run_git(args):
+            calls.append(args)
+            return await run_git(args)
+
+        monkeypatch.setattr(manager, "_run_git", recording_run_git)
+
+        merged = await manager.merge_to_base()
+
+        assert merged["success"] and merged["branch_deleted"]
+        assert [args[0] for args in calls] == ["checkout", "merge", "branch"]
+        assert (repo / "a.txt").read_text() == "a2\n"
+        assert (await BranchManager.list_stale_branches(str(repo)))["stale_branches"] == []
+
+
+class TestStaleBranches:
+    """Tests for list_stale_branches and cleanup_stale_sessions."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("use_pygit2", [False, True])
+    async def test_list_counts_commits_ahead(self, repo: Path, monkeypatch, use_pygit2: bool):
+        """Each task branch reports the commits it has on top of its base (git CLI or pygit2)."""
+        if use_pygit2:
+            pytest.importorskip("pygit2")
+        monkeypatch.setattr(branch_manager, "PYGIT2_AVAILABLE", use_pygit2)
+        _git(repo, "branch", "llm_task_1_from_main")
+        _git(repo, "branch", "llm_task_3_from_gone")
+        _git(repo, "checkout", "-q", "-b", "llm_task_2_from_main")
+        (repo / "a.txt").write_text("a2\n")
+        _git(repo, "commit", "-qam", "work")
+        _git(repo, "branch", "llm_task_other")
+
+        result = await BranchManager.list_stale_branches(str(repo))
+
+        branches = {b["name"]: b for b in result["stale_branches"]}
+        assert result["is_on_task_branch"] is True
+        assert (branches["llm_task_1_from_main"]["commit_count"], branches["llm_task_1_from_main"]["has_changes"]) == (0, False)
+        assert (branches["llm_task_2_from_main"]["commit_count"], branches["llm_task_2_from_main"]["base_branch"]) == (1, "main")
+        assert branches["llm_task_other"]["base_branch"] is None
+        assert branches["llm_task_3_from_gone"]["commit_count"] == 0
+        assert list(branches) == sorted(branches)
+        assert (await BranchManager.is_task_branch_checked_out(str(repo)))["session_id"] == "2"
+
+    @pytest.mark.asyncio
+    async def test_deletes_all_task_branches(self, repo: Path):
+        """All llm_task_* branches are deleted after leaving the current one."""
+        for name in ("llm_task_1_from_main", "llm_task_2_from_main"):
+            _git(repo, "branch", name)
+        _git(repo, "checkout", "-q", "-b", "llm_task_3_from_main")
+
+        result = await BranchManager.cleanup_stale_sessions(str(repo))
+
+        assert result["checked_out_to"] == "main"
+        assert sorted(result["deleted_branches"]) == [
+            "llm_task_1_from_main", "llm_task_2_from_main", "llm_task_3_from_main",
+        ]
+        assert result["errors"] == []
+        assert (await BranchManager.list_stale_branches(str(repo)))["stale_branches"] == []
@@ -0,0 +1,160 @@
+"""
+Tests for Ctags Cache Manager module.
+
+Tests the persistent ctags cache including:
+- Per-file caching and hash invalidation
+- mtime+size fast path
+- Batched cache writes
+- On-disk index format (msgpack / JSON)
+- Git-driven invalidation
+"""
+
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from tools.ctags_cache import CtagsCacheManager, CtagsFileCache
+
+
+@pytest.fixture
+def project(tmp_path: Path) -> Path:
+    """Create a small project with two source files."""
+    (tmp_path / "a.py").write_text("def foo():\n    pass\n")
+    (tmp_path / "b.py").write_text("class Bar:\n    pass\n")
+    return tmp_path
+
+
+class TestCtagsCacheManager:
+    """Tests for CtagsCacheManager."""
+
+    def test_cache_and_get_tags(self, project):
+        """Cached tags should be returned while the file is unchanged."""
+        manager = CtagsCacheManager(project)
+        tags = [{"name": "foo", "line": 1}]
+        manager.cache_tags(project / "a.py", tags)
+
+        assert manager.get_cached_tags(project / "a.py") == tags
+
+    def test_modified_file_invalidates(self, project):
+        """Changing file content should invalidate the cached entry."""
+        manager = CtagsCacheManager(project)
+        manager.cache_tags(project / "a.py", [{"name": "foo", "line": 1}])
+
+        (project / "a.py").write_text("def renamed():\n    pass\n")
+
+        assert manager.get_cached_tags(project / "a.py") is None
+
+    def test_touched_file_still_hits(self, project):
+        """A changed mtime with identical content should still be a hit."""
+        manager = CtagsCacheManager(project)
+        tags = [{"name": "foo", "line": 1}]
+        manager.cache_tags(project / "a.py", tags)
+
+        stat = (project / "a.py").stat()
+        os.utime(project / "a.py", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert manager.get_cached_tags(project / "a.py") == tags
+        entry = manager.cache["a.py"]
+        assert entry.mtime_ns == (project / "a.py").stat().st_mtime_ns
+
+    def test_legacy_entry_without_stat(self, project):
+        """Entries cached before the stat fast path should still load."""
+        manager = CtagsCacheManager(project)
+        manager.cache_tags(project / "a.py", [{"name": "foo", "line": 1}])
+        data = manager.cache["a.py"].to_dict()
+        del data["mtime_ns"], data["size"]
+
+        manager.cache["a.py"] = CtagsFileCache.from_dict(data)
+
+        assert manager.get_cached_tags(project / "a.py") == [{"name": "foo", "line": 1}]
+
+    def test_name_prefilter(self, project):
+        """A name absent from the file should yield no tags on a valid hit."""
+        manager = CtagsCacheManager(project)
+        tags = [{"name": "foo", "line": 1}]
+        manager.cache_tags(project / "a.py", tags)
+
+        assert manager.get_cached_tags(project / "a.py", name="foo") == tags
+        assert manager.get_cached_tags(project / "a.py", name="missing") == []
+        assert "tag_names" not in manager.cache["a.py"].to_dict()
+
+    def test_cache_tags_batch(self, project):
+        """Batch caching should store every file and persist once."""
+        manager = CtagsCacheManager(project)
+        manager.cache_tags_batch({
+            project / "a.py": [{"name": "foo", "line": 1}],
+            project / "b.py": [{"name": "Bar", "line": 1}],
+        })
+
+        reloaded = CtagsCacheManager(project)
+        assert reloaded.get_cached_tags(project / "a.py") == [{"name": "foo", "line": 1}]
+        assert reloaded.get_cached_tags(project / "b.py") == [{"name": "Bar", "line": 1}]
+        assert reloaded.get_stats()["cached_files"] == 2
+
+
+class TestCacheFormat:
+    """Tests for the on-disk cache index format."""
+
+    def test_json_format_roundtrip(self, project):
+        """JSON format should write cache_index.json and reload it."""
+        manager = CtagsCacheManager(project, cache_format="json")
+        manager.cache_tags(project / "a.py", [{"name": "foo", "line": 1}])
+
+        assert manager.cache_index_file.name == "cache_index.json"
+        reloaded = CtagsCacheManager(project, cache_format="json")
+        assert reloaded.get_cached_tags(project / "a.py") == [{"name": "foo", "line": 1}]
+
+    def test_msgpack_format_reads_legacy_json(self, project):
+        """msgpack format should pick up an existing JSON index."""
+        pytest.importorskip("ormsgpack")
+        CtagsCacheManager(project, cache_format="json").cache_tags(
+            project / "a.py", [{"name": "foo", "line": 1}]
+        )
+
+        manager = CtagsCacheManager(project, cache_format="msgpack")
+        assert manager.get_cached_tags(project / "a.py") == [{"name": "foo", "line": 1}]
+
+        manager.cache_tags(project / "b.py", [{"name": "Bar", "line": 1}])
+        assert manager.cache_index_file.name == "cache_index.msgpack"
+        assert CtagsCacheManager(project, cache_format="msgpack").get_stats()["cached_files"] == 2
+
+
+class TestRefreshFromGit:
+    """Tests for git-driven cache invalidation."""
+
+    @staticmethod
+    def _git(project: Path, *args: str) -> None:
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+            cwd=project, check=True, capture_output=True,
+        )
+
+    def test_not_a_git_repo(self, project):
+        """Outside a git repository nothing should be invalidated."""
+        manager = CtagsCacheManager(project)
+        manager.cache_tags(project / "a.py", [{"name": "foo", "line": 1}])
+
+        assert manager.refresh_from_git() == 0
+        assert manager.get_stats()["cached_files"] == 1
+
+    def test_invalidates_files_changed_by_new_commits(self, project):
+        """Files changed between the previous and current HEAD are dropped."""
+        self._git(project, "init", "-q")
+        self._git(project, "add", "a.py", "b.py")
+        self._git(project, "commit", "-q", "-m", "initial")
+
+        manager = CtagsCacheManager(project)
+        manager.cache_tags_batch({
+            project / "a.py": [{"name": "foo", "line": 1}],
+            project / "b.py": [{"name": "Bar", "line": 1}],
+        })
+        assert manager.refresh_from_git() == 0
+
+        (project / "a.py").write_text("def changed():\n    pass\n")
+        self._git(project, "commit", "-q", "-am", "change a")
+
+        assert manager.refresh_from_git() == 1
+        assert "a.py" not in manager.cache
+        assert "b.py" in manager.cache
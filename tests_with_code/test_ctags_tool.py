@@ -0,0 +1,196 @@
+"""
+Tests for Ctags tool module.
+
+Tests the ctags wrapper helpers including:
+- Source file discovery and directory exclusion
+- Reference count parsing (count_only mode)
+- Batched reference attribution (find_references_batch)
+- Command failures surfaced as errors
+- Interactive ctags process lifecycle
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+from tools import ctags_tool
+from tools.ctags_tool import (
+    _InteractiveCtags,
+    _iter_source_files,
+    _parse_batch_references,
+    _parse_reference_counts,
+    _run_command,
+    find_references_batch,
+)
+
+
+class TestSourceFileDiscovery:
+    """Tests for source file discovery."""
+
+    def test_collects_source_files_once(self, tmp_path: Path):
+        """Each source file should be collected exactly once."""
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "main.py").write_text("")
+        (tmp_path / "pkg" / "util.ts").write_text("")
+        (tmp_path / "README.md").write_text("")
+
+        files = sorted(_iter_source_files(tmp_path))
+
+        assert files == [tmp_path / "main.py", tmp_path / "pkg" / "util.ts"]
+
+    def test_prunes_excluded_directories(self, tmp_path: Path):
+        """Excluded directories (including glob patterns) should be skipped."""
+        for excluded in ["node_modules", ".git", "venv", "pkg.egg-info"]:
+            (tmp_path / excluded).mkdir()
+            (tmp_path / excluded / "skip.py").write_text("")
+        (tmp_path / "keep.py").write_text("")
+
+        assert _iter_source_files(tmp_path) == [tmp_path / "keep.py"]
+
+    def test_does_not_exclude_by_substring(self, tmp_path: Path):
+        """Names merely containing an excluded word should not be skipped."""
+        (tmp_path / "rebuild").mkdir()
+        (tmp_path / "rebuild" / "distance.py").write_text("")
+
+        assert _iter_source_files(tmp_path) == [tmp_path / "rebuild" / "distance.py"]
+
+
+class TestReferenceCounts:
+    """Tests for count_only result parsing."""
+
+    def test_subtracts_definition_lines(self):
+        """Definition lines should not be counted as references."""
+        stdout = b"/p/a.py:3\n/p/b.py:1\n"
+        definitions = frozenset({("/p/a.py", 1), ("/p/b.py", 4)})
+
+        result = _parse_reference_counts("foo", "/p", stdout, definitions)
+
+        assert result["files"] == [{"file": "/p/a.py", "count": 2}]
+        assert result["total"] == 2
+
+    def test_path_with_colon(self):
+        """Only the last colon separates path and count."""
+        result = _parse_reference_counts("foo", "/p", b"/p/x:y.py:5\n", frozenset())
+
+        assert result["files"] == [{"file": "/p/x:y.py", "count": 5}]
+
+
+class TestBatchReferences:
+    """Tests for attributing batched ripgrep matches to symbols."""
+
+    @staticmethod
+    def _match(path: str, line: int, text: str, *submatches: str) -> bytes:
+        return json.dumps({"type": "match", "data": {
+            "path": {"text": path},
+            "lines": {"text": text},
+            "line_number": line,
+            "submatches": [{"match": {"text": sub}} for sub in submatches],
+        }}).encode()
+
+    def test_matches_attributed_per_symbol(self):
+        """Each line is a reference of every symbol it matched, once."""
+        stdout = b"\n".join([
+            self._match("/p/a.py", 1, "Foo(Bar) ", "Foo", "Bar"),
+            self._match("/p/a.py", 2, "Foo + Foo", "Foo", "Foo"),
+            b'{"type": "summary", "data": {}}',
+        ])
+
+        result = _parse_batch_references(stdout, {"Foo": [], "Bar": []}, frozenset())
+
+        assert [(r["file"], r["line"]) for r in result["Foo"]] == [("/p/a.py", 1), ("/p/a.py", 2)]
+        assert result["Bar"] == [{"file": "/p/a.py", "line": 1, "content": "Foo(Bar)"}]
+
+    def test_definitions_skipped_per_symbol(self):
+        """A definition line of one symbol still counts for the others."""
+        stdout = self._match("/p/a.py", 5, "class Foo(Bar):", "Foo", "Bar")
+
+        result = _parse_batch_references(
+            stdout, {"Foo": [], "Bar": []}, frozenset({("Foo", "/p/a.py", 5)})
+        )
+
+        assert result["Foo"] == []
+        assert [r["line"] for r in result["Bar"]] == [5]
+
+
+class TestCommandErrors:
+    """Tests for surfacing ripgrep failures."""
+
+    @pytest.mark.asyncio
+    async def test_check_raises_on_error_status(self):
+        """An error exit without output raises with the command's stderr."""
+        cmd = [sys.executable, "-c", "import sys; sys.stderr.write('regex parse error'); sys.exit(2)"]
+
+        assert await _run_command(cmd) == b""
+        with pytest.raises(RuntimeError, match="regex parse error"):
+            await _run_command(cmd, check=True)
+
+    @pytest.mark.asyncio
+    async def test_batch_searches_literals_and_reports_failure(self, tmp_path: Path, monkeypatch):
+        """Symbols are searched with -F, and a failed search is an error for every symbol."""
+        commands = []
+
+        async def failing_run_command(cmd, input_data=None, check=False):
+            commands.append((cmd, check))
+            raise RuntimeError("rg failed")
+
+        monkeypatch.setattr("tools.ctags_tool._run_command", failing_run_command)
+
+        result = await find_references_batch(["c++", "Cart"], path=str(tmp_path))
+
+        assert [("-F" in cmd, check) for cmd, check in commands] == [(True, True)]
+        assert result == {
+            "c++": {"error": "Failed to find references: rg failed"},
+            "Cart": {"error": "Failed to find references: rg failed"},
+        }
+
+
+class TestInteractiveCtags:
+    """Tests for the long-lived ctags process lifecycle."""
+
+    @pytest.fixture
+    def old_loop(self):
+        """An event loop that outlives the call under test."""
+        loop = asyncio.new_event_loop()
+        yield loop
+        loop.close()
+
+    @staticmethod
+    def _start_sleeper(instance: _InteractiveCtags, loop) -> asyncio.subprocess.Process:
+        """Start a stand-in child process for the instance on the given loop."""
+        async def start():
+            instance._loop = loop
+            instance._lock = asyncio.Lock()
+            instance._process = await asyncio.create_subprocess_exec(
+                sys.executable, "-c", "import sys; sys.stdin.read()",
+                stdin=asyncio.subprocess.PIPE,
+            )
+            return instance._process
+
+        return loop.run_until_complete(start())
+
+    def test_process_from_previous_loop_is_killed(self, tmp_path: Path, old_loop, monkeypatch):
+        """Switching event loops stops the old child instead of orphaning it."""
+        instance = _InteractiveCtags(None)
+        old_process = self._start_sleeper(instance, old_loop)
+
+        async def unsupported_start():
+            raise RuntimeError("ctags interactive mode not supported")
+
+        monkeypatch.setattr(instance, "_start", unsupported_start)
+
+        assert asyncio.run(instance.generate_tags(tmp_path / "a.py")) is None
+        assert old_loop.run_until_complete(asyncio.wait_for(old_process.wait(), 5)) < 0
+
+    def test_processes_stopped_at_exit(self, old_loop, monkeypatch):
+        """The exit hook kills every per-language process."""
+        instance = _InteractiveCtags("Python")
+        process = self._start_sleeper(instance, old_loop)
+        monkeypatch.setattr(ctags_tool, "_interactive_ctags", {"Python": instance})
+
+        ctags_tool._stop_interactive_ctags()
+
+        assert instance._process is None
+        assert old_loop.run_until_complete(asyncio.wait_for(process.wait(), 5)) < 0
@@ -0,0 +1,162 @@
+"""
+Tests for Embedding Validator module.
+
+Uses a deterministic fake model so no sentence-transformers download is needed.
+Tests:
+- Batched encoding in validate_multiple / find_related_symbols
+- Backend selection (ONNX / torch)
+- Camel case splitting
+"""
+
+import importlib.util
+import sys
+import types
+
+import pytest
+
+from tools.embedding import EmbeddingValidator
+
+
+class FakeModel:
+    """Bag-of-words model: one dimension per known word."""
+
+    VOCAB = ["login", "auth", "service", "user", "name", "cart"]
+
+    def __init__(self):
+        self.encode_calls = 0
+
+    def encode(self, sentences, **kwargs):
+        import numpy as np
+
+        self.encode_calls += 1
+        vectors = []
+        for sentence in sentences:
+            words = sentence.lower().replace("query:", "").split()
+            vec = np.array([1.0 if w in words else 0.0 for w in self.VOCAB]) + 0.01
+            if kwargs.get("normalize_embeddings"):
+                vec = vec / np.linalg.norm(vec)
+            vectors.append(vec)
+        return np.array(vectors)
+
+
+@pytest.fixture
+def validator():
+    pytest.importorskip("numpy")
+    v = EmbeddingValidator()
+    v._model = FakeModel()
+    return v
+
+
+class TestBatchedEncoding:
+    """Tests that multiple symbols are encoded in a single model call."""
+
+    def test_find_related_symbols_single_encode(self, validator):
+        """find_related_symbols should call model.encode once."""
+        results = validator.find_related_symbols(
+            "auth service", ["AuthService", "CartItem", "UserName"], top_k=2
+        )
+
+        assert validator._model.encode_calls == 1
+        assert [r["symbol"] for r in results][0] == "AuthService"
+        assert [r["rank"] for r in results] == [1, 2]
+
+    def test_validate_multiple_single_encode(self, validator):
+        """validate_multiple should call model.encode once."""
+        result = validator.validate_multiple("auth service", ["AuthService", "CartItem"])
+
+        assert validator._model.encode_calls == 1
+        assert [a["symbol"] for a in result["approved"]] == ["AuthService"]
+        assert [r["symbol"] for r in result["rejected"]] == ["CartItem"]
+
+    def test_get_similarity_matches_batch(self, validator):
+        """Single-pair similarity should equal the batched value."""
+        single = validator.get_similarity("auth service", "Auth Service")
+        batch = validator.get_similarities("auth service", ["Auth Service"])[0]
+
+        assert single == pytest.approx(batch)
+
+
+class TestEmbeddingCache:
+    """Tests for the embedding LRU cache."""
+
+    def test_repeat_query_hits_cache(self, validator):
+        """Already-seen texts should not be encoded again."""
+        validator.find_related_symbols("auth service", ["AuthService", "CartItem"])
+        validator.find_related_symbols("auth service", ["AuthService", "CartItem"])
+
+        assert validator._model.encode_calls == 1
+
+    def test_only_new_texts_are_encoded(self, validator):
+        """Only texts missing from the cache are passed to the model."""
+        validator.get_similarities("auth service", ["Auth Service"])
+        validator.get_similarities("auth service", ["Auth Service", "User Name"])
+
+        assert validator._model.encode_calls == 2
+        assert len(validator._embedding_cache) == 3
+
+    def test_cache_is_bounded(self, validator):
+        """The cache should evict least recently used entries."""
+        validator.EMBEDDING_CACHE_SIZE = 2
+        validator.get_similarities("auth", ["service", "user"])
+
+        assert list(validator._embedding_cache) == ["service", "user"]
+
+
+class TestBackendSelection:
+    """Tests for choosing the ONNX or torch backend."""
+
+    class FakeSentenceTransformer:
+        def __init__(self, model_name, **kwargs):
+            if kwargs.get("backend") == "onnx":
+                raise RuntimeError("onnx file not found")
+
+    def test_torch_backend_is_default(self):
+        validator = EmbeddingValidator()
+        assert validator.backend == "torch"
+        assert validator._load_onnx_model(self.FakeSentenceTransformer) is None
+
+    @pytest.fixture
+    def onnx_installed(self, monkeypatch):
+        """Pretend onnxruntime and optimum are importable."""
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name: object())
+
+    def test_onnx_file_passed_to_model(self, onnx_installed):
+        loaded = EmbeddingValidator(backend="onnx", onnx_file="onnx/model.onnx")._load_onnx_model(
+            lambda model_name, **kwargs: kwargs
+        )
+        assert loaded == {"backend": "onnx", "model_kwargs": {"file_name": "onnx/model.onnx"}}
+
+    def test_auto_backend_falls_back_on_error(self, onnx_installed):
+        validator = EmbeddingValidator(backend="auto")
+        assert validator._load_onnx_model(self.FakeSentenceTransformer) is None
+
+    def test_explicit_onnx_backend_raises(self, onnx_installed):
+        validator = EmbeddingValidator(backend="onnx")
+        with pytest.raises(RuntimeError, match="onnx file not found"):
+            validator._load_onnx_model(self.FakeSentenceTransformer)
+
+    def test_missing_onnxruntime_names_the_extra(self, monkeypatch):
+        """A missing ONNX dependency is not reported as missing sentence-transformers."""
+        find_spec = importlib.util.find_spec
+        monkeypatch.setattr(
+            importlib.util, "find_spec",
+            lambda name: None if name == "onnxruntime" else find_spec(name),
+        )
+        monkeypatch.setitem(
+            sys.modules, "sentence_transformers",
+            types.SimpleNamespace(SentenceTransformer=self.FakeSentenceTransformer),
+        )
+        validator = EmbeddingValidator(backend="onnx")
+
+        with pytest.raises(RuntimeError, match="onnxruntime.*requirements-optional.txt"):
+            validator.model
+        assert validator._available is None
+
+
+class TestSplitCamelCase:
+    """Tests for camel case splitting."""
+
+    def test_split_camel_case(self):
+        assert EmbeddingValidator.split_camel_case("AuthService") == "Auth Service"
+        assert EmbeddingValidator.split_camel_case("getUserName") == "get User Name"
+        assert EmbeddingValidator.split_camel_case("HTTPServer") == "HTTP Server"
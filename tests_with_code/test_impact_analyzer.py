@@ -8,12 +8,15 @@ Tests the impact analysis functionality including:
 - Document keyword search (v1.1.1)
 """
 
+import re
+import subprocess
 import tempfile
 from pathlib import Path
 
 import pytest
 import yaml
 
+from tools import impact_analyzer
 from tools.impact_analyzer import (
     ImpactAnalyzer,
     ImpactAnalysisResult,
@@ -22,6 +25,13 @@ from tools.impact_analyzer import (
     LOGIC_MARKUP_EXTENSIONS,
     DEFAULT_DOCUMENT_PATTERNS,
     DEFAULT_DOCUMENT_EXCLUDE_PATTERNS,
+    MAX_REFS_PER_SYMBOL,
+    _compile_glob,
+    _compile_type_hint_re,
+    _aggregate_literal_mentions,
+    _aggregate_mentions,
+    _find_matching_lines,
+    _parse_rg_matching_lines,
 )
 
 
@@ -55,6 +65,9 @@ class TestMarkupRelaxation:
         # Vue single-file components
         assert analyzer._should_relax_markup(["App.vue"]) is False
 
+        for ext in LOGIC_MARKUP_EXTENSIONS:
+            assert analyzer._should_relax_markup([f"file{ext}"]) is False
+
     def test_should_not_relax_mixed_files(self):
         """Mixed markup and logic files should NOT trigger relaxation."""
         analyzer = ImpactAnalyzer()
@@ -81,6 +94,38 @@ class TestMarkupRelaxation:
         assert result.confirmation_required["must_verify"] == []
         # Note: should_verify may contain cross-reference suggestions for CSS
 
+    @pytest.mark.asyncio
+    async def test_html_cross_references(self, tmp_path: Path):
+        """HTML changes should surface CSS and JS files using its classes."""
+        (tmp_path / "page.html").write_text('<div class="card-title">x</div>')
+        (tmp_path / "site.css").write_text(".card-title { color: red; }")
+        (tmp_path / "app.js").write_text("document.querySelector('.card-title')")
+        (tmp_path / "other.css").write_text(".footer {}")
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        result = await analyzer._create_relaxed_result([str(tmp_path / "page.html")])
+
+        assert sorted(result.confirmation_required["should_verify"]) == [
+            str(tmp_path / "app.js"),
+            str(tmp_path / "site.css"),
+        ]
+
+    def test_glob_files_walk(self, tmp_path: Path):
+        """Glob matches nested files and skips pruned directories."""
+        (tmp_path / "static" / "css").mkdir(parents=True)
+        (tmp_path / "node_modules" / "lib").mkdir(parents=True)
+        (tmp_path / "site.css").write_text("")
+        (tmp_path / "static" / "css" / "app.css").write_text("")
+        (tmp_path / "static" / "app.js").write_text("")
+        (tmp_path / "node_modules" / "lib" / "vendor.css").write_text("")
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+
+        assert sorted(analyzer._glob_files_sync("**/*.css")) == [
+            str(tmp_path / "site.css"),
+            str(tmp_path / "static" / "css" / "app.css"),
+        ]
+
 
 class TestBaseNameExtraction:
     """Tests for base name extraction from file paths."""
@@ -107,6 +152,21 @@ class TestBaseNameExtraction:
         assert analyzer._extract_base_name("user_service.py") == "UserService"
         assert analyzer._extract_base_name("cart_item_handler.php") == "CartItemHandler"
 
+    def test_snake_case_with_digits(self):
+        """Only the start of each snake_case word is uppercased, not letters after digits."""
+        analyzer = ImpactAnalyzer()
+
+        assert analyzer._extract_base_name("md5sum_tool.py") == "Md5sumTool"
+        assert analyzer._extract_base_name("lib/sha1_v2hash.py") == "Sha1V2hash"
+
+    def test_snake_case_matches_per_word_capitalize(self):
+        """Each word is capitalized and the underscores are dropped, as before."""
+        analyzer = ImpactAnalyzer()
+
+        assert analyzer._extract_base_name("HTTP_client.py") == "HttpClient"
+        assert analyzer._extract_base_name("schema_2.py") == "Schema2"
+        assert analyzer._extract_base_name("__init__.py") == "Init"
+
     def test_multi_part_extension(self):
         """Multi-part extensions like .blade.php should be handled."""
         analyzer = ImpactAnalyzer()
@@ -114,6 +174,195 @@ class TestBaseNameExtraction:
         assert analyzer._extract_base_name("welcome.blade.php") == "welcome"
         assert analyzer._extract_base_name("test.spec.ts") == "test"
 
+    def test_dotfile_has_no_base_name(self):
+        """Dotfiles have no base name to match on."""
+        analyzer = ImpactAnalyzer()
+
+        assert analyzer._extract_base_name(".env.local") == ""
+
+
+class TestNamingConventionMatches:
+    """Tests for naming convention file matching."""
+
+    @pytest.mark.asyncio
+    async def test_matches_glob_conventions(self, tmp_path: Path):
+        """Test, factory and seeder conventions should match by path."""
+        for rel in [
+            "tests/unit/ProductTest.php",
+            "test_product_helper.py",
+            "database/factories/ProductFactory.php",
+            "database/factories/nested/ProductData.php",
+            "database/seeders/ProductSeeder.php",
+            "app/Models/Product.php",
+        ]:
+            (tmp_path / rel).parent.mkdir(parents=True, exist_ok=True)
+            (tmp_path / rel).write_text("")
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        matches = await analyzer._find_naming_convention_matches("Product")
+
+        assert matches.tests == [str(tmp_path / "tests/unit/ProductTest.php")]
+        assert matches.factories == [str(tmp_path / "database/factories/ProductFactory.php")]
+        assert matches.seeders == [str(tmp_path / "database/seeders/ProductSeeder.php")]
+
+    @pytest.mark.asyncio
+    async def test_pruned_directories_are_skipped(self, tmp_path: Path):
+        """Files under pruned directories should not be matched."""
+        for pruned in ["node_modules", "vendor", ".venv", "build"]:
+            (tmp_path / pruned).mkdir()
+            (tmp_path / pruned / "ProductTest.js").write_text("")
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        matches = await analyzer._find_naming_convention_matches("Product")
+
+        assert matches.tests == []
+
+    @pytest.mark.asyncio
+    async def test_git_repository_honors_gitignore(self, tmp_path: Path):
+        """In a git repository, ignored files are not matched."""
+        git = ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+        subprocess.run([*git, "init", "-q"], cwd=tmp_path, check=True)
+        (tmp_path / ".gitignore").write_text("generated/\n")
+        (tmp_path / "generated").mkdir()
+        (tmp_path / "generated" / "ProductTest.php").write_text("")
+        (tmp_path / "ProductTest.php").write_text("")
+        (tmp_path / "ProductFactory.php").write_text("")
+        subprocess.run([*git, "add", "ProductTest.php"], cwd=tmp_path, check=True)
+        subprocess.run([*git, "commit", "-qm", "init"], cwd=tmp_path, check=True)
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        matches = await analyzer._find_naming_convention_matches("Product")
+
+        # Tracked and untracked-but-not-ignored files are both found
+        assert matches.tests == [str(tmp_path / "ProductTest.php")]
+        assert matches.factories == [str(tmp_path / "ProductFactory.php")]
+
+
+class TestStaticReferences:
+    """Tests for static reference lookup."""
+
+    @pytest.mark.asyncio
+    async def test_references_cached_per_symbol(self, tmp_path: Path, monkeypatch):
+        """Targets sharing a base name should trigger a single lookup."""
+        calls = []
+
+        async def fake_find_references_batch(symbols, path):
+            calls.append(symbols)
+            return {symbol: {"references": [
+                {"file": str(tmp_path / "app.py"), "line": 3, "content": "Product()"},
+            ]} for symbol in symbols}
+
+        monkeypatch.setattr(
+            "tools.impact_analyzer.find_references_batch", fake_find_references_batch
+        )
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        result = await analyzer.analyze(["a/Product.php", "b/Product.php"])
+
+        assert calls == [["Product"]]
+        assert result.static_references["callers"] == [
+            {"file": str(tmp_path / "app.py"), "line": 3, "context": "Product()"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_all_targets_share_one_batch_lookup(self, tmp_path: Path, monkeypatch):
+        """Symbols of every target are looked up in one batched query."""
+        calls = []
+
+        async def fake_find_references_batch(symbols, path):
+            calls.append(symbols)
+            return {symbol: {"references": [
+                {"file": f"{symbol}.py", "line": 1, "content": f"{symbol}()"},
+            ]} for symbol in symbols}
+
+        monkeypatch.setattr(
+            "tools.impact_analyzer.find_references_batch", fake_find_references_batch
+        )
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        result = await analyzer.analyze(["Product.php", "services/cart_service.py"])
+
+        assert calls == [["Product", "CartService", "cart_service"]]
+        assert [r["file"] for r in result.static_references["callers"]] == [
+            "Product.py", "CartService.py", "cart_service.py",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_verification_lists_keep_first_seen_order(self, tmp_path: Path, monkeypatch):
+        """must_verify is deduplicated in reference order, not hash order."""
+        async def fake_find_references_batch(symbols, path):
+            return {symbol: {"references": [
+                {"file": f"{name}.py", "line": line, "content": "Product()"}
+                for line, name in enumerate(["zeta", "alpha", "zeta", "mid"])
+            ]} for symbol in symbols}
+
+        monkeypatch.setattr(
+            "tools.impact_analyzer.find_references_batch", fake_find_references_batch
+        )
+
+        result = await ImpactAnalyzer(str(tmp_path)).analyze(["Product.php"])
+
+        assert result.confirmation_required["must_verify"] == ["zeta.py", "alpha.py", "mid.py"]
+
+    @pytest.mark.asyncio
+    async def test_snake_case_file_searches_both_names(self, monkeypatch):
+        """snake_case files should be searched by PascalCase and original stem."""
+        async def fake_find_references(symbol, path):
+            return {"references": [
+                {"file": f"{symbol}.py", "line": 1, "content": f"x: {symbol},"},
+            ]}
+
+        monkeypatch.setattr("tools.impact_analyzer.find_references", fake_find_references)
+
+        analyzer = ImpactAnalyzer()
+        symbols = analyzer._reference_symbols("services/cart_service.py")
+        result = await analyzer._find_static_references(symbols)
+
+        assert symbols == ("CartService", "cart_service")
+
+        assert [r["file"] for r in result["type_hints"]] == [
+            "CartService.py", "cart_service.py",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_references_deduplicated_and_capped(self, monkeypatch):
+        """Duplicate references are dropped and each symbol's references are bounded."""
+        refs = [{"file": "a.py", "line": 1, "content": "Product()"}] * 3
+        refs += [
+            {"file": "b.py", "line": n, "content": "Product()"}
+            for n in range(MAX_REFS_PER_SYMBOL + 10)
+        ]
+
+        async def fake_find_references(symbol, path):
+            return {"references": refs}
+
+        monkeypatch.setattr("tools.impact_analyzer.find_references", fake_find_references)
+
+        result = await ImpactAnalyzer()._find_static_references(("Product",))
+
+        assert len(result["callers"]) == MAX_REFS_PER_SYMBOL
+        assert result["callers"][:2] == [
+            {"file": "a.py", "line": 1, "context": "Product()"},
+            {"file": "b.py", "line": 0, "context": "Product()"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_cap_is_per_symbol(self, monkeypatch):
+        """A symbol at the cap does not use up the other symbol's references."""
+        async def fake_find_references(symbol, path):
+            return {"references": [
+                {"file": f"{symbol}.py", "line": n, "content": f"{symbol}()"}
+                for n in range(MAX_REFS_PER_SYMBOL + 10)
+            ]}
+
+        monkeypatch.setattr("tools.impact_analyzer.find_references", fake_find_references)
+
+        result = await ImpactAnalyzer()._find_static_references(("CartService", "cart_service"))
+
+        files = [r["file"] for r in result["callers"]]
+        assert files.count("CartService.py") == MAX_REFS_PER_SYMBOL
+        assert files.count("cart_service.py") == MAX_REFS_PER_SYMBOL
+
 
 class TestTypehintDetection:
     """Tests for type hint detection in references."""
@@ -149,6 +398,11 @@ class TestTypehintDetection:
         assert analyzer._looks_like_type_hint("$product = new Product()", "Product") is False
         assert analyzer._looks_like_type_hint("product.save()", "Product") is False
 
+    def test_pattern_compiled_once_per_symbol(self):
+        """The combined type hint regex should be reused for a symbol."""
+        assert _compile_type_hint_re("Product") is _compile_type_hint_re("Product")
+        assert _compile_type_hint_re("Product").search("x: Order,") is None
+
 
 class TestKeywordExtraction:
     """Tests for keyword extraction from change descriptions."""
@@ -218,6 +472,16 @@ class TestKeywordExtraction:
         )
         assert len(keywords) <= 10
 
+    def test_keywords_unique_in_priority_order(self):
+        """A keyword found at several priorities appears once, at its highest."""
+        analyzer = ImpactAnalyzer()
+
+        keywords = analyzer._extract_keywords(
+            'Rename "ProductPrice" in ProductPrice and product_price docs',
+            ["app/product_price.py"]
+        )
+        assert keywords == ["ProductPrice", "product_price", "Rename", "docs"]
+
 
 class TestDocumentConfig:
     """Tests for document_search configuration loading."""
@@ -251,6 +515,30 @@ class TestDocumentConfig:
             assert analyzer._document_config["include_patterns"] == ["**/*.md"]
             assert analyzer._document_config["exclude_patterns"] == ["CHANGELOG.md"]
 
+    def test_config_cached_until_modified(self, tmp_path: Path, monkeypatch):
+        """context.yml is parsed once per version and shared across instances."""
+        code_intel_dir = tmp_path / ".code-intel"
+        code_intel_dir.mkdir()
+        context_file = code_intel_dir / "context.yml"
+        context_file.write_text("document_search:\n  include_patterns: ['**/*.md']\n")
+
+        parse_calls = []
+        parse = ImpactAnalyzer._parse_document_config
+        monkeypatch.setattr(
+            ImpactAnalyzer, "_parse_document_config",
+            staticmethod(lambda path: parse_calls.append(path) or parse(path)),
+        )
+
+        first = ImpactAnalyzer(str(tmp_path))._document_config
+        second = ImpactAnalyzer(str(tmp_path))._document_config
+        assert first == second == {"include_patterns": ["**/*.md"]}
+        assert len(parse_calls) == 1
+
+        context_file.write_text("document_search:\n  include_patterns: ['**/*.rst']\n")
+        third = ImpactAnalyzer(str(tmp_path))._document_config
+        assert third == {"include_patterns": ["**/*.rst"]}
+        assert len(parse_calls) == 2
+
 
 class TestExcludePatternMatching:
     """Tests for exclude pattern matching."""
@@ -286,6 +574,180 @@ class TestExcludePatternMatching:
             ) is True
 
 
+class TestDocumentMentions:
+    """Tests for keyword search in documentation."""
+
+    @pytest.mark.asyncio
+    async def test_mentions_aggregated_by_file(self, tmp_path: Path, monkeypatch):
+        """Matches are counted per keyword and line, with keyword-ordered samples."""
+        monkeypatch.setattr("tools.impact_analyzer._has_ripgrep", lambda: False)
+        (tmp_path / "README.md").write_text(
+            "Intro\nProductPrice changes\nproduct here\nPRODUCT again\n"
+        )
+        (tmp_path / "notes.py").write_text("product")
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        mentions = await analyzer._find_document_mentions(["ProductPrice", "product"], set())
+
+        assert len(mentions) == 1
+        assert mentions[0]["file"] == str(tmp_path / "README.md")
+        assert mentions[0]["match_count"] == 4
+        assert sorted(mentions[0]["keywords"]) == ["ProductPrice", "product"]
+        assert [(s["line"], s["keyword"]) for s in mentions[0]["sample_lines"]] == [
+            (2, "ProductPrice"), (2, "product"), (3, "product"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_target_documents_excluded(self, tmp_path: Path):
+        """Documents in the target set are not reported."""
+        (tmp_path / "README.md").write_text("product")
+        (tmp_path / "GUIDE.md").write_text("product")
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        mentions = await analyzer._find_document_mentions(
+            ["product"], {str(tmp_path / "README.md")}
+        )
+
+        assert [m["file"] for m in mentions] == [str(tmp_path / "GUIDE.md")]
+
+    @pytest.mark.asyncio
+    async def test_oversized_documents_skipped(self, tmp_path: Path, monkeypatch):
+        """Documents larger than max_file_size_kb are not read."""
+        monkeypatch.setattr("tools.impact_analyzer._has_ripgrep", lambda: False)
+        (tmp_path / "small.md").write_text("product")
+        (tmp_path / "large.md").write_text("product\n" + "x" * 2048)
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        analyzer._document_config = {"max_file_size_kb": 1}
+        mentions = await analyzer._find_document_mentions(["product"], set())
+
+        assert [m["file"] for m in mentions] == [str(tmp_path / "small.md")]
+
+    @pytest.mark.asyncio
+    async def test_real_match_counts_ranked(self, tmp_path: Path, monkeypatch):
+        """Heavily matching documents keep their full count and rank by it."""
+        monkeypatch.setattr("tools.impact_analyzer._has_ripgrep", lambda: False)
+        (tmp_path / "a.md").write_text("product\n" * 40)
+        (tmp_path / "CHANGELOG.md").write_text("product\n" * 200)
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        mentions = await analyzer._find_document_mentions(["product"], set())
+
+        assert [(Path(m["file"]).name, m["match_count"]) for m in mentions] == [
+            ("CHANGELOG.md", 200), ("a.md", 40),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_documents_too_small_to_rank_not_read(self, tmp_path: Path, monkeypatch):
+        """Once the top files are known, files that cannot beat them are skipped."""
+        monkeypatch.setattr("tools.impact_analyzer.MAX_TOTAL_FILES", 1)
+        monkeypatch.setattr("tools.impact_analyzer.DOCUMENT_SCAN_CONCURRENCY", 1)
+        scanned = []
+        scan_cached = impact_analyzer._scan_document_cached
+
+        def recording_scan(doc_file, *args):
+            scanned.append(Path(doc_file).name)
+            return scan_cached(doc_file, *args)
+
+        monkeypatch.setattr("tools.impact_analyzer._scan_document_cached", recording_scan)
+        docs = {"big.md": "product\n" * 5, "small.md": "product\n", "bigger.md": "product\n" * 9}
+        for name, text in docs.items():
+            (tmp_path / name).write_text(text)
+        keyword_patterns = (("product", re.compile("product", re.IGNORECASE)),)
+
+        results = await ImpactAnalyzer(str(tmp_path))._scan_documents(
+            [str(tmp_path / name) for name in docs], keyword_patterns, 1024 * 1024,
+        )
+
+        assert scanned == ["big.md", "bigger.md"]
+        assert {Path(f).name: r["match_count"] for f, r in results.items()} == {"big.md": 5, "bigger.md": 9}
+
+    @pytest.mark.asyncio
+    async def test_modified_document_rescanned(self, tmp_path: Path, monkeypatch):
+        """Cached scan results are invalidated when a document changes."""
+        monkeypatch.setattr("tools.impact_analyzer._has_ripgrep", lambda: False)
+        doc = tmp_path / "README.md"
+        doc.write_text("product")
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        first = await analyzer._find_document_mentions(["product"], set())
+        doc.write_text("product\nproduct again\n")
+        second = await analyzer._find_document_mentions(["product"], set())
+
+        assert first[0]["match_count"] == 1
+        assert second[0]["match_count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_mutating_result_does_not_affect_cache(self, tmp_path: Path, monkeypatch):
+        """Callers may edit the returned mentions without corrupting cached scans."""
+        monkeypatch.setattr("tools.impact_analyzer._has_ripgrep", lambda: False)
+        (tmp_path / "README.md").write_text("product\n")
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        first = await analyzer._find_document_mentions(["product"], set())
+        first[0]["sample_lines"][0]["content"] = "edited"
+        first[0]["sample_lines"].clear()
+        second = await analyzer._find_document_mentions(["product"], set())
+
+        assert second[0]["sample_lines"] == [{"line": 1, "keyword": "product", "content": "product"}]
+
+    @pytest.mark.asyncio
+    async def test_non_ascii_keywords(self, tmp_path: Path, monkeypatch):
+        """Caseless (Japanese) and non-ASCII cased keywords are both found."""
+        monkeypatch.setattr("tools.impact_analyzer._has_ripgrep", lambda: False)
+        (tmp_path / "guide.md").write_text("価格を変更\nüBERSICHT\n", encoding="utf-8")
+
+        analyzer = ImpactAnalyzer(str(tmp_path))
+        japanese = await analyzer._find_document_mentions(["価格"], set())
+        cased = await analyzer._find_document_mentions(["Übersicht"], set())
+
+        assert japanese[0]["sample_lines"][0]["content"] == "価格を変更"
+        assert cased[0]["sample_lines"][0]["line"] == 2
+
+    def test_find_matching_lines(self):
+        """Each matching line is reported once with its 1-based number."""
+        combined = re.compile("foo|bar", re.IGNORECASE)
+        content = "foo bar\nnone\n\nBAR\nlast foo"
+
+        assert _find_matching_lines(content, combined) == [
+            (1, "foo bar"), (4, "BAR"), (5, "last foo"),
+        ]
+
+    def test_literal_scan_matches_regex_scan(self):
+        """bytes.find aggregation equals regex aggregation over matching lines."""
+        content = "Foo foo\r\nnone\n\nBAR foo\n価格 bar\nlast FOO"
+        keyword_patterns = tuple(
+            (kw, re.compile(re.escape(kw), re.IGNORECASE)) for kw in ["foo", "Bar", "価格"]
+        )
+        combined = re.compile("foo|Bar|価格", re.IGNORECASE)
+
+        expected = _aggregate_mentions(_find_matching_lines(content, combined), keyword_patterns)
+
+        assert _aggregate_literal_mentions(content.encode("utf-8"), keyword_patterns) == expected
+        assert expected["match_count"] == 6
+
+    def test_include_globs_match_relative_paths(self):
+        """Include patterns follow pathlib glob semantics for ** and *."""
+        assert _compile_glob("**/*.md").fullmatch("README.md")
+        assert _compile_glob("**/*.md").fullmatch("a/b/guide.md")
+        assert _compile_glob("**/docs/**/*").fullmatch("pkg/docs/api/index.rst")
+        assert not _compile_glob("**/docs/**/*").fullmatch("mydocs/index.rst")
+        assert not _compile_glob("*.md").fullmatch("a/guide.md")
+
+    def test_parse_rg_matching_lines(self):
+        """ripgrep JSON match events are grouped per file."""
+        stdout = b"\n".join([
+            b'{"type":"begin","data":{"path":{"text":"/r/a.md"}}}',
+            b'{"type":"match","data":{"path":{"text":"/r/a.md"},'
+            b'"lines":{"text":"Product line\\n"},"line_number":4,"submatches":[]}}',
+            b'{"type":"match","data":{"path":{"text":"/r/b.md"},'
+            b'"lines":{"bytes":"/w=="},"line_number":1,"submatches":[]}}',
+            b'{"type":"end","data":{}}',
+        ])
+
+        assert _parse_rg_matching_lines(stdout) == {"/r/a.md": [(4, "Product line\n")]}
+
+
 class TestAnalyzeImpact:
     """Integration tests for analyze_impact function."""
 
@@ -322,6 +784,52 @@ class TestAnalyzeImpact:
             assert "impact_analysis" in result
             assert "confirmation_required" in result
 
+    @pytest.mark.asyncio
+    async def test_analyze_multiple_targets(self):
+        """Naming matches from every target file should be merged."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "Product.php").write_text("<?php class Product {}")
+            (Path(tmpdir) / "Order.php").write_text("<?php class Order {}")
+            (Path(tmpdir) / "ProductTest.php").write_text("<?php")
+            (Path(tmpdir) / "OrderFactory.php").write_text("<?php")
+
+            result = await analyze_impact(
+                target_files=[
+                    str(Path(tmpdir) / "Product.php"),
+                    str(Path(tmpdir) / "Order.php"),
+                ],
+                repo_path=tmpdir
+            )
+
+            matches = result["impact_analysis"]["naming_convention_matches"]
+            assert [Path(f).name for f in matches["tests"]] == ["ProductTest.php"]
+            assert [Path(f).name for f in matches["factories"]] == ["OrderFactory.php"]
+
+    @pytest.mark.asyncio
+    async def test_target_files_excluded_from_verification(self):
+        """Target files should not be listed for verification, however spelled."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "Product.php").write_text("<?php class Product {}")
+            (Path(tmpdir) / "ProductTest.php").write_text("<?php")
+
+            result = await analyze_impact(
+                target_files=[
+                    str(Path(tmpdir) / "Product.php"),
+                    str(Path(tmpdir) / "sub" / ".." / "ProductTest.php"),
+                ],
+                repo_path=tmpdir
+            )
+
+            assert result["confirmation_required"]["should_verify"] == []
+
+            # Relative target paths are relative to the repository root
+            result = await analyze_impact(
+                target_files=["Product.php", "ProductTest.php"],
+                repo_path=tmpdir
+            )
+
+            assert result["confirmation_required"]["should_verify"] == []
+
 
 class TestImpactAnalysisResult:
     """Tests for ImpactAnalysisResult dataclass."""
@@ -0,0 +1,223 @@
+"""
+Tests for Learned Pairs Cache module.
+
+Tests:
+- (nl_term, symbol) indexing and in-place updates
+- Matching against exploration results
+- Persistence, deferred writes and cleanup
+- LRU size cap
+- Append-only JSONL log, compaction and legacy JSON migration
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from tools.learned_pairs import LearnedPairsCache, cache_successful_pairs, get_learned_pairs_cache
+
+
+class TestLearnedPairsIndex:
+    """Tests for the (nl_term, symbol) index."""
+
+    def test_add_pair_updates_existing(self, tmp_path: Path):
+        """Adding the same pair twice should update it in place."""
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pair("login", "AuthService", 0.7, None, "s1")
+        cache.add_pair("login", "AuthService", 0.9, "def login", "s2")
+
+        [pair] = cache.find_matches("login", ["AuthService"])
+
+        assert (pair.similarity, pair.code_evidence, pair.session_id) == (0.9, "def login", "s2")
+        assert cache.get_stats()["total_pairs"] == 1
+
+    def test_find_matches_only_learned_symbols(self, tmp_path: Path):
+        """Only symbols learned for the same nl_term should match."""
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pair("login", "AuthService", 0.9, None, "s1")
+        cache.add_pair("login", "LoginForm", 0.8, None, "s1")
+        cache.add_pair("cart", "CartItem", 0.8, None, "s1")
+
+        matches = cache.find_matches("login", ["LoginForm", "CartItem", "AuthService", "LoginForm"])
+
+        assert [p.symbol for p in matches] == ["LoginForm", "AuthService"]
+        assert cache.find_matches("unknown", ["AuthService"]) == []
+
+    def test_find_matches_accepts_sets(self, tmp_path: Path):
+        """Unordered symbol collections are matched by set intersection."""
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pair("login", "AuthService", 0.9, None, "s1")
+        cache.add_pair("login", "LoginForm", 0.8, None, "s1")
+
+        matches = cache.find_matches("login", frozenset({"LoginForm", "CartItem"}))
+
+        assert [p.symbol for p in matches] == ["LoginForm"]
+
+    def test_add_pairs_share_timestamp(self, tmp_path: Path):
+        """Pairs added in one batch get the same learned_at."""
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pairs([("login", "AuthService", 0.9, None, "s1"), ("login", "LoginForm", 0.8, None, "s1")])
+
+        matches = cache.find_matches("login", ["AuthService", "LoginForm"])
+
+        assert matches[0].learned_at == matches[1].learned_at
+
+    def test_stats(self, tmp_path: Path):
+        """Stats should count pairs, terms and symbols."""
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pair("login", "AuthService", 0.9, None, "s1")
+        cache.add_pair("auth", "AuthService", 0.9, None, "s1")
+
+        stats = cache.get_stats()
+
+        assert (stats["total_pairs"], stats["unique_nl_terms"], stats["unique_symbols"]) == (2, 2, 1)
+
+
+class TestPersistence:
+    """Tests for saving, loading and cleanup."""
+
+    def test_reload_from_disk(self, tmp_path: Path):
+        """A new cache instance should see previously flushed pairs."""
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pair("login", "AuthService", 0.9, None, "s1")
+        cache.flush()
+
+        reloaded = LearnedPairsCache(str(tmp_path))
+
+        assert [p.symbol for p in reloaded.find_matches("login", ["AuthService"])] == ["AuthService"]
+
+    def test_add_pair_defers_save(self, tmp_path: Path, monkeypatch):
+        """add_pair should not write until flush, and flush only when dirty."""
+        cache = LearnedPairsCache(str(tmp_path))
+        saves = []
+        monkeypatch.setattr(cache, "save", lambda: saves.append(1) or setattr(cache, "_dirty", False))
+
+        cache.add_pair("login", "AuthService", 0.9, None, "s1")
+        cache.add_pair("login", "LoginForm", 0.8, None, "s1")
+        assert saves == []
+
+        cache.flush()
+        cache.flush()
+        assert saves == [1]
+
+    def test_flush_each_saves_immediately(self, tmp_path: Path):
+        """flush_each=True should keep the old write-through behavior."""
+        LearnedPairsCache(str(tmp_path), flush_each=True).add_pair(
+            "login", "AuthService", 0.9, None, "s1"
+        )
+
+        assert LearnedPairsCache(str(tmp_path)).get_stats()["total_pairs"] == 1
+
+    def test_cache_successful_pairs_bulk(self, tmp_path: Path):
+        """The bulk helper should add every pair and persist them."""
+        count = cache_successful_pairs(
+            [("login", "AuthService", 0.9, None, "s1"), ("login", "LoginForm", 0.8, "x", "s1")],
+            project_root=str(tmp_path),
+        )
+
+        assert count == 2
+        assert LearnedPairsCache(str(tmp_path)).get_stats()["total_pairs"] == 2
+
+    def test_cache_per_project_root(self, tmp_path: Path, monkeypatch):
+        """Relative and absolute spellings of a root share one instance per project."""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        monkeypatch.chdir(tmp_path / "a")
+
+        cache_a = get_learned_pairs_cache(".")
+
+        assert get_learned_pairs_cache(str(tmp_path / "a")) is cache_a
+        assert get_learned_pairs_cache(str(tmp_path / "b")) is not cache_a
+        monkeypatch.chdir(tmp_path / "b")
+        assert get_learned_pairs_cache(".") is get_learned_pairs_cache(str(tmp_path / "b"))
+
+    def test_cleanup_old_pairs(self, tmp_path: Path):
+        """Pairs older than MAX_AGE_DAYS should be removed from the index."""
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pair("login", "AuthService", 0.9, None, "s1")
+        cache.add_pair("login", "OldService", 0.9, None, "s1", learned_at="2000-01-01T00:00:00")
+
+        assert cache.cleanup_old_pairs() == 1
+        assert cache.find_matches("login", ["AuthService", "OldService"])[0].symbol == "AuthService"
+        assert LearnedPairsCache(str(tmp_path)).get_stats()["total_pairs"] == 1
+
+    def test_cleanup_skips_scan_when_nothing_expired(self, tmp_path: Path, monkeypatch):
+        """Cleanup returns early when the oldest pair is still fresh."""
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pair("login", "AuthService", 0.9, None, "s1")
+        monkeypatch.setattr(cache, "save", lambda: pytest.fail("nothing to save"))
+
+        assert cache.cleanup_old_pairs() == 0
+        assert cache.get_stats()["total_pairs"] == 1
+
+
+class TestJsonlLog:
+    """Tests for the append-only JSONL format."""
+
+    def test_updates_are_appended(self, tmp_path: Path):
+        """Each flush appends changed pairs; the last line for a key wins."""
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pairs([("login", "AuthService", 0.7, None, "s1"), ("login", "LoginForm", 0.8, None, "s1")])
+        cache.add_pairs([("login", "AuthService", 0.9, None, "s2")])
+
+        lines = cache.cache_path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 3
+
+        reloaded = LearnedPairsCache(str(tmp_path))
+        [pair] = reloaded.find_matches("login", ["AuthService"])
+        assert (pair.similarity, pair.session_id) == (0.9, "s2")
+
+    def test_compacts_when_log_outgrows_pairs(self, tmp_path: Path):
+        """The log is rewritten as a snapshot once it holds too many stale lines."""
+        cache = LearnedPairsCache(str(tmp_path))
+        for i in range(5):
+            cache.add_pairs([("login", "AuthService", i / 10, None, "s1")])
+
+        lines = cache.cache_path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) <= LearnedPairsCache.COMPACT_RATIO
+        assert json.loads(lines[-1])["similarity"] == 0.4
+
+    def test_migrates_legacy_json(self, tmp_path: Path):
+        """Pairs from learned_pairs.json are loaded and written as JSONL."""
+        legacy = tmp_path / LearnedPairsCache.LEGACY_PATH
+        legacy.parent.mkdir(parents=True)
+        legacy.write_text(json.dumps({"version": 1, "pairs": [{
+            "nl_term": "login", "symbol": "AuthService", "similarity": 0.9,
+            "code_evidence": None, "session_id": "s1", "learned_at": "2099-01-01T00:00:00",
+        }]}), encoding="utf-8")
+
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pairs([("cart", "CartItem", 0.8, None, "s2")])
+
+        reloaded = LearnedPairsCache(str(tmp_path))
+        assert reloaded.get_stats()["total_pairs"] == 2
+        assert reloaded.cache_path.suffix == ".jsonl"
+
+
+class TestSizeCap:
+    """Tests for the MAX_PAIRS LRU cap."""
+
+    def test_evicts_least_recently_used(self, tmp_path: Path, monkeypatch):
+        """Matched pairs are kept; the least recently used pair is evicted."""
+        monkeypatch.setattr(LearnedPairsCache, "MAX_PAIRS", 2)
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pair("login", "AuthService", 0.9, None, "s1")
+        cache.add_pair("login", "LoginForm", 0.8, None, "s1")
+        cache.find_matches("login", ["AuthService"])
+
+        cache.add_pair("cart", "CartItem", 0.8, None, "s1")
+
+        assert [p.symbol for p in cache.find_matches("login", ["AuthService", "LoginForm"])] == ["AuthService"]
+        assert cache.get_stats()["total_pairs"] == 2
+
+    def test_eviction_persisted_as_snapshot(self, tmp_path: Path, monkeypatch):
+        """Evicted pairs do not come back from stale log lines."""
+        monkeypatch.setattr(LearnedPairsCache, "MAX_PAIRS", 2)
+        cache = LearnedPairsCache(str(tmp_path))
+        cache.add_pairs([("login", "AuthService", 0.9, None, "s1"), ("login", "LoginForm", 0.8, None, "s1")])
+        cache.add_pairs([("cart", "CartItem", 0.8, None, "s2")])
+
+        reloaded = LearnedPairsCache(str(tmp_path))
+
+        assert reloaded.find_matches("login", ["AuthService"]) == []
+        assert reloaded.get_stats()["total_pairs"] == 2
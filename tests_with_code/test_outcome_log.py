@@ -0,0 +1,257 @@
+"""
+Tests for Improvement Cycle Logs module.
+
+Tests:
+- Recording outcomes and decisions
+- Session lookups through the in-memory session index
+- Reading recent outcomes from the end of the log
+- Joining outcomes with decisions in get_improvement_insights
+- Failure statistics
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from tools import outcome_log
+
+
+@pytest.fixture
+def log_files(tmp_path: Path, monkeypatch) -> tuple[Path, Path]:
+    """Point the decision and outcome logs at temporary files."""
+    decisions = tmp_path / "decisions.jsonl"
+    outcomes = tmp_path / "outcomes.jsonl"
+    monkeypatch.setattr(outcome_log, "DECISION_LOG_FILE", decisions)
+    monkeypatch.setattr(outcome_log, "OUTCOME_LOG_FILE", outcomes)
+    return decisions, outcomes
+
+
+def _append(path: Path, *records: dict) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class TestRecordFunctions:
+    """Tests for record_outcome / record_decision (file output is disabled)."""
+
+    def test_records_not_written(self, log_files):
+        """Recording succeeds without writing to the logs."""
+        decisions, outcomes = log_files
+
+        decision = outcome_log.record_decision({"session_id": "a", "intent": "IMPLEMENT"})
+        outcome = outcome_log.record_outcome(outcome_log.OutcomeLog(
+            session_id="a", outcome="success", phase_at_outcome="READY", intent="IMPLEMENT",
+        ))
+
+        assert decision["success"] and decision["record_id"].startswith("decision_a_")
+        assert outcome["success"] and outcome["record_id"].startswith("outcome_a_")
+        assert not decisions.exists() and not outcomes.exists()
+
+    def test_analysis_serialized(self):
+        """The nested analysis is serialized as a plain dict."""
+        record = outcome_log.OutcomeLog(
+            session_id="a", outcome="failure", phase_at_outcome="READY", intent="MODIFY",
+            analysis=outcome_log.OutcomeAnalysis(root_cause="wrong file", related_symbols=["Cart"]),
+        ).to_dict()
+
+        assert record["analysis"]["root_cause"] == "wrong file"
+        assert record["analysis"]["related_symbols"] == ["Cart"]
+
+
+class TestSessionIndex:
+    """Tests for session_id lookups."""
+
+    def test_outcomes_for_session(self, log_files):
+        """Only the session's records are returned, in file order."""
+        _, outcomes = log_files
+        _append(
+            outcomes,
+            {"session_id": "a", "outcome": "failure"},
+            {"session_id": "b", "outcome": "success"},
+            {"session_id": "a", "outcome": "success"},
+        )
+
+        result = outcome_log.get_outcomes_for_session("a")
+
+        assert [r["outcome"] for r in result] == ["failure", "success"]
+        assert outcome_log.get_outcomes_for_session("missing") == []
+
+    def test_index_follows_appends(self, log_files):
+        """Records appended after the first lookup are found too."""
+        _, outcomes = log_files
+        _append(outcomes, {"session_id": "a", "outcome": "failure"})
+        assert len(outcome_log.get_outcomes_for_session("a")) == 1
+
+        _append(outcomes, {"session_id": "a", "outcome": "success", "note": "日本語"})
+
+        assert [r["outcome"] for r in outcome_log.get_outcomes_for_session("a")] == [
+            "failure", "success",
+        ]
+
+    def test_index_rebuilt_after_truncation(self, log_files):
+        """A rewritten (shorter) log is indexed from the start again."""
+        _, outcomes = log_files
+        _append(outcomes, {"session_id": "a", "outcome": "failure", "padding": "x" * 100})
+        outcome_log.get_outcomes_for_session("a")
+
+        outcomes.write_text(json.dumps({"session_id": "b", "outcome": "success"}) + "\n")
+
+        assert outcome_log.get_outcomes_for_session("a") == []
+        assert len(outcome_log.get_outcomes_for_session("b")) == 1
+
+    def test_index_rebuilt_after_same_size_rewrite(self, log_files):
+        """A log replaced by one of the same size does not return other sessions' records."""
+        _, outcomes = log_files
+        _append(outcomes, {"session_id": "a", "outcome": "failure"}, {"session_id": "b", "outcome": "success"})
+        index = outcome_log._session_index(outcomes)
+        index.lookup("a")
+
+        outcomes.unlink()
+        _append(outcomes, {"session_id": "b", "outcome": "success"}, {"session_id": "a", "outcome": "failure"})
+
+        assert index.read_latest(["a", "b"]) == {
+            "a": {"session_id": "a", "outcome": "failure"},
+            "b": {"session_id": "b", "outcome": "success"},
+        }
+
+        outcomes.unlink()
+        _append(outcomes, {"session_id": "a", "outcome": "failure"}, {"session_id": "b", "outcome": "success"})
+
+        assert outcome_log.get_outcomes_for_session("a") == [{"session_id": "a", "outcome": "failure"}]
+
+    def test_decision_for_session(self, log_files):
+        """The first decision of the session is returned."""
+        decisions, _ = log_files
+        _append(
+            decisions,
+            {"session_id": "a", "intent": "IMPLEMENT"},
+            {"session_id": "a", "intent": "MODIFY"},
+        )
+
+        assert outcome_log.get_decision_for_session("a")["intent"] == "IMPLEMENT"
+        assert outcome_log.get_decision_for_session("b") is None
+
+
+class TestRecentOutcomes:
+    """Tests for get_recent_outcomes reading from the tail."""
+
+    def test_returns_last_records_in_order(self, log_files, monkeypatch):
+        """Records spanning several blocks are returned oldest first."""
+        _, outcomes = log_files
+        monkeypatch.setattr(outcome_log, "LOG_TAIL_BLOCK_SIZE", 16)
+        _append(outcomes, *({"session_id": str(i), "note": "日本語"} for i in range(10)))
+        with open(outcomes, "a", encoding="utf-8") as f:
+            f.write("not json\n\n")
+
+        result = outcome_log.get_recent_outcomes(limit=3)
+
+        assert [r["session_id"] for r in result] == ["7", "8", "9"]
+
+    def test_limit_larger_than_log(self, log_files):
+        """All records are returned when the log is shorter than limit."""
+        _, outcomes = log_files
+        _append(outcomes, {"session_id": "a"}, {"session_id": "b"})
+
+        assert [r["session_id"] for r in outcome_log.get_recent_outcomes()] == ["a", "b"]
+
+
+class TestImprovementInsights:
+    """Tests for the decision/outcome join."""
+
+    def test_join_counts(self, log_files):
+        """Failures are attributed to the tools and risk of their decision."""
+        decisions, outcomes = log_files
+        _append(
+            decisions,
+            {"session_id": "a", "risk_level": "LOW", "tools_planned": ["query"]},
+            {"session_id": "a", "risk_level": "HIGH", "tools_planned": ["query", "find_definitions"]},
+            {"session_id": "b", "risk_level": "LOW", "tools_planned": ["query"]},
+            {"session_id": "old", "risk_level": "LOW", "tools_planned": ["query"]},
+        )
+        _append(
+            outcomes,
+            {"session_id": "a", "outcome": "failure", "analysis": {"failure_point": "SEMANTIC"}},
+            {"session_id": "b", "outcome": "success"},
+            {"session_id": "c", "outcome": "failure", "analysis": {"failure_point": "SEMANTIC"}},
+        )
+
+        insights = outcome_log.get_improvement_insights()
+
+        assert insights["total_sessions_with_outcomes"] == 3
+        assert insights["sessions_with_decisions"] == 2
+        assert insights["tool_failure_correlation"] == {"query": 1, "find_definitions": 1}
+        assert insights["risk_level_correlation"]["HIGH"] == {"success": 0, "failure": 1}
+        assert insights["risk_level_correlation"]["LOW"] == {"success": 1, "failure": 0}
+        assert insights["common_failure_points"] == {"SEMANTIC": 2}
+
+    def test_decisions_appended_later_are_joined(self, log_files):
+        """Decisions recorded after an earlier analysis are picked up by the index."""
+        decisions, outcomes = log_files
+        _append(decisions, {"session_id": "a", "risk_level": "LOW", "tools_planned": []})
+        _append(outcomes, {"session_id": "a", "outcome": "failure"}, {"session_id": "b", "outcome": "failure"})
+        assert outcome_log.get_improvement_insights()["sessions_with_decisions"] == 1
+
+        _append(decisions, {"session_id": "b", "risk_level": "HIGH", "tools_planned": ["query"]})
+
+        insights = outcome_log.get_improvement_insights()
+        assert insights["sessions_with_decisions"] == 2
+        assert insights["tool_failure_correlation"] == {"query": 1}
+
+    def test_malformed_decision_fields_tolerated(self, log_files):
+        """A null risk level or non-string tools do not break the analysis."""
+        decisions, outcomes = log_files
+        _append(
+            decisions,
+            {"session_id": "a", "risk_level": None, "tools_planned": ["query", 3, None]},
+            {"session_id": "b", "risk_level": "HIGH", "tools_planned": None},
+        )
+        _append(outcomes, {"session_id": "a", "outcome": "failure"}, {"session_id": "b", "outcome": "failure"})
+
+        insights = outcome_log.get_improvement_insights()
+
+        assert insights["sessions_with_decisions"] == 2
+        assert insights["tool_failure_correlation"] == {"query": 1}
+        assert insights["risk_level_correlation"]["HIGH"] == {"success": 0, "failure": 1}
+
+
+class TestFailureStats:
+    """Tests for get_failure_stats breakdowns."""
+
+    def test_breakdowns(self, log_files):
+        """Counts are split by outcome, intent, phase, semantic use and confidence."""
+        _, outcomes = log_files
+        _append(
+            outcomes,
+            {"outcome": "failure", "intent": "MODIFY", "phase_at_outcome": "READY",
+             "semantic_used": True, "confidence_was": "low"},
+            {"outcome": "failure", "intent": "MODIFY", "phase_at_outcome": "READY",
+             "semantic_used": True, "confidence_was": "low"},
+            {"outcome": "success", "intent": "IMPLEMENT", "phase_at_outcome": "READY",
+             "semantic_used": False, "confidence_was": "high"},
+            {"outcome": "partial", "intent": "MODIFY", "phase_at_outcome": "SEMANTIC"},
+        )
+
+        stats = outcome_log.get_failure_stats()
+
+        assert stats["total"] == 4
+        assert stats["by_outcome"] == {"success": 1, "failure": 2, "partial": 1}
+        assert stats["by_intent"]["MODIFY"] == {"success": 0, "failure": 2, "partial": 1}
+        assert list(stats["by_phase"]) == ["READY", "SEMANTIC"]
+        assert stats["semantic_correlation"]["with_semantic"] == {"success": 0, "failure": 2}
+        assert stats["confidence_correlation"]["high"] == {"success": 1, "failure": 0}
+
+    def test_fast_path_matches_full_parse(self):
+        """Regex-extracted fields equal the fields of a full JSON parse."""
+        record = outcome_log.OutcomeLog(
+            session_id="a", outcome="failure", phase_at_outcome="READY", intent="MODIFY",
+            semantic_used=True, confidence_was="low", trigger_message='said "outcome": "success"',
+        ).to_dict()
+        line = json.dumps(record, ensure_ascii=False).encode()
+
+        assert outcome_log._STATS_FIELDS_RE.search(line)
+        assert outcome_log._parse_stats_fields(line) == ("failure", "MODIFY", "READY", True, "low")
+        assert outcome_log._parse_stats_fields(b'{"outcome": "success"}') == (
+            "success", "unknown", "unknown", False, "unknown",
+        )
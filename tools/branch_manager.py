@@ -38,13 +38,20 @@ Usage:
 """
 
 import asyncio
+import os
 import re
-import subprocess
+import shutil
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Literal
 
+try:
+    import pygit2
+    PYGIT2_AVAILABLE = True
+except ImportError:
+    PYGIT2_AVAILABLE = False
+
 
 @dataclass
 class BranchSetupResult:
@@ -85,6 +92,46 @@ class FinalizeResult:
     prepared: bool = False  # v1.8: True if commit is prepared but not executed
 
 
+# C-style escapes git uses in quoted paths (core.quotePath)
+_QUOTED_PATH_ESCAPE = re.compile(rb'\\([0-7]{3}|.)', re.DOTALL)
+_QUOTED_PATH_CHARS = {
+    b"a": b"\a", b"b": b"\b", b"t": b"\t", b"n": b"\n", b"v": b"\v",
+    b"f": b"\f", b"r": b"\r", b'"': b'"', b"\\": b"\\",
+}
+
+
+class _GitResult:
+    """
+    Result of a git command.
+
+    Same attributes as subprocess.CompletedProcess, but stdout/stderr are
+    decoded on first access, so callers that only check returncode (reverts,
+    branch deletions) never decode the output.
+    """
+
+    __slots__ = ("args", "returncode", "stdout_raw", "stderr_raw", "_stdout", "_stderr")
+
+    def __init__(self, args: list[str], returncode: int, stdout_raw: bytes, stderr_raw: bytes):
+        self.args = args
+        self.returncode = returncode
+        self.stdout_raw = stdout_raw
+        self.stderr_raw = stderr_raw
+        self._stdout: str | None = None
+        self._stderr: str | None = None
+
+    @property
+    def stdout(self) -> str:
+        if self._stdout is None:
+            self._stdout = self.stdout_raw.decode() if self.stdout_raw else ""
+        return self._stdout
+
+    @property
+    def stderr(self) -> str:
+        if self._stderr is None:
+            self._stderr = self.stderr_raw.decode() if self.stderr_raw else ""
+        return self._stderr
+
+
 class BranchManager:
     """
     Manages git branches for session-based file isolation.
@@ -93,6 +140,15 @@ class BranchManager:
     for review before commit and merge.
     """
 
+    # git executable, resolved once so each call execs it without a PATH search
+    GIT_BIN = shutil.which("git") or "git"
+    # Max git processes run at once for independent per-file/per-branch commands
+    GIT_CONCURRENCY = 8
+    # Bytes read per step when streaming `git diff` output
+    DIFF_READ_SIZE = 64 * 1024
+    # Paths per `git checkout <base> -- <paths...>` (keeps argv well below ARG_MAX)
+    CHECKOUT_BATCH_SIZE = 500
+
     def __init__(self, repo_path: str):
         """
         Initialize BranchManager.
@@ -101,6 +157,9 @@ class BranchManager:
             repo_path: Path to the git repository root
         """
         self.repo_path = Path(repo_path).resolve()
+        # Reused by every git call
+        self._repo_path_str = str(self.repo_path)
+        self._env = self._git_env()
 
         # Active session tracking
         self._active_session: str | None = None
@@ -202,25 +261,27 @@ class BranchManager:
                 "session_id": str | None  # Extracted from branch name if task branch
             }
         """
-        repo = Path(repo_path).resolve()
+        repo = str(Path(repo_path).resolve())
 
         try:
-            proc = await asyncio.create_subprocess_exec(
-                "git", "rev-parse", "--abbrev-ref", "HEAD",
-                cwd=str(repo),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
-
-            if proc.returncode != 0:
+            current_branch = None
+            if PYGIT2_AVAILABLE:
+                try:
+                    current_branch = cls._head_branch_pygit2(pygit2.Repository(repo))
+                except Exception:
+                    pass  # Fall back to git CLI
+
+            if current_branch is None:
+                result = await cls._run_git_in(repo, ["rev-parse", "--abbrev-ref", "HEAD"])
+                current_branch = result.stdout.strip() if result.returncode == 0 else ""
+
+            if not current_branch:
                 return {
                     "is_task_branch": False,
                     "current_branch": "",
                     "session_id": None,
                 }
 
-            current_branch = stdout.decode().strip()
             is_task = current_branch.startswith("llm_task_")
 
             session_id = None
@@ -271,71 +332,32 @@ class BranchManager:
                 ]
             }
         """
-        repo = Path(repo_path).resolve()
+        repo = str(Path(repo_path).resolve())
         stale_branches = []
 
         try:
-            # Get current branch
-            proc = await asyncio.create_subprocess_exec(
-                "git", "rev-parse", "--abbrev-ref", "HEAD",
-                cwd=str(repo),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
-            current_branch = stdout.decode().strip() if proc.returncode == 0 else ""
+            task_branches = None
+            if PYGIT2_AVAILABLE:
+                try:
+                    task_branches = await asyncio.to_thread(cls._read_task_branches_pygit2, repo)
+                except Exception:
+                    pass  # Fall back to git CLI
+            if task_branches is None:
+                task_branches = await cls._read_task_branches(repo)
+            current_branch, branches, commit_counts = task_branches
             is_on_task_branch = current_branch.startswith("llm_task_")
 
-            # List all llm_task_* branches
-            proc = await asyncio.create_subprocess_exec(
-                "git", "branch", "--list", "llm_task_*",
-                cwd=str(repo),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
-
-            if proc.returncode == 0 and stdout:
-                branches = [
-                    b.strip().lstrip("* ")
-                    for b in stdout.decode().strip().split("\n")
-                    if b.strip()
-                ]
-
-                for branch in branches:
-                    # Parse branch info
-                    parsed = cls.parse_task_branch(branch)
-                    session_id = parsed["session_id"] if parsed else None
-                    base_branch = parsed["base_branch"] if parsed else None
-
-                    # Check if branch has changes compared to base
-                    has_changes = False
-                    commit_count = 0
-
-                    if base_branch:
-                        # Count commits ahead of base
-                        proc = await asyncio.create_subprocess_exec(
-                            "git", "rev-list", "--count",
-                            f"{base_branch}..{branch}",
-                            cwd=str(repo),
-                            stdout=asyncio.subprocess.PIPE,
-                            stderr=asyncio.subprocess.PIPE,
-                        )
-                        stdout, _ = await proc.communicate()
-                        if proc.returncode == 0:
-                            try:
-                                commit_count = int(stdout.decode().strip())
-                                has_changes = commit_count > 0
-                            except ValueError:
-                                pass
-
-                    stale_branches.append({
-                        "name": branch,
-                        "session_id": session_id,
-                        "base_branch": base_branch,
-                        "has_changes": has_changes,
-                        "commit_count": commit_count,
-                    })
+            for branch in branches:
+                parsed = cls.parse_task_branch(branch)
+                # Check if branch has changes compared to base
+                commit_count = commit_counts.get(branch, 0)
+                stale_branches.append({
+                    "name": branch,
+                    "session_id": parsed["session_id"] if parsed else None,
+                    "base_branch": parsed["base_branch"] if parsed else None,
+                    "has_changes": commit_count > 0,
+                    "commit_count": commit_count,
+                })
 
             return {
                 "current_branch": current_branch,
@@ -351,6 +373,86 @@ class BranchManager:
                 "error": str(e),
             }
 
+    @classmethod
+    async def _read_task_branches(cls, repo: str) -> tuple[str, list[str], dict[str, int]]:
+        """
+        Get the current branch, all llm_task_* branches and their commits
+        ahead of base, using the git CLI.
+        """
+        env = cls._git_env()
+        # Get current branch and list all llm_task_* branches concurrently
+        head_result, list_result = await asyncio.gather(
+            cls._run_git_in(repo, ["rev-parse", "--abbrev-ref", "HEAD"], env),
+            cls._run_git_in(repo, ["branch", "--list", "llm_task_*"], env),
+        )
+        current_branch = head_result.stdout.strip() if head_result.returncode == 0 else ""
+        if list_result.returncode != 0 or not list_result.stdout:
+            return current_branch, [], {}
+
+        branches = [
+            b.strip().lstrip("* ")
+            for b in list_result.stdout.strip().split("\n")
+            if b.strip()
+        ]
+
+        # Count commits ahead of base for all branches with a known base
+        # (independent read-only queries, run a few at a time)
+        counted = []
+        for branch in branches:
+            parsed = cls.parse_task_branch(branch)
+            if parsed and parsed["base_branch"]:
+                counted.append((branch, parsed["base_branch"]))
+        count_results = await cls._run_git_many(repo, [
+            ["rev-list", "--count", f"{base_branch}..{branch}"]
+            for branch, base_branch in counted
+        ], env)
+        commit_counts = {}
+        for (branch, _), count_result in zip(counted, count_results):
+            if isinstance(count_result, BaseException) or count_result.returncode != 0:
+                continue
+            try:
+                commit_counts[branch] = int(count_result.stdout.strip())
+            except ValueError:
+                pass
+
+        return current_branch, branches, commit_counts
+
+    @classmethod
+    def _read_task_branches_pygit2(cls, repo: str) -> tuple[str, list[str], dict[str, int]]:
+        """
+        Same as _read_task_branches, in-process with pygit2 (no git subprocesses).
+
+        Blocking; run it in a thread.
+        """
+        git_repo = pygit2.Repository(repo)
+        current_branch = cls._head_branch_pygit2(git_repo)
+        # Same order as `git branch --list` (refname order)
+        branches = sorted(name for name in git_repo.branches.local if name.startswith("llm_task_"))
+
+        commit_counts = {}
+        for branch in branches:
+            parsed = cls.parse_task_branch(branch)
+            if not parsed or not parsed["base_branch"]:
+                continue
+            try:
+                branch_commit = git_repo.revparse_single(branch).peel(pygit2.Commit)
+                base_commit = git_repo.revparse_single(parsed["base_branch"]).peel(pygit2.Commit)
+            except (KeyError, ValueError, pygit2.GitError):
+                continue  # Base branch no longer exists
+            # Ahead count == `git rev-list --count <base>..<branch>`
+            commit_counts[branch] = git_repo.ahead_behind(branch_commit.id, base_commit.id)[0]
+
+        return current_branch, branches, commit_counts
+
+    @staticmethod
+    def _head_branch_pygit2(git_repo) -> str:
+        """Current branch as `git rev-parse --abbrev-ref HEAD` prints it ("" if unborn)."""
+        if git_repo.head_is_unborn:
+            return ""
+        if git_repo.head_is_detached:
+            return "HEAD"
+        return git_repo.head.shorthand
+
     @classmethod
     async def delete_branch(cls, repo_path: str, branch_name: str, force: bool = True) -> dict:
         """
@@ -370,18 +472,13 @@ class BranchManager:
                 "error": str | None
             }
         """
-        repo = Path(repo_path).resolve()
+        repo = str(Path(repo_path).resolve())
+        env = cls._git_env()
 
         try:
             # Check if this is the current branch
-            proc = await asyncio.create_subprocess_exec(
-                "git", "rev-parse", "--abbrev-ref", "HEAD",
-                cwd=str(repo),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
-            current_branch = stdout.decode().strip() if proc.returncode == 0 else ""
+            result = await cls._run_git_in(repo, ["rev-parse", "--abbrev-ref", "HEAD"], env)
+            current_branch = result.stdout.strip() if result.returncode == 0 else ""
 
             if current_branch == branch_name:
                 return {
@@ -392,15 +489,9 @@ class BranchManager:
 
             # Delete the branch
             delete_flag = "-D" if force else "-d"
-            proc = await asyncio.create_subprocess_exec(
-                "git", "branch", delete_flag, branch_name,
-                cwd=str(repo),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            _, stderr = await proc.communicate()
+            result = await cls._run_git_in(repo, ["branch", delete_flag, branch_name], env)
 
-            if proc.returncode == 0:
+            if result.returncode == 0:
                 return {
                     "success": True,
                     "deleted": branch_name,
@@ -410,7 +501,7 @@ class BranchManager:
                 return {
                     "success": False,
                     "deleted": None,
-                    "error": stderr.decode().strip() if stderr else "Unknown error",
+                    "error": result.stderr.strip() if result.stderr else "Unknown error",
                 }
 
         except Exception as e:
@@ -441,22 +532,21 @@ class BranchManager:
                 "checked_out_to": str or None (if switched branch),
             }
         """
-        repo = Path(repo_path).resolve()
+        repo = str(Path(repo_path).resolve())
+        env = cls._git_env()
         errors = []
         deleted_branches = []
         merged_branches = []
         checked_out_to = None
 
         try:
-            # Get current branch
-            proc = await asyncio.create_subprocess_exec(
-                "git", "rev-parse", "--abbrev-ref", "HEAD",
-                cwd=str(repo),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+            # Get current branch and list all llm_task_* branches concurrently
+            # (checking out the base branch below does not change the list)
+            head_result, list_result = await asyncio.gather(
+                cls._run_git_in(repo, ["rev-parse", "--abbrev-ref", "HEAD"], env),
+                cls._run_git_in(repo, ["branch", "--list", "llm_task_*"], env),
             )
-            stdout, _ = await proc.communicate()
-            current_branch = stdout.decode().strip() if proc.returncode == 0 else ""
+            current_branch = head_result.stdout.strip() if head_result.returncode == 0 else ""
 
             # If currently on a llm_task_* branch, checkout to base branch first
             if current_branch.startswith("llm_task_"):
@@ -470,55 +560,29 @@ class BranchManager:
                     base_branch = "main"
 
                 # Checkout to base branch
-                proc = await asyncio.create_subprocess_exec(
-                    "git", "checkout", base_branch,
-                    cwd=str(repo),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                stdout, stderr = await proc.communicate()
-                if proc.returncode == 0:
+                result = await cls._run_git_in(repo, ["checkout", base_branch], env)
+                if result.returncode == 0:
                     checked_out_to = base_branch
                 else:
                     # Try 'master' as fallback
-                    proc = await asyncio.create_subprocess_exec(
-                        "git", "checkout", "master",
-                        cwd=str(repo),
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
-                    stdout, stderr = await proc.communicate()
-                    if proc.returncode == 0:
+                    result = await cls._run_git_in(repo, ["checkout", "master"], env)
+                    if result.returncode == 0:
                         checked_out_to = "master"
                     else:
-                        errors.append(f"Failed to checkout to {base_branch}: {stderr.decode().strip()}")
-
-            # List all llm_task_* branches
-            proc = await asyncio.create_subprocess_exec(
-                "git", "branch", "--list", "llm_task_*",
-                cwd=str(repo),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, _ = await proc.communicate()
+                        errors.append(f"Failed to checkout to {base_branch}: {result.stderr.strip()}")
 
-            if proc.returncode == 0 and stdout:
+            if list_result.returncode == 0 and list_result.stdout:
                 branches = [
                     b.strip().lstrip("* ")
-                    for b in stdout.decode().strip().split("\n")
+                    for b in list_result.stdout.strip().split("\n")
                     if b.strip()
                 ]
 
                 # Re-check current branch after potential checkout
-                proc = await asyncio.create_subprocess_exec(
-                    "git", "rev-parse", "--abbrev-ref", "HEAD",
-                    cwd=str(repo),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
-                )
-                stdout, _ = await proc.communicate()
-                current_branch_now = stdout.decode().strip() if proc.returncode == 0 else ""
+                result = await cls._run_git_in(repo, ["rev-parse", "--abbrev-ref", "HEAD"], env)
+                current_branch_now = result.stdout.strip() if result.returncode == 0 else ""
 
+                to_delete = []
                 for branch in branches:
                     # Skip if still on this branch (checkout failed)
                     if branch == current_branch_now:
@@ -528,37 +592,40 @@ class BranchManager:
                     # Merge branch if action="merge"
                     if action == "merge":
                         try:
-                            proc = await asyncio.create_subprocess_exec(
-                                "git", "merge", branch, "--no-edit",
-                                cwd=str(repo),
-                                stdout=asyncio.subprocess.PIPE,
-                                stderr=asyncio.subprocess.PIPE,
-                            )
-                            stdout, stderr = await proc.communicate()
-                            if proc.returncode == 0:
+                            result = await cls._run_git_in(repo, ["merge", branch, "--no-edit"], env)
+                            if result.returncode == 0:
                                 merged_branches.append(branch)
                             else:
-                                errors.append(f"Failed to merge {branch}: {stderr.decode().strip()}")
+                                errors.append(f"Failed to merge {branch}: {result.stderr.strip()}")
                                 continue  # Skip deletion if merge failed
                         except Exception as e:
                             errors.append(f"Merge branch {branch}: {e}")
                             continue  # Skip deletion if merge failed
 
-                    # Delete branch
+                    to_delete.append(branch)
+
+                # Delete branches with one `git branch -D` (parallel deletions
+                # would contend for the packed-refs lock), then re-list to see
+                # which ones are gone (locale-independent, unlike git's messages)
+                if to_delete:
                     try:
-                        proc = await asyncio.create_subprocess_exec(
-                            "git", "branch", "-D", branch,
-                            cwd=str(repo),
-                            stdout=asyncio.subprocess.PIPE,
-                            stderr=asyncio.subprocess.PIPE,
+                        await cls._run_git_in(repo, ["branch", "-D", *to_delete], env)
+                        remaining_result = await cls._run_git_in(
+                            repo, ["branch", "--list", "llm_task_*"], env
                         )
-                        await proc.communicate()
-                        if proc.returncode == 0:
-                            deleted_branches.append(branch)
-                        else:
-                            errors.append(f"Failed to delete {branch}")
+                        if remaining_result.returncode != 0:
+                            raise RuntimeError(remaining_result.stderr.strip())
+                        remaining = {
+                            b.strip().lstrip("* ")
+                            for b in remaining_result.stdout.split("\n")
+                        }
+                        for branch in to_delete:
+                            if branch in remaining:
+                                errors.append(f"Failed to delete {branch}")
+                            else:
+                                deleted_branches.append(branch)
                     except Exception as e:
-                        errors.append(f"Delete branch {branch}: {e}")
+                        errors.append(f"Delete branches {', '.join(to_delete)}: {e}")
 
         except Exception as e:
             errors.append(f"List branches: {e}")
@@ -601,7 +668,7 @@ class BranchManager:
                 )
 
             # Guard: Check if already on a task branch
-            guard_result = await self.is_task_branch_checked_out(str(self.repo_path))
+            guard_result = await self.is_task_branch_checked_out(self._repo_path_str)
             if guard_result["is_task_branch"]:
                 return BranchSetupResult(
                     success=False,
@@ -615,12 +682,9 @@ class BranchManager:
                     ),
                 )
 
-            # Step 1: Get current branch (base branch to merge back to)
-            base_result = await self._run_git(["rev-parse", "--abbrev-ref", "HEAD"])
-            if base_result.returncode == 0:
-                self._base_branch = base_result.stdout.strip()
-            else:
-                self._base_branch = "main"  # Fallback
+            # Step 1: Current branch (base branch to merge back to), as already
+            # looked up by the guard; empty if rev-parse failed
+            self._base_branch = guard_result["current_branch"] or "main"  # Fallback
 
             # Step 2: Create and checkout new git branch (v1.2.2: with base branch info)
             branch_name = self._generate_branch_name(session_id, self._base_branch)
@@ -656,6 +720,44 @@ class BranchManager:
                 error=str(e),
             )
 
+    async def _get_changed_files(self) -> dict[str, str]:
+        """
+        Get changed files (path -> git status letter) vs the base branch.
+
+        Covers committed, uncommitted and untracked files, without diffs.
+        """
+        # Independent read-only queries run concurrently:
+        # - committed changes on this branch vs base
+        # - uncommitted and untracked files in one `git status`
+        committed_result, status_result = await asyncio.gather(
+            self._run_git(["diff", "-z", "--name-status", "--no-renames", f"{self._base_branch}...HEAD"]),
+            self._run_git(["status", "--porcelain=v2", "-z", "--untracked-files=all", "--no-renames"]),
+        )
+
+        if committed_result.returncode != 0:
+            # Fall back to direct diff if three-dot fails
+            committed_result = await self._run_git([
+                "diff", "-z", "--name-status", "--no-renames",
+                self._base_branch, "HEAD"
+            ])
+
+        # Combine results (uncommitted changes take precedence)
+        all_changes = {}
+
+        # Add committed changes first
+        if committed_result.returncode == 0:
+            all_changes.update(self._parse_name_status_z(committed_result.stdout_raw))
+
+        if status_result.returncode == 0:
+            uncommitted, untracked = self._parse_status_z(status_result.stdout_raw)
+            # Add/override with uncommitted changes
+            all_changes.update(uncommitted)
+            # Add untracked files (new files not yet staged)
+            for filepath in untracked:
+                all_changes.setdefault(filepath, "A")  # Mark as added
+
+        return all_changes
+
     async def get_changes(self) -> BranchChanges:
         """
         Get all changes in current branch compared to base branch.
@@ -672,51 +774,15 @@ class BranchManager:
         changes = []
 
         try:
-            # Get uncommitted changes (working directory vs HEAD)
-            uncommitted_result = await self._run_git([
-                "diff", "--name-status", "HEAD"
-            ])
-
-            # Get committed changes on this branch vs base
-            committed_result = await self._run_git([
-                "diff", "--name-status",
-                f"{self._base_branch}...HEAD"
-            ])
-
-            if committed_result.returncode != 0:
-                # Fall back to direct diff if three-dot fails
-                committed_result = await self._run_git([
-                    "diff", "--name-status",
-                    self._base_branch, "HEAD"
-                ])
-
-            # Combine results (uncommitted changes take precedence)
-            all_changes = {}
-
-            # Add committed changes first
-            if committed_result.returncode == 0 and committed_result.stdout.strip():
-                for line in committed_result.stdout.strip().split("\n"):
-                    if line:
-                        parts = line.split("\t", 1)
-                        if len(parts) >= 2:
-                            all_changes[parts[1]] = parts[0]
-
-            # Add/override with uncommitted changes
-            if uncommitted_result.returncode == 0 and uncommitted_result.stdout.strip():
-                for line in uncommitted_result.stdout.strip().split("\n"):
-                    if line:
-                        parts = line.split("\t", 1)
-                        if len(parts) >= 2:
-                            all_changes[parts[1]] = parts[0]
-
-            # Add untracked files (new files not yet staged)
-            untracked_result = await self._run_git([
-                "ls-files", "--others", "--exclude-standard"
-            ])
-            if untracked_result.returncode == 0 and untracked_result.stdout.strip():
-                for filepath in untracked_result.stdout.strip().split("\n"):
-                    if filepath and filepath not in all_changes:
-                        all_changes[filepath] = "A"  # Mark as added
+            # Changed files and diffs for all files at once (working directory
+            # vs base branch) are independent, so they run concurrently;
+            # --no-renames matches the old per-file diff output
+            all_changes, working_diffs = await asyncio.gather(
+                self._get_changed_files(),
+                self._run_git_diff_by_file(["diff", "--no-renames", self._base_branch]),
+            )
+            committed_diffs = None
+            untracked = []
 
             # Process each changed file
             for filepath, status in all_changes.items():
@@ -734,31 +800,22 @@ class BranchManager:
 
                 if change_type != "deleted":
                     # First try: working directory vs base branch
-                    diff_result = await self._run_git([
-                        "diff", self._base_branch, "--", filepath
-                    ])
-                    if diff_result.returncode != 0 or not diff_result.stdout.strip():
-                        # Fallback: committed changes only
-                        diff_result = await self._run_git([
-                            "diff", f"{self._base_branch}...HEAD", "--", filepath
-                        ])
-                    if diff_result.returncode == 0 and diff_result.stdout.strip():
-                        diff = diff_result.stdout
+                    diff = working_diffs.get(filepath)
+                    if not diff:
+                        # Fallback: committed changes only (fetched once, when first needed)
+                        if committed_diffs is None:
+                            committed_diffs = await self._run_git_diff_by_file([
+                                "diff", "--no-renames", f"{self._base_branch}...HEAD"
+                            ])
+                        diff = committed_diffs.get(filepath)
+                    if diff:
                         # Check if binary
-                        if "Binary files" in diff:
+                        if self._is_binary_diff(diff):
                             is_binary = True
                             diff = None
                     elif change_type == "added":
-                        # Untracked file: generate diff manually
-                        diff_result = await self._run_git([
-                            "diff", "--no-index", "/dev/null", filepath
-                        ])
-                        # --no-index returns 1 for differences, which is expected
-                        if diff_result.stdout.strip():
-                            diff = diff_result.stdout
-                            if "Binary files" in diff:
-                                is_binary = True
-                                diff = None
+                        # Untracked file: diffed against /dev/null below
+                        untracked.append(len(changes))
 
                 changes.append(FileChange(
                     path=filepath,
@@ -768,6 +825,21 @@ class BranchManager:
                     size_bytes=0,
                 ))
 
+            # Untracked files: generate diffs manually (a few at a time)
+            # --no-index returns 1 for differences, which is expected
+            untracked_results = await self._run_git_many(self._repo_path_str, [
+                ["diff", "--no-index", "/dev/null", changes[i].path]
+                for i in untracked
+            ], self._env)
+            for i, diff_result in zip(untracked, untracked_results):
+                if isinstance(diff_result, BaseException):
+                    continue
+                if diff_result.stdout.strip():
+                    if self._is_binary_diff(diff_result.stdout):
+                        changes[i].is_binary = True
+                    else:
+                        changes[i].diff = diff_result.stdout
+
             return BranchChanges(
                 session_id=self._active_session,
                 changes=changes,
@@ -810,12 +882,10 @@ class BranchManager:
             )
 
         try:
-            # Get all changes
-            changes = await self.get_changes()
+            # Get all changed files (names only; diffs are not needed here)
+            all_files = set(await self._get_changed_files())
 
             # Determine which files to keep
-            all_files = {c.path for c in changes.changes}
-
             if keep_files is not None:
                 files_to_keep = set(keep_files)
             else:
@@ -825,8 +895,7 @@ class BranchManager:
             files_to_discard = all_files - files_to_keep
 
             # Revert discarded files to base branch state
-            for filepath in files_to_discard:
-                await self._run_git(["checkout", self._base_branch, "--", filepath])
+            await self._checkout_from_base(sorted(files_to_discard))
 
             # Stage all changes (including reverts)
             if files_to_keep:
@@ -887,6 +956,28 @@ class BranchManager:
                 error=str(e),
             )
 
+    async def _checkout_from_base(self, paths: list[str]) -> None:
+        """
+        Restore paths to their base branch state.
+
+        Runs one `git checkout <base> -- <paths...>` per CHECKOUT_BATCH_SIZE
+        paths. A checkout fails as a whole if any path is missing on the base
+        branch (e.g. files added in this session, which were never restorable
+        one by one either), so such paths are filtered out first with
+        `git ls-tree`.
+        """
+        for start in range(0, len(paths), self.CHECKOUT_BATCH_SIZE):
+            batch = paths[start:start + self.CHECKOUT_BATCH_SIZE]
+            tree_result = await self._run_git([
+                "ls-tree", "-r", "-z", "--name-only", self._base_branch, "--", *batch
+            ])
+            if tree_result.returncode != 0:
+                continue
+            on_base = set(tree_result.stdout.split("\0"))
+            restorable = [path for path in batch if path in on_base]
+            if restorable:
+                await self._run_git(["checkout", self._base_branch, "--", *restorable])
+
     async def execute_prepared_commit(self, commit_message: str) -> FinalizeResult:
         """
         Execute a prepared commit (v1.8).
@@ -1014,12 +1105,10 @@ class BranchManager:
             # Delete task branch after successful merge
             branch_deleted = False
             if delete_branch:
-                delete_result = await self._run_git(["branch", "-d", task_branch])
+                # The branch was just merged into HEAD, so -d's merged check
+                # cannot add anything over force delete (which was the fallback)
+                delete_result = await self._run_git(["branch", "-D", task_branch])
                 branch_deleted = delete_result.returncode == 0
-                if not branch_deleted:
-                    # Try force delete
-                    delete_result = await self._run_git(["branch", "-D", task_branch])
-                    branch_deleted = delete_result.returncode == 0
 
             # Clear session state
             self._active_session = None
@@ -1069,21 +1158,189 @@ class BranchManager:
         except Exception:
             return False
 
-    async def _run_git(self, args: list[str]) -> subprocess.CompletedProcess:
+    @staticmethod
+    def _parse_name_status_z(data: bytes) -> dict[str, str]:
+        """Parse `git diff -z --name-status` output into path -> status letter."""
+        changes = {}
+        fields = data.split(b"\0")
+        i = 0
+        while i + 1 < len(fields):
+            status = fields[i].decode()
+            if status[:1] in ("R", "C"):
+                # Rename/copy: <status> <old path> <new path>
+                i += 1
+            changes[os.fsdecode(fields[i + 1])] = status
+            i += 2
+        return changes
+
+    @staticmethod
+    def _parse_status_z(data: bytes) -> tuple[dict[str, str], list[str]]:
+        """
+        Parse `git status --porcelain=v2 -z` output.
+
+        Returns (tracked changes vs HEAD as path -> status letter, untracked paths).
+        """
+        changes = {}
+        untracked = []
+        records = iter(data.split(b"\0"))
+        for record in records:
+            kind = record[:1]
+            if kind == b"?":
+                untracked.append(os.fsdecode(record[2:]))
+                continue
+            if kind == b"1":
+                # 1 <XY> <sub> <mH> <mI> <mW> <hH> <hI> <path>
+                fields = record.split(b" ", 8)
+            elif kind == b"2":
+                # 2 <XY> ... <X score> <path>, followed by the original path
+                fields = record.split(b" ", 9)
+                next(records, None)
+            elif kind == b"u":
+                # u <XY> <sub> <m1> <m2> <m3> <mW> <h1> <h2> <h3> <path>
+                fields = record.split(b" ", 10)
+            else:
+                continue
+            index_status, worktree_status = fields[1].decode()
+            if index_status == "A" and worktree_status == "D":
+                # Staged and then removed: nothing changed vs HEAD
+                continue
+            if worktree_status == "D":
+                status = "D"
+            elif index_status != ".":
+                status = index_status
+            else:
+                status = worktree_status
+            changes[os.fsdecode(fields[-1])] = status
+        return changes, untracked
+
+    @staticmethod
+    def _unquote_path(path: str) -> str:
+        """Undo git's quoting of a path with special characters ("a\\tb" -> a<TAB>b)."""
+        if not path.startswith('"'):
+            return path
+        raw = _QUOTED_PATH_ESCAPE.sub(
+            lambda m: bytes([int(m.group(1), 8)]) if len(m.group(1)) == 3
+            else _QUOTED_PATH_CHARS.get(m.group(1), m.group(1)),
+            path[1:-1].encode(),
+        )
+        return os.fsdecode(raw)
+
+    @staticmethod
+    def _split_diff_by_file(diff: str) -> dict[str, str]:
+        """
+        Split a multi-file unified diff into per-file chunks.
+
+        Keys are unquoted paths, as listed by `git status -z`. Each chunk is
+        the same text `git diff -- <path>` prints.
+        """
+        chunks = {}
+        for chunk in re.split(r"^(?=diff --git )", diff, flags=re.MULTILINE):
+            if not chunk.startswith("diff --git "):
+                continue
+            header = chunk[len("diff --git "):chunk.find("\n")]
+            if header.startswith('"'):
+                # "a/<quoted>" "b/<quoted>"
+                match = re.match(r'"a/((?:[^"\\]|\\.)*)"', header)
+                path = BranchManager._unquote_path(f'"{match.group(1)}"') if match else None
+            else:
+                # a/<path> b/<path> (both sides are the same path without renames)
+                length = (len(header) - 5) // 2
+                path = header[2:2 + length] if header.startswith("a/") else None
+            if path:
+                chunks[path] = chunk
+        return chunks
+
+    @staticmethod
+    def _is_binary_diff(diff: str) -> bool:
+        """Check for git's "Binary files ... differ" marker in a file diff."""
+        return diff.startswith("Binary files ") or "\nBinary files " in diff
+
+    async def _run_git(self, args: list[str]) -> _GitResult:
         """Run a git command."""
+        return await self._run_git_in(self._repo_path_str, args, self._env)
+
+    async def _run_git_diff_by_file(self, args: list[str]) -> dict[str, str]:
+        """
+        Run a multi-file `git diff` and split it per file while it streams.
+
+        Only the diff of the file being read is buffered, instead of the whole
+        output plus its decoded copy. Returns {} if git fails.
+        """
+        proc = await asyncio.create_subprocess_exec(
+            self.GIT_BIN, *args,
+            cwd=self._repo_path_str,
+            env=self._env,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        chunks = {}
+        pending = bytearray()
+        try:
+            while block := await proc.stdout.read(self.DIFF_READ_SIZE):
+                # Search from just before the new block: a header may span two reads
+                start = max(len(pending) - len(b"\ndiff --git "), 0)
+                pending += block
+                end = pending.rfind(b"\ndiff --git ", start)
+                if end != -1:
+                    # Everything up to the last header is complete per-file diffs
+                    chunks.update(self._split_diff_by_file(pending[:end + 1].decode()))
+                    del pending[:end + 1]
+            chunks.update(self._split_diff_by_file(pending.decode()))
+        except BaseException:
+            proc.kill()
+            await proc.wait()
+            raise
+
+        if await proc.wait() != 0:
+            return {}
+        return chunks
+
+    @classmethod
+    async def _run_git_many(
+        cls, repo: str, arg_lists: list[list[str]], env: dict[str, str] | None = None
+    ) -> list[_GitResult | BaseException]:
+        """
+        Run independent git commands concurrently, at most GIT_CONCURRENCY at once.
+
+        Results are in the order of arg_lists; a command that raised is
+        returned as its exception instead of cancelling the others.
+        """
+        semaphore = asyncio.Semaphore(cls.GIT_CONCURRENCY)
+
+        async def run(args: list[str]) -> _GitResult:
+            async with semaphore:
+                return await cls._run_git_in(repo, args, env)
+
+        return await asyncio.gather(*(run(args) for args in arg_lists), return_exceptions=True)
+
+    @staticmethod
+    def _git_env() -> dict[str, str]:
+        """
+        Environment for git commands.
+
+        GIT_OPTIONAL_LOCKS=0 keeps read-only commands (`git status`) from
+        taking index.lock to refresh the index. The user's locale is kept, so
+        hooks and commit messages see the same environment as a manual git run.
+        """
+        return {**os.environ, "GIT_OPTIONAL_LOCKS": "0"}
+
+    @classmethod
+    async def _run_git_in(
+        cls, repo: str, args: list[str], env: dict[str, str] | None = None
+    ) -> _GitResult:
+        """Run a git command in the given repository (env defaults to _git_env())."""
+        # No preexec_fn/user/group/umask here: with none of them, CPython 3.10+
+        # starts the child with vfork(), so the cost of each git call does not
+        # grow with the memory held by this process.
         proc = await asyncio.create_subprocess_exec(
-            "git", *args,
-            cwd=str(self.repo_path),
+            cls.GIT_BIN, *args,
+            cwd=repo,
+            env=env if env is not None else cls._git_env(),
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
         )
         stdout, stderr = await proc.communicate()
 
-        return subprocess.CompletedProcess(
-            args=["git"] + args,
-            returncode=proc.returncode,
-            stdout=stdout.decode() if stdout else "",
-            stderr=stderr.decode() if stderr else "",
-        )
+        return _GitResult(["git"] + args, proc.returncode, stdout, stderr)
 
 
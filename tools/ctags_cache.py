@@ -1,7 +1,9 @@
 """
 Persistent Ctags Cache Manager
 
-Caches ctags output per file with SHA256-based invalidation.
+Caches ctags output per file with content-hash invalidation.
+An unchanged mtime+size skips hashing entirely; otherwise the content hash
+(BLAKE3 when available, BLAKE2b otherwise) decides.
 Similar to SyncStateManager pattern.
 """
 
@@ -10,22 +12,38 @@ from __future__ import annotations
 import hashlib
 import json
 import logging
+import subprocess
 from dataclasses import dataclass, asdict
+from functools import cached_property
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+try:
+    import ormsgpack
+    ORMSGPACK_AVAILABLE = True
+except ImportError:
+    ORMSGPACK_AVAILABLE = False
+
 
 @dataclass
 class CtagsFileCache:
     """Ctags output for a single file"""
     file_path: str
-    hash: str  # SHA256 hash (first 16 chars)
+    hash: str  # Content hash (first 16 chars)
     tags: list[dict]  # Parsed ctags JSON output
     cached_at: str
     language: str | None = None
+    mtime_ns: int | None = None  # Stat fast-path: skip hashing when unchanged
+    size: int | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -34,15 +52,36 @@ class CtagsFileCache:
     def from_dict(cls, data: dict[str, Any]) -> CtagsFileCache:
         return cls(**data)
 
+    @cached_property
+    def tag_names(self) -> frozenset[str]:
+        """Names of all tags in the file (in-memory prefilter, not persisted)"""
+        return frozenset(tag.get("name", "") for tag in self.tags)
+
 
 class CtagsCacheManager:
     """Manages persistent ctags cache per project"""
 
-    def __init__(self, project_root: str | Path):
+    def __init__(self, project_root: str | Path, cache_format: str | None = None):
+        """
+        Args:
+            project_root: Project root directory
+            cache_format: "msgpack" or "json" (default: msgpack if ormsgpack is installed)
+        """
+        if cache_format is None:
+            cache_format = "msgpack" if ORMSGPACK_AVAILABLE else "json"
+        if cache_format == "msgpack" and not ORMSGPACK_AVAILABLE:
+            raise RuntimeError("ormsgpack is not installed. Install with: pip install ormsgpack")
+
         self.project_root = Path(project_root).resolve()
+        self.cache_format = cache_format
         self.cache_dir = self.project_root / ".code-intel" / "ctags_cache"
-        self.cache_index_file = self.cache_dir / "cache_index.json"
+        self.json_index_file = self.cache_dir / "cache_index.json"
+        self.cache_index_file = (
+            self.cache_dir / "cache_index.msgpack"
+            if cache_format == "msgpack" else self.json_index_file
+        )
         self.cache: dict[str, CtagsFileCache] = {}
+        self.git_head: str | None = None  # HEAD seen by the last refresh_from_git
         self._load_cache()
 
     def _ensure_directory(self) -> None:
@@ -50,10 +89,17 @@ class CtagsCacheManager:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
 
     def _load_cache(self) -> None:
-        """Load cache index from disk"""
-        if self.cache_index_file.exists():
+        """Load cache index from disk (falls back to a JSON index from older versions)"""
+        index_file = self.cache_index_file
+        if not index_file.exists():
+            index_file = self.json_index_file
+
+        if index_file.exists():
             try:
-                data = json.loads(self.cache_index_file.read_text(encoding='utf-8'))
+                if index_file.suffix == ".msgpack":
+                    data = ormsgpack.unpackb(index_file.read_bytes())
+                else:
+                    data = json.loads(index_file.read_text(encoding='utf-8'))
                 self.cache = {
                     k: CtagsFileCache.from_dict(v)
                     for k, v in data.items()
@@ -69,16 +115,21 @@ class CtagsCacheManager:
         """Save cache index to disk"""
         self._ensure_directory()
         data = {k: v.to_dict() for k, v in self.cache.items()}
-        self.cache_index_file.write_text(
-            json.dumps(data, indent=2, ensure_ascii=False),
-            encoding='utf-8'
-        )
+        if self.cache_format == "msgpack":
+            self.cache_index_file.write_bytes(ormsgpack.packb(data))
+        else:
+            self.cache_index_file.write_text(
+                json.dumps(data, indent=2, ensure_ascii=False),
+                encoding='utf-8'
+            )
 
     def compute_hash(self, file_path: Path) -> str:
-        """Compute SHA256 hash (first 16 chars)"""
+        """Compute content hash (first 16 chars)"""
         try:
             content = file_path.read_bytes()
-            return hashlib.sha256(content).hexdigest()[:16]
+            if BLAKE3_AVAILABLE:
+                return blake3.blake3(content).hexdigest()[:16]
+            return hashlib.blake2b(content).hexdigest()[:16]
         except Exception as e:
             logger.warning(f"Failed to compute hash for {file_path}: {e}")
             return ""
@@ -90,12 +141,42 @@ class CtagsCacheManager:
         except ValueError:
             return str(file_path)
 
+    def _make_entry(
+        self,
+        file_path: Path,
+        tags: list[dict],
+        cached_at: str,
+        language: str | None,
+    ) -> CtagsFileCache:
+        """Build a cache entry with hash and stat fingerprint"""
+        try:
+            stat = file_path.stat()
+            mtime_ns, size = stat.st_mtime_ns, stat.st_size
+        except OSError:
+            mtime_ns, size = None, None
+
+        return CtagsFileCache(
+            file_path=self.get_relative_path(file_path),
+            hash=self.compute_hash(file_path),
+            tags=tags,
+            cached_at=cached_at,
+            language=language,
+            mtime_ns=mtime_ns,
+            size=size,
+        )
+
     def get_cached_tags(
         self,
         file_path: Path,
-        language: str | None = None
+        language: str | None = None,
+        name: str | None = None,
     ) -> list[dict] | None:
-        """Get cached tags for a file if valid"""
+        """
+        Get cached tags for a file if valid.
+
+        If name is given and the file has no tag with exactly that name,
+        an empty list is returned without handing out the full tag list.
+        """
         rel_path = self.get_relative_path(file_path)
 
         if rel_path not in self.cache:
@@ -103,6 +184,20 @@ class CtagsCacheManager:
 
         cached = self.cache[rel_path]
 
+        # Validate language if specified
+        if language and cached.language != language:
+            return None
+
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+
+        # Fast path: unchanged mtime and size, no hashing needed
+        if cached.mtime_ns == stat.st_mtime_ns and cached.size == stat.st_size:
+            logger.debug(f"Ctags cache hit: {rel_path}")
+            return self._filter_by_name(cached, name)
+
         # Validate hash
         current_hash = self.compute_hash(file_path)
         if not current_hash or current_hash != cached.hash:
@@ -110,11 +205,18 @@ class CtagsCacheManager:
             logger.debug(f"Ctags cache invalidated: {rel_path} (hash mismatch)")
             return None
 
-        # Validate language if specified
-        if language and cached.language != language:
-            return None
+        # Content unchanged (e.g. touched) - refresh stat for the fast path
+        cached.mtime_ns = stat.st_mtime_ns
+        cached.size = stat.st_size
 
         logger.debug(f"Ctags cache hit: {rel_path}")
+        return self._filter_by_name(cached, name)
+
+    @staticmethod
+    def _filter_by_name(cached: CtagsFileCache, name: str | None) -> list[dict]:
+        """Return no tags when the name prefilter rules the file out"""
+        if name is not None and name not in cached.tag_names:
+            return []
         return cached.tags
 
     def cache_tags(
@@ -126,17 +228,29 @@ class CtagsCacheManager:
         """Cache tags for a file"""
         rel_path = self.get_relative_path(file_path)
 
-        self.cache[rel_path] = CtagsFileCache(
-            file_path=rel_path,
-            hash=self.compute_hash(file_path),
-            tags=tags,
-            cached_at=datetime.now().isoformat(),
-            language=language,
+        self.cache[rel_path] = self._make_entry(
+            file_path, tags, datetime.now().isoformat(), language
         )
 
         self._save_cache()
         logger.debug(f"Ctags cached: {rel_path} ({len(tags)} tags)")
 
+    def cache_tags_batch(
+        self,
+        tags_by_file: dict[Path, list[dict]],
+        language: str | None = None
+    ) -> None:
+        """Cache tags for multiple files with a single index write"""
+        cached_at = datetime.now().isoformat()
+
+        for file_path, tags in tags_by_file.items():
+            self.cache[self.get_relative_path(file_path)] = self._make_entry(
+                file_path, tags, cached_at, language
+            )
+
+        self._save_cache()
+        logger.debug(f"Ctags cached: {len(tags_by_file)} files (batch)")
+
     def invalidate_file(self, file_path: Path) -> None:
         """Invalidate cache for a file"""
         rel_path = self.get_relative_path(file_path)
@@ -145,11 +259,61 @@ class CtagsCacheManager:
             self._save_cache()
             logger.debug(f"Ctags cache invalidated: {rel_path}")
 
+    def _git_lines(self, *args: str) -> list[str] | None:
+        """Run a git command in the project root; None if git fails"""
+        try:
+            result = subprocess.run(
+                ["git", *args],
+                cwd=self.project_root,
+                capture_output=True,
+                text=True,
+            )
+        except OSError:
+            return None
+        if result.returncode != 0:
+            return None
+        return [line for line in result.stdout.splitlines() if line]
+
+    def refresh_from_git(self) -> int:
+        """
+        Invalidate entries for files changed by commits since the last refresh.
+
+        After a checkout, pull or commit, the files git reports as changed
+        between the previous and current HEAD are dropped up front instead
+        of being stat'ed and re-hashed one by one. Uncommitted edits are
+        left to the per-file validation in get_cached_tags, so files being
+        edited are not rescanned on every call.
+
+        Returns:
+            Number of invalidated entries (0 outside a git repository)
+        """
+        head = self._git_lines("rev-parse", "HEAD")
+        if not head:
+            return 0
+
+        previous_head, self.git_head = self.git_head, head[0]
+        if previous_head is None or previous_head == self.git_head:
+            return 0
+
+        changed = self._git_lines(
+            "diff", "--name-only", "--relative", previous_head, self.git_head
+        ) or []
+
+        invalidated = [rel_path for rel_path in changed if rel_path in self.cache]
+        for rel_path in invalidated:
+            del self.cache[rel_path]
+
+        if invalidated:
+            self._save_cache()
+            logger.debug(f"Ctags cache invalidated from git: {len(invalidated)} files")
+
+        return len(invalidated)
+
     def clear(self) -> None:
         """Clear entire cache"""
         self.cache = {}
-        if self.cache_index_file.exists():
-            self.cache_index_file.unlink()
+        for index_file in (self.cache_index_file, self.json_index_file):
+            index_file.unlink(missing_ok=True)
         logger.info("Ctags cache cleared")
 
     def get_stats(self) -> dict[str, Any]:
@@ -159,4 +323,5 @@ class CtagsCacheManager:
             "cached_files": len(self.cache),
             "total_tags": total_tags,
             "cache_dir": str(self.cache_dir),
+            "cache_format": self.cache_format,
         }
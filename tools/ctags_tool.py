@@ -1,10 +1,21 @@
 """Universal Ctags wrapper for symbol definition and reference analysis."""
 
 import asyncio
+import atexit
+import fnmatch
 import json
-import tempfile
+import os
+import re
+import subprocess
 from pathlib import Path
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # orjson is optional; stdlib json parses the same output, just slower
+    _json_loads = json.loads
+
 
 # Common directories to exclude from ctags scanning
 CTAGS_EXCLUDE_PATTERNS = [
@@ -21,6 +32,27 @@ CTAGS_EXCLUDE_PATTERNS = [
     "*.egg-info",
 ]
 
+# Source file extensions scanned by find_definitions
+CTAGS_SOURCE_EXTENSIONS = frozenset({
+    ".py", ".js", ".ts", ".jsx", ".tsx", ".php", ".java",
+    ".c", ".cpp", ".h", ".hpp", ".go", ".rs", ".rb",
+})
+
+# Maximum number of files passed to a single batched ctags invocation
+CTAGS_BATCH_SIZE = 1000
+
+# Seconds to wait for a response from the interactive ctags process
+CTAGS_INTERACTIVE_TIMEOUT = 30.0
+
+# Stream buffer limit for interactive ctags output (long signature lines)
+CTAGS_INTERACTIVE_LINE_LIMIT = 1024 * 1024
+
+# Maximum number of pre-filtered files passed to ripgrep in find_references
+REFERENCES_PREFILTER_MAX_FILES = 500
+
+# Lines longer than this are not emitted in full by ripgrep (minified files etc.)
+REFERENCES_MAX_COLUMNS = 512
+
 
 def _build_ctags_exclude_args() -> list[str]:
     """Build ctags exclude arguments."""
@@ -30,11 +62,199 @@ def _build_ctags_exclude_args() -> list[str]:
     return args
 
 
+# All exclude patterns compiled into one regex (glob patterns included)
+_EXCLUDE_DIR_RE = re.compile(
+    "|".join(fnmatch.translate(pattern) for pattern in CTAGS_EXCLUDE_PATTERNS)
+)
+
+
+async def _run_command(
+    cmd: list[str],
+    input_data: bytes | None = None,
+    check: bool = False,
+) -> bytes:
+    """
+    Run a one-shot command in a worker thread and return its stdout.
+
+    subprocess.run spawns via vfork/posix_spawn and does not involve the
+    event loop's child watcher, which is cheaper than
+    asyncio.create_subprocess_exec when many processes are spawned.
+
+    Args:
+        cmd: Command line
+        input_data: Bytes passed on stdin
+        check: Raise if the command failed (exit status 2+, ripgrep's error
+            status) without any output, instead of returning empty output
+
+    Raises:
+        FileNotFoundError: If the executable is not installed
+        RuntimeError: If check is set and the command failed
+    """
+    result = await asyncio.to_thread(
+        subprocess.run,
+        cmd,
+        input=input_data,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE if check else subprocess.DEVNULL,
+    )
+    if check and result.returncode >= 2 and not result.stdout:
+        message = result.stderr.decode(errors="replace").strip()
+        raise RuntimeError(message or f"{cmd[0]} exited with status {result.returncode}")
+    return result.stdout
+
+
+def _is_excluded_dir(name: str) -> bool:
+    """Check whether a directory name matches CTAGS_EXCLUDE_PATTERNS."""
+    return _EXCLUDE_DIR_RE.match(name) is not None
+
+
+def _iter_source_files(search_path: Path) -> list[Path]:
+    """
+    Collect source files under a directory in a single tree walk.
+
+    Excluded directories are pruned so the walk never descends into them.
+
+    Args:
+        search_path: Directory to walk
+
+    Returns:
+        List of source file paths
+    """
+    files = []
+    for root, dirs, filenames in os.walk(search_path):
+        dirs[:] = [d for d in dirs if not _is_excluded_dir(d)]
+        for name in filenames:
+            if os.path.splitext(name)[1] in CTAGS_SOURCE_EXTENSIONS:
+                files.append(Path(root, name))
+    return files
+
+
+class _InteractiveCtags:
+    """
+    Long-lived `ctags --_interactive` process for single-file scans.
+
+    Avoids a fork/exec per file. Requests are serialized with a lock.
+    If interactive mode is unavailable (older ctags, or built without
+    JSON support), the instance disables itself and callers fall back to
+    one-shot ctags runs.
+    """
+
+    def __init__(self, language: str | None):
+        self.language = language
+        self.available = True
+        self._process: asyncio.subprocess.Process | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock: asyncio.Lock | None = None
+
+    async def _start(self) -> None:
+        """Start the process and consume its program banner."""
+        cmd = [
+            "ctags",
+            "--_interactive",
+            "--output-format=json",
+            "--fields=+n+S+K",
+        ]
+
+        if self.language:
+            cmd.extend(["--languages", self.language])
+
+        self._process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            limit=CTAGS_INTERACTIVE_LINE_LIMIT,
+        )
+
+        banner = await asyncio.wait_for(
+            self._process.stdout.readline(), CTAGS_INTERACTIVE_TIMEOUT
+        )
+        if not banner or _json_loads(banner).get("_type") != "program":
+            raise RuntimeError("ctags interactive mode not supported")
+
+    def _stop(self) -> None:
+        """Kill the process if it is still running."""
+        if self._process and self._process.returncode is None:
+            try:
+                self._process.kill()
+            except ProcessLookupError:
+                pass
+        self._process = None
+
+    async def generate_tags(self, file_path: Path) -> list[dict] | None:
+        """
+        Generate tags for one file.
+
+        Returns:
+            List of tag dictionaries, or None if the caller should fall back
+            to a one-shot ctags run
+        """
+        if not self.available:
+            return None
+
+        # Subprocess transports are bound to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._stop()
+            self._lock = asyncio.Lock()
+            self._loop = loop
+
+        async with self._lock:
+            try:
+                if self._process is None or self._process.returncode is not None:
+                    await self._start()
+
+                request = {"command": "generate-tags", "filename": str(file_path)}
+                self._process.stdin.write(json.dumps(request).encode() + b"\n")
+                await self._process.stdin.drain()
+
+                tags = []
+                while True:
+                    line = await asyncio.wait_for(
+                        self._process.stdout.readline(), CTAGS_INTERACTIVE_TIMEOUT
+                    )
+                    if not line:
+                        raise RuntimeError("ctags interactive process exited")
+                    data = _json_loads(line)
+                    line_type = data.get("_type")
+                    if line_type == "tag":
+                        tags.append(data)
+                    elif line_type == "completed":
+                        return tags
+                    elif line_type == "error":
+                        # Let the one-shot run handle (and report) this file
+                        self._stop()
+                        return None
+
+            except Exception:
+                self._stop()
+                self.available = False
+                return None
+
+
+# Interactive ctags processes, one per language filter
+_interactive_ctags: dict[str | None, _InteractiveCtags] = {}
+
+
+def _get_interactive_ctags(language: str | None) -> _InteractiveCtags:
+    """Get or create the interactive ctags process for a language filter."""
+    if language not in _interactive_ctags:
+        _interactive_ctags[language] = _InteractiveCtags(language)
+    return _interactive_ctags[language]
+
+
+@atexit.register
+def _stop_interactive_ctags() -> None:
+    """Kill the interactive ctags processes at interpreter exit."""
+    for instance in _interactive_ctags.values():
+        instance._stop()
+
+
 async def _scan_file_with_cache(
     file_path: Path,
     language: str | None,
     cache_manager: "CtagsCacheManager | None",
-) -> list[dict]:
+) -> tuple[list[dict], bool]:
     """
     Scan a single file with caching support.
 
@@ -44,15 +264,22 @@ async def _scan_file_with_cache(
         cache_manager: Optional cache manager for persistent caching
 
     Returns:
-        List of tag dictionaries
+        Tuple of (list of tag dictionaries, whether it was a cache hit)
     """
     # Try cache first
     if cache_manager:
         cached_tags = cache_manager.get_cached_tags(file_path, language)
         if cached_tags is not None:
-            return cached_tags
+            return cached_tags, True
+
+    # Cache miss - ask the long-lived interactive ctags first
+    tags = await _get_interactive_ctags(language).generate_tags(file_path)
+    if tags is not None:
+        if cache_manager:
+            cache_manager.cache_tags(file_path, tags, language)
+        return tags, False
 
-    # Cache miss - run ctags on single file
+    # Fall back to a one-shot ctags run on the single file
     cmd = [
         "ctags",
         "--output-format=json",
@@ -62,42 +289,168 @@ async def _scan_file_with_cache(
     if language:
         cmd.extend(["--languages", language])
 
-    try:
-        # Create temporary file for output
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            temp_path = f.name
-
-        cmd_with_output = cmd + ["-f", temp_path, str(file_path)]
+    cmd.extend(["-f", "-", str(file_path)])
 
-        process = await asyncio.create_subprocess_exec(
-            *cmd_with_output,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        await process.communicate()
+    try:
+        stdout = await _run_command(cmd)
 
         # Parse results
         tags = []
-        with open(temp_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        tags.append(json.loads(line))
-                    except json.JSONDecodeError:
-                        continue
-
-        Path(temp_path).unlink(missing_ok=True)
+        for line in stdout.splitlines():
+            line = line.strip()
+            if line:
+                try:
+                    tags.append(_json_loads(line))
+                except json.JSONDecodeError:
+                    continue
 
         # Cache results
         if cache_manager:
             cache_manager.cache_tags(file_path, tags, language)
 
-        return tags
+        return tags, False
 
     except Exception:
         # On error, return empty list
-        return []
+        return [], False
+
+
+async def _scan_files_batch(
+    file_paths: list[Path],
+    language: str | None,
+) -> dict[str, list[dict]]:
+    """
+    Scan multiple files with a single ctags invocation.
+
+    File names are fed to ctags via stdin (-L -) and tags are read back
+    from stdout, so one process covers the whole batch.
+
+    Args:
+        file_paths: Files to scan
+        language: Optional language filter
+
+    Returns:
+        Mapping of file path (as passed to ctags) to its tag dictionaries
+    """
+    tags_by_file: dict[str, list[dict]] = {str(p): [] for p in file_paths}
+
+    cmd = [
+        "ctags",
+        "--output-format=json",
+        "--fields=+n+S+K",
+    ]
+
+    if language:
+        cmd.extend(["--languages", language])
+
+    cmd.extend(["-L", "-", "-f", "-"])
+
+    try:
+        file_list = "\n".join(tags_by_file) + "\n"
+        stdout = await _run_command(cmd, file_list.encode())
+
+        for line in stdout.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                tag = _json_loads(line)
+            except json.JSONDecodeError:
+                continue
+            bucket = tags_by_file.get(tag.get("path", ""))
+            if bucket is not None:
+                bucket.append(tag)
+
+        return tags_by_file
+
+    except Exception:
+        # On error, return no tags (and cache nothing)
+        return {}
+
+
+def _get_cache_manager(search_path: Path) -> "CtagsCacheManager | None":
+    """
+    Get the persistent ctags cache manager for a search path.
+
+    Args:
+        search_path: Resolved file or directory being searched
+
+    Returns:
+        CtagsCacheManager, or None if it is unavailable
+    """
+    try:
+        # Import locally to avoid circular dependency
+        import sys
+        server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        if server_dir not in sys.path:
+            sys.path.insert(0, server_dir)
+        from code_intel_server import get_ctags_cache_manager
+        return get_ctags_cache_manager(
+            search_path if search_path.is_dir() else search_path.parent
+        )
+    except Exception:
+        # Fall back to no persistent cache on error
+        return None
+
+
+async def _collect_tags(
+    file_paths: list[Path],
+    language: str | None,
+    cache_manager: "CtagsCacheManager | None",
+    name: str | None = None,
+) -> tuple[dict[str, list[dict]], int]:
+    """
+    Collect tags for many files, scanning cache misses in ctags batches.
+
+    Args:
+        file_paths: Files to collect tags for
+        language: Optional language filter
+        cache_manager: Optional cache manager for persistent caching
+        name: Optional exact tag name; cached files without it yield no tags
+
+    Returns:
+        Tuple of (tags keyed by file path string, number of cache hits)
+    """
+    # Split into cache hits and misses
+    tags_by_file: dict[str, list[dict]] = {}
+    files_cached = 0
+    misses = []
+    for file_path in file_paths:
+        cached_tags = (
+            cache_manager.get_cached_tags(file_path, language, name)
+            if cache_manager else None
+        )
+        if cached_tags is None:
+            misses.append(file_path)
+        else:
+            tags_by_file[str(file_path)] = cached_tags
+            files_cached += 1
+
+    # Scan misses in chunked ctags batches, bounded by CPU count
+    semaphore = asyncio.Semaphore(os.cpu_count() or 4)
+
+    async def _scan_chunk(chunk: list[Path]) -> dict[str, list[dict]]:
+        async with semaphore:
+            return await _scan_files_batch(chunk, language)
+
+    chunks = [
+        misses[i:i + CTAGS_BATCH_SIZE]
+        for i in range(0, len(misses), CTAGS_BATCH_SIZE)
+    ]
+    results = await asyncio.gather(*(_scan_chunk(c) for c in chunks))
+
+    scanned: dict[Path, list[dict]] = {}
+    for chunk, chunk_tags in zip(chunks, results):
+        for file_path in chunk:
+            file_key = str(file_path)
+            if file_key in chunk_tags:
+                scanned[file_path] = chunk_tags[file_key]
+                tags_by_file[file_key] = chunk_tags[file_key]
+
+    if cache_manager and scanned:
+        cache_manager.cache_tags_batch(scanned, language)
+
+    return tags_by_file, files_cached
 
 
 async def find_definitions(
@@ -123,10 +476,11 @@ async def find_definitions(
         Dictionary with definition locations
     """
     search_path = Path(path).resolve()
+    search_path_str = str(search_path)
 
     # Check session cache first (Phase 1)
     if session:
-        cache_key = (symbol, str(search_path), language, exact_match)
+        cache_key = (symbol, search_path_str, language, exact_match)
         if cache_key in session.definitions_cache:
             session.cache_stats["hits"] += 1
             cached_result = session.definitions_cache[cache_key].copy()
@@ -138,22 +492,7 @@ async def find_definitions(
         return {"error": f"Path does not exist: {path}"}
 
     # Get persistent cache manager (Phase 2)
-    cache_manager = None
-    if use_persistent_cache:
-        try:
-            # Import locally to avoid circular dependency
-            import sys
-            import os
-            server_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            if server_dir not in sys.path:
-                sys.path.insert(0, server_dir)
-            from code_intel_server import get_ctags_cache_manager
-            cache_manager = get_ctags_cache_manager(
-                search_path if search_path.is_dir() else search_path.parent
-            )
-        except Exception:
-            # Fall back to no persistent cache on error
-            cache_manager = None
+    cache_manager = _get_cache_manager(search_path) if use_persistent_cache else None
 
     # Collect all tags from files
     all_tags = []
@@ -163,63 +502,51 @@ async def find_definitions(
     try:
         if search_path.is_file():
             # Single file - use file-level cache
-            tags = await _scan_file_with_cache(search_path, language, cache_manager)
+            tags, cache_hit = await _scan_file_with_cache(search_path, language, cache_manager)
             all_tags.extend(tags)
             files_scanned = 1
-            files_cached = 1 if cache_manager and cache_manager.get_cached_tags(search_path, language) is not None else 0
+            files_cached = 1 if cache_hit else 0
         else:
             # Directory - scan all files with caching
-            # Common source file extensions
-            extensions = [".py", ".js", ".ts", ".jsx", ".tsx", ".php", ".java", ".c", ".cpp", ".h", ".hpp", ".go", ".rs", ".rb"]
-
-            for ext in extensions:
-                for file_path in search_path.rglob(f"*{ext}"):
-                    if not file_path.is_file():
-                        continue
-
-                    # Check exclusion patterns
-                    skip = False
-                    for excl in CTAGS_EXCLUDE_PATTERNS:
-                        if excl in str(file_path):
-                            skip = True
-                            break
-                    if skip:
-                        continue
+            if cache_manager:
+                # Drop entries for files git already knows have changed
+                await asyncio.to_thread(cache_manager.refresh_from_git)
 
-                    # Check if cached before scan
-                    was_cached = cache_manager and cache_manager.get_cached_tags(file_path, language) is not None
+            candidates = _iter_source_files(search_path)
 
-                    tags = await _scan_file_with_cache(file_path, language, cache_manager)
-                    all_tags.extend(tags)
-                    files_scanned += 1
-                    if was_cached:
-                        files_cached += 1
+            tags_by_file, files_cached = await _collect_tags(
+                candidates, language, cache_manager,
+                name=symbol if exact_match else None,
+            )
 
-        # Filter by symbol name
-        definitions = []
-        for tag in all_tags:
-            tag_name = tag.get("name", "")
+            for file_path in candidates:
+                all_tags.extend(tags_by_file.get(str(file_path), []))
+            files_scanned = len(candidates)
 
-            if exact_match:
-                if tag_name != symbol:
-                    continue
-            else:
-                if symbol.lower() not in tag_name.lower():
-                    continue
+        # Filter by symbol name. Substring matching uses one compiled
+        # case-insensitive pattern instead of lowering every tag name.
+        if exact_match:
+            matched = [tag for tag in all_tags if tag.get("name", "") == symbol]
+        else:
+            symbol_search = re.compile(re.escape(symbol), re.IGNORECASE).search
+            matched = [tag for tag in all_tags if symbol_search(tag.get("name", ""))]
 
-            definitions.append({
-                "name": tag_name,
+        definitions = [
+            {
+                "name": tag.get("name", ""),
                 "file": tag.get("path", ""),
                 "line": tag.get("line", 0),
                 "kind": tag.get("kind", ""),
                 "scope": tag.get("scope", ""),
                 "signature": tag.get("signature", ""),
                 "language": tag.get("language", ""),
-            })
+            }
+            for tag in matched
+        ]
 
         result = {
             "symbol": symbol,
-            "path": str(search_path),
+            "path": search_path_str,
             "definitions": definitions,
             "total": len(definitions),
             "cache_hit": False,
@@ -232,7 +559,7 @@ async def find_definitions(
 
         # Cache result in session
         if session:
-            cache_key = (symbol, str(search_path), language, exact_match)
+            cache_key = (symbol, search_path_str, language, exact_match)
             session.definitions_cache[cache_key] = result
 
         return result
@@ -245,65 +572,172 @@ async def find_definitions(
         return {"error": f"Failed to find definitions: {str(e)}"}
 
 
+async def _list_matching_files(
+    symbols: list[str],
+    search_path: str,
+    language: str | None,
+    fixed_strings: bool = False,
+) -> list[str]:
+    """
+    List files containing any of the symbols as a whole word (rg -l, NUL-separated).
+
+    Args:
+        symbols: Symbol names to search for
+        search_path: Resolved path to search in (as a string)
+        language: File type filter (e.g., "py", "js")
+        fixed_strings: Search the symbols literally (rg -F) and raise if
+            ripgrep fails, instead of returning no files
+
+    Returns:
+        List of matching file paths
+    """
+    cmd = ["rg", "--files-with-matches", "-0", "-w"]
+    if fixed_strings:
+        cmd.append("-F")
+    for symbol in symbols:
+        cmd.extend(["-e", symbol])
+    cmd.append(search_path)
+
+    if language:
+        cmd.extend(["-t", language])
+
+    stdout = await _run_command(cmd, check=fixed_strings)
+
+    return [f for f in stdout.decode().split("\0") if f]
+
+
+async def _find_definition_locations(
+    symbol: str,
+    candidate_files: list[str],
+    search_path: Path,
+) -> frozenset[tuple[str, int]]:
+    """
+    Find (file, line) locations where the symbol is defined.
+
+    Only files that contain the symbol can define it, so ctags never
+    scans the rest of the tree.
+
+    Args:
+        symbol: Symbol name (exact match)
+        candidate_files: Files known to contain the symbol
+        search_path: Resolved search root (for the persistent cache)
+
+    Returns:
+        Frozen set of (file, line) tuples
+    """
+    # Note: ripgrep file types (e.g. "py") are not ctags language names,
+    # so no language filter is passed to ctags here.
+    tags_by_file, _ = await _collect_tags(
+        [Path(f) for f in candidate_files], None, _get_cache_manager(search_path),
+        name=symbol,
+    )
+    return frozenset(
+        (tag.get("path", ""), tag.get("line", 0))
+        for file_tags in tags_by_file.values()
+        for tag in file_tags
+        if tag.get("name") == symbol
+    )
+
+
 async def find_references(
     symbol: str,
     path: str = ".",
     language: str | None = None,
     session: "SessionState | None" = None,
+    count_only: bool = False,
 ) -> dict:
     """
     Find symbol references using ripgrep (ctags doesn't track references).
 
-    This uses ripgrep to find occurrences of the symbol, then filters
-    out the definitions to get references.
+    This first lists the files containing the symbol (rg -l), then runs
+    the full match search on those files only and filters out definitions
+    found by ctags in the same files.
 
     Args:
         symbol: Symbol name to search for
         path: Path to search in
         language: File type filter (e.g., "py", "js")
+        session: Optional SessionState for caching definition locations
+        count_only: Return per-file reference counts instead of every line
 
     Returns:
-        Dictionary with reference locations
+        Dictionary with reference locations (or per-file counts)
     """
     search_path = Path(path).resolve()
+    search_path_str = str(search_path)
 
     if not search_path.exists():
         return {"error": f"Path does not exist: {path}"}
 
-    # Use ripgrep to find all occurrences
-    cmd = [
-        "rg",
-        "--json",
-        "-w",  # Word boundary matching
-        symbol,
-        str(search_path),
-    ]
+    try:
+        # Pre-filter: only files that contain the symbol at all
+        candidate_files = await _list_matching_files([symbol], search_path_str, language)
+
+        if not candidate_files:
+            if count_only:
+                return {
+                    "symbol": symbol,
+                    "path": search_path_str,
+                    "files": [],
+                    "total": 0,
+                }
+            return {
+                "symbol": symbol,
+                "path": search_path_str,
+                "references": [],
+                "total": 0,
+            }
 
-    if language:
-        cmd.extend(["-t", language])
+        # Get definitions to filter them out (cached per session)
+        locs_key = (symbol, search_path_str, language)
+        if session and locs_key in session.ref_def_locs_cache:
+            session.cache_stats["hits"] += 1
+            definition_locations = session.ref_def_locs_cache[locs_key]
+        else:
+            if session:
+                session.cache_stats["misses"] += 1
+            definition_locations = await _find_definition_locations(
+                symbol, candidate_files, search_path
+            )
+            if session:
+                session.ref_def_locs_cache[locs_key] = definition_locations
+
+        # Use ripgrep to find all occurrences, restricted to candidates
+        # when the list is small enough to pass on the command line
+        cmd = [
+            "rg",
+            "--count" if count_only else "--json",
+            "-w",  # Word boundary matching
+            symbol,
+        ]
+
+        if count_only:
+            cmd.append("--with-filename")
+        else:
+            cmd.append(f"--max-columns={REFERENCES_MAX_COLUMNS}")
 
-    try:
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        stdout, stderr = await process.communicate()
+        if len(candidate_files) <= REFERENCES_PREFILTER_MAX_FILES:
+            cmd.append("--")
+            cmd.extend(candidate_files)
+        else:
+            cmd.append(search_path_str)
+            if language:
+                cmd.extend(["-t", language])
 
-        # Get definitions to filter them out
-        definitions_result = await find_definitions(symbol, path, language, exact_match=True, session=session)
-        definition_locations = set()
-        if "definitions" in definitions_result:
-            for d in definitions_result["definitions"]:
-                definition_locations.add((d["file"], d["line"]))
+        stdout = await _run_command(cmd)
+
+        if count_only:
+            return _parse_reference_counts(
+                symbol, search_path_str, stdout, definition_locations
+            )
 
         # Parse ripgrep output
         references = []
-        for line in stdout.decode().strip().split("\n"):
+        for line in stdout.splitlines():
             if not line:
                 continue
             try:
-                data = json.loads(line)
+                data = _json_loads(line)
                 if data.get("type") == "match":
                     match_data = data["data"]
                     file_path = match_data["path"]["text"]
@@ -323,7 +757,7 @@ async def find_references(
 
         return {
             "symbol": symbol,
-            "path": str(search_path),
+            "path": search_path_str,
             "references": references,
             "total": len(references),
         }
@@ -334,6 +768,182 @@ async def find_references(
         return {"error": f"Failed to find references: {str(e)}"}
 
 
+async def find_references_batch(
+    symbols: list[str],
+    path: str = ".",
+    language: str | None = None,
+) -> dict[str, dict]:
+    """
+    Find references to several symbols with one ripgrep and ctags pass.
+
+    Equivalent to calling find_references for each symbol, but listing
+    candidate files, scanning them for definitions and searching for
+    matches each happen once for all symbols. Matches are attributed to
+    symbols by the text ripgrep matched.
+
+    Args:
+        symbols: Symbol names to search for
+        path: Path to search in
+        language: File type filter (e.g., "py", "js")
+
+    Returns:
+        Dictionary mapping each symbol to its find_references result
+    """
+    symbols = list(dict.fromkeys(symbols))
+    search_path = Path(path).resolve()
+    search_path_str = str(search_path)
+
+    if not search_path.exists():
+        error = {"error": f"Path does not exist: {path}"}
+        return {symbol: error for symbol in symbols}
+
+    try:
+        references: dict[str, list[dict]] = {symbol: [] for symbol in symbols}
+        candidate_files = (
+            await _list_matching_files(symbols, search_path_str, language, fixed_strings=True)
+            if symbols else []
+        )
+
+        if candidate_files:
+            # One definition scan of the candidate files serves every symbol
+            tags_by_file, _ = await _collect_tags(
+                [Path(f) for f in candidate_files], None, _get_cache_manager(search_path),
+            )
+            definition_locations = frozenset(
+                (tag.get("name"), tag.get("path", ""), tag.get("line", 0))
+                for file_tags in tags_by_file.values()
+                for tag in file_tags
+                if tag.get("name") in references
+            )
+
+            # Symbols are literals: with -F one symbol that is not a valid
+            # regex (e.g. "c++") cannot fail the search for all of them
+            cmd = ["rg", "--json", "-w", "-F", f"--max-columns={REFERENCES_MAX_COLUMNS}"]
+            for symbol in symbols:
+                cmd.extend(["-e", symbol])
+
+            if len(candidate_files) <= REFERENCES_PREFILTER_MAX_FILES:
+                cmd.append("--")
+                cmd.extend(candidate_files)
+            else:
+                cmd.append(search_path_str)
+                if language:
+                    cmd.extend(["-t", language])
+
+            stdout = await _run_command(cmd, check=True)
+            references = _parse_batch_references(stdout, references, definition_locations)
+
+        return {
+            symbol: {
+                "symbol": symbol,
+                "path": search_path_str,
+                "references": refs,
+                "total": len(refs),
+            }
+            for symbol, refs in references.items()
+        }
+
+    except FileNotFoundError:
+        error = {"error": "ripgrep (rg) not found"}
+    except Exception as e:
+        error = {"error": f"Failed to find references: {str(e)}"}
+    return {symbol: error for symbol in symbols}
+
+
+def _parse_batch_references(
+    stdout: bytes,
+    references: dict[str, list[dict]],
+    definition_locations: frozenset[tuple[str, str, int]],
+) -> dict[str, list[dict]]:
+    """
+    Attribute `rg --json` matches of several symbols to each symbol.
+
+    A line matching several symbols is a reference of each of them, once.
+
+    Args:
+        stdout: Raw ripgrep JSON output
+        references: Empty reference list per symbol (filled in place)
+        definition_locations: (symbol, file, line) tuples of definitions
+
+    Returns:
+        The references dictionary
+    """
+    for line in stdout.splitlines():
+        if not line:
+            continue
+        try:
+            data = _json_loads(line)
+        except json.JSONDecodeError:
+            continue
+        if data.get("type") != "match":
+            continue
+
+        match_data = data["data"]
+        file_path = match_data["path"].get("text")
+        content = match_data["lines"].get("text")
+        if file_path is None or content is None:
+            continue  # Non-UTF-8 path or content
+        line_num = match_data["line_number"]
+
+        matched = dict.fromkeys(
+            sub["match"].get("text") for sub in match_data.get("submatches", [])
+        )
+        for symbol in matched:
+            if symbol not in references:
+                continue
+            # Skip if this is a definition of the symbol
+            if (symbol, file_path, line_num) in definition_locations:
+                continue
+            references[symbol].append({
+                "file": file_path,
+                "line": line_num,
+                "content": content.strip(),
+            })
+
+    return references
+
+
+def _parse_reference_counts(
+    symbol: str,
+    search_path: str,
+    stdout: bytes,
+    definition_locations: frozenset[tuple[str, int]],
+) -> dict:
+    """
+    Build the count_only result from `rg --count` output.
+
+    Definition lines are subtracted from each file's matching-line count.
+
+    Args:
+        symbol: Symbol name searched for
+        search_path: Resolved search path (as a string)
+        stdout: Raw `path:count` lines from ripgrep
+        definition_locations: (file, line) tuples of definitions
+
+    Returns:
+        Dictionary with per-file reference counts
+    """
+    definitions_per_file: dict[str, int] = {}
+    for file_path, _ in definition_locations:
+        definitions_per_file[file_path] = definitions_per_file.get(file_path, 0) + 1
+
+    files = []
+    for line in stdout.decode().splitlines():
+        file_path, sep, count = line.rpartition(":")
+        if not sep or not count.isdigit():
+            continue
+        refs = int(count) - definitions_per_file.get(file_path, 0)
+        if refs > 0:
+            files.append({"file": file_path, "count": refs})
+
+    return {
+        "symbol": symbol,
+        "path": search_path,
+        "files": files,
+        "total": sum(f["count"] for f in files),
+    }
+
+
 async def get_symbols(
     path: str,
     kind: str | None = None,
@@ -351,6 +961,7 @@ async def get_symbols(
         Dictionary with all symbols
     """
     search_path = Path(path).resolve()
+    search_path_str = str(search_path)
 
     if not search_path.exists():
         return {"error": f"Path does not exist: {path}"}
@@ -368,48 +979,37 @@ async def get_symbols(
     if language:
         cmd.extend(["--languages", language])
 
-    try:
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            temp_path = f.name
+    # -f must come before the path argument
+    cmd.extend(["-f", "-", search_path_str])
 
-        # -f must come before the path argument
-        cmd_with_output = cmd + ["-f", temp_path, str(search_path)]
-
-        process = await asyncio.create_subprocess_exec(
-            *cmd_with_output,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
-        )
-        await process.communicate()
+    try:
+        stdout = await _run_command(cmd)
 
         symbols = []
-        with open(temp_path, "r") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    tag = json.loads(line)
-
-                    # Filter by kind if specified
-                    if kind and tag.get("kind", "").lower() != kind.lower():
-                        continue
+        for line in stdout.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                tag = _json_loads(line)
 
-                    symbols.append({
-                        "name": tag.get("name", ""),
-                        "file": tag.get("path", ""),
-                        "line": tag.get("line", 0),
-                        "kind": tag.get("kind", ""),
-                        "scope": tag.get("scope", ""),
-                        "language": tag.get("language", ""),
-                    })
-                except json.JSONDecodeError:
+                # Filter by kind if specified
+                if kind and tag.get("kind", "").lower() != kind.lower():
                     continue
 
-        Path(temp_path).unlink(missing_ok=True)
+                symbols.append({
+                    "name": tag.get("name", ""),
+                    "file": tag.get("path", ""),
+                    "line": tag.get("line", 0),
+                    "kind": tag.get("kind", ""),
+                    "scope": tag.get("scope", ""),
+                    "language": tag.get("language", ""),
+                })
+            except json.JSONDecodeError:
+                continue
 
         return {
-            "path": str(search_path),
+            "path": search_path_str,
             "symbols": symbols,
             "total": len(symbols),
         }
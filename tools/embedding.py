@@ -6,13 +6,47 @@ v3.7: ベクトル類似度による意味的一致判定
 - 遅延ロード（Lazy Loading）
 - E5モデルの特性を活かした query: 接頭辞
 - キャメルケース分解による精度向上
+- ONNX Runtime + int8 量子化モデルによる高速エンコード（オプトイン）
 """
 
+import importlib.util
+import platform
 import re
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Optional
 
 
+# キャメルケース分解用の正規表現（モジュールロード時に1回だけコンパイル）
+_CAMEL_LOWER_UPPER_RE = re.compile(r'([a-z])([A-Z])')
+_CAMEL_ACRONYM_RE = re.compile(r'([A-Z]+)([A-Z][a-z])')
+
+
+def _onnx_int8_file_for_host() -> Optional[str]:
+    """
+    このCPU向けの動的 int8 量子化済み ONNX モデルのファイル名（モデルリポジトリ内）。
+
+    sentence-transformers の量子化エクスポートの命名に従う。判定できなければ None。
+    """
+    machine = platform.machine().lower()
+    if machine in ("arm64", "aarch64"):
+        return "onnx/model_qint8_arm64.onnx"
+    if machine not in ("x86_64", "amd64"):
+        return None
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            flags = next((line.split() for line in f if line.startswith("flags")), [])
+    except OSError:
+        return None
+    if "avx512_vnni" in flags:
+        return "onnx/model_qint8_avx512_vnni.onnx"
+    if "avx512f" in flags:
+        return "onnx/model_qint8_avx512.onnx"
+    if "avx2" in flags:
+        return "onnx/model_quint8_avx2.onnx"
+    return None
+
+
 @dataclass
 class ValidationResult:
     """Embedding検証の結果"""
@@ -46,16 +80,72 @@ class EmbeddingValidator:
     - 3層判定ロジック
     - E5モデル用の query: 接頭辞
     - キャメルケース分解
+    - backend: "torch"（デフォルト）/ "onnx"（ONNX int8）/ "auto"（ONNX int8 を試し、失敗時は torch）
+      int8 は類似度が僅かにずれ閾値付近の判定が変わり得るため、ONNX はオプトイン
     """
 
     # 3層判定の閾値
     THRESHOLD_HIGH = 0.6   # これ以上 → FACT として承認
     THRESHOLD_LOW = 0.3    # これ未満 → 物理的拒否
 
-    def __init__(self, model_name: str = "intfloat/multilingual-e5-small"):
+    # エンコード結果キャッシュの最大件数（LRU）
+    EMBEDDING_CACHE_SIZE = 8192
+
+    def __init__(
+        self,
+        model_name: str = "intfloat/multilingual-e5-small",
+        backend: str = "torch",
+        onnx_file: Optional[str] = None,
+    ):
+        """
+        Args:
+            model_name: sentence-transformers のモデル名
+            backend: "torch" / "onnx" / "auto"
+            onnx_file: ONNX モデルのファイル名（None ならこのCPU向けの int8 モデル）
+        """
         self.model_name = model_name
+        self.backend = backend
+        self.onnx_file = onnx_file
         self._model = None
         self._available = None  # None = not checked, True/False = checked
+        self._embedding_cache: OrderedDict[str, object] = OrderedDict()  # text → 正規化済みベクトル
+
+    def _load_onnx_model(self, sentence_transformer_cls):
+        """
+        ONNX Runtime + int8 モデルをロード（失敗時は None）。
+
+        backend="onnx" では失敗を RuntimeError で通知する。ImportError にすると
+        model プロパティで sentence-transformers 未インストールと区別できないため。
+        """
+        if self.backend == "torch":
+            return None
+        missing = [name for name in ("onnxruntime", "optimum") if importlib.util.find_spec(name) is None]
+        if missing:
+            if self.backend == "auto":
+                return None
+            raise RuntimeError(
+                f"ONNX backend requires optimum[onnxruntime] (missing: {', '.join(missing)}). "
+                "Run: pip install -r requirements-optional.txt"
+            )
+        try:
+            file_name = self.onnx_file or _onnx_int8_file_for_host()
+            if file_name is None:
+                raise RuntimeError("No int8 ONNX model file for this CPU; pass onnx_file")
+            # sentence-transformers 3.2+ の ONNX バックエンド（ファイルがなければ例外）
+            return sentence_transformer_cls(
+                self.model_name,
+                backend="onnx",
+                model_kwargs={"file_name": file_name},
+            )
+        except Exception as e:
+            if self.backend != "onnx":
+                return None
+            if isinstance(e, ImportError):
+                raise RuntimeError(
+                    f"ONNX backend could not be loaded ({e}). "
+                    "Run: pip install -r requirements-optional.txt"
+                ) from e
+            raise
 
     @property
     def model(self):
@@ -63,7 +153,10 @@ class EmbeddingValidator:
         if self._model is None:
             try:
                 from sentence_transformers import SentenceTransformer
-                self._model = SentenceTransformer(self.model_name)
+                self._model = (
+                    self._load_onnx_model(SentenceTransformer)
+                    or SentenceTransformer(self.model_name)
+                )
                 self._available = True
             except ImportError:
                 self._available = False
@@ -86,14 +179,52 @@ class EmbeddingValidator:
 
     def get_similarity(self, text1: str, text2: str) -> float:
         """2つのテキストのコサイン類似度を計算"""
-        from sklearn.metrics.pairwise import cosine_similarity
+        return self.get_similarities(text1, [text2])[0]
+
+    def get_similarities(self, text: str, others: list[str]) -> list[float]:
+        """
+        1つのテキストと複数テキストのコサイン類似度を一括計算。
+
+        未キャッシュのテキストを1回の model.encode でバッチエンコードする。
+        正規化済みベクトルの内積 = コサイン類似度。
+        """
+        if not others:
+            return []
+
+        import numpy as np
 
-        # E5モデルの特性を活かすため接頭辞を付与
-        sentences = [f"query: {text1}", f"query: {text2}"]
-        embeddings = self.model.encode(sentences)
+        embeddings = self._embed([text] + others)
+        sims = np.stack(embeddings[1:]) @ embeddings[0]
+        return [float(sim) for sim in sims]
 
-        sim = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-        return float(sim)
+    def _embed(self, texts: list[str]) -> list:
+        """
+        テキストを正規化済みベクトルに変換（LRUキャッシュ付き）。
+
+        キャッシュにないテキストのみ1回の model.encode でまとめてエンコードする。
+        """
+        cache = self._embedding_cache
+        missing = list(dict.fromkeys(t for t in texts if t not in cache))
+
+        if missing:
+            # E5モデルの特性を活かすため接頭辞を付与
+            encoded = self.model.encode(
+                [f"query: {t}" for t in missing],
+                batch_size=64,
+                normalize_embeddings=True,
+            )
+            for t, vec in zip(missing, encoded):
+                cache[t] = vec
+
+        vectors = []
+        for t in texts:
+            cache.move_to_end(t)
+            vectors.append(cache[t])
+
+        while len(cache) > self.EMBEDDING_CACHE_SIZE:
+            cache.popitem(last=False)
+
+        return vectors
 
     def validate_relevance(
         self,
@@ -117,7 +248,10 @@ class EmbeddingValidator:
         # キャメルケースを分解して類似度計算
         symbol_normalized = self.split_camel_case(symbol)
         similarity = self.get_similarity(nl_term, symbol_normalized)
+        return self._judge(nl_term, symbol, similarity)
 
+    def _judge(self, nl_term: str, symbol: str, similarity: float) -> ValidationResult:
+        """類似度から3層判定を行う"""
         if similarity > self.THRESHOLD_HIGH:
             # 高信頼: FACT として承認
             return ValidationResult(
@@ -164,8 +298,13 @@ class EmbeddingValidator:
         rejected = []
         needs_high_risk = False
 
-        for symbol in symbols:
-            result = self.validate_relevance(nl_term, symbol)
+        # 全シンボルを1回でエンコード
+        similarities = self.get_similarities(
+            nl_term, [self.split_camel_case(s) for s in symbols]
+        )
+
+        for symbol, similarity in zip(symbols, similarities):
+            result = self._judge(nl_term, symbol, similarity)
             if result.approved:
                 approved.append({
                     "symbol": symbol,
@@ -199,14 +338,14 @@ class EmbeddingValidator:
         Returns:
             Sorted list of {symbol, similarity, rank}
         """
-        results = []
-        for symbol in symbols:
-            symbol_normalized = self.split_camel_case(symbol)
-            similarity = self.get_similarity(nl_term, symbol_normalized)
-            results.append({
-                "symbol": symbol,
-                "similarity": round(similarity, 3),
-            })
+        # 全シンボルを1回でエンコード
+        similarities = self.get_similarities(
+            nl_term, [self.split_camel_case(s) for s in symbols]
+        )
+        results = [
+            {"symbol": symbol, "similarity": round(similarity, 3)}
+            for symbol, similarity in zip(symbols, similarities)
+        ]
 
         # 類似度でソート
         results.sort(key=lambda x: x["similarity"], reverse=True)
@@ -238,9 +377,9 @@ class EmbeddingValidator:
         getUserName → get User Name
         """
         # 小文字→大文字の境界にスペースを挿入
-        result = re.sub(r'([a-z])([A-Z])', r'\1 \2', symbol)
+        result = _CAMEL_LOWER_UPPER_RE.sub(r'\1 \2', symbol)
         # 連続する大文字の後に小文字が来る場合もスペースを挿入
-        result = re.sub(r'([A-Z]+)([A-Z][a-z])', r'\1 \2', result)
+        result = _CAMEL_ACRONYM_RE.sub(r'\1 \2', result)
         return result
 
 
@@ -15,21 +15,52 @@ Design principles:
 """
 
 import asyncio
+import fnmatch
+import functools
+import heapq
+import json
+import os
 import re
+import shutil
+import subprocess
+import threading
+from collections.abc import Iterable
 from dataclasses import dataclass, field
-from fnmatch import fnmatch
 from pathlib import Path
+from stat import S_ISREG
 
-import yaml
-
-from tools.ctags_tool import find_references, find_definitions
+from tools.ctags_tool import find_references, find_references_batch
 
 
 # File extensions for markup relaxation
-RELAXED_MARKUP_EXTENSIONS = {".html", ".htm", ".css", ".scss", ".sass", ".less", ".md", ".markdown"}
+RELAXED_MARKUP_EXTENSIONS = frozenset({".html", ".htm", ".css", ".scss", ".sass", ".less", ".md", ".markdown"})
 
 # File extensions that look like markup but contain logic (NOT relaxed)
-LOGIC_MARKUP_EXTENSIONS = {".blade.php", ".vue", ".jsx", ".tsx"}
+LOGIC_MARKUP_EXTENSIONS = frozenset({".blade.php", ".vue", ".jsx", ".tsx"})
+
+# Directories skipped when walking the repository for naming convention matches
+NAMING_CONVENTION_PRUNE_DIRS = frozenset({
+    ".git", "node_modules", "vendor", ".venv", "venv", "dist", "build",
+    "__pycache__", ".next", "target",
+})
+
+# Naming convention patterns: regex equivalents of the glob patterns in the
+# comments, matched against repo-relative paths ({name} = escaped base name)
+TEST_PATTERNS = (
+    r"(?:.*/)?[^/]*{name}[^/]*[Tt]est\.[^/]*",            # **/*{name}*Test.*, **/*{name}*test.*
+    r"(?:.*/)?test_[^/]*{name}[^/]*\.[^/]*",              # **/test_*{name}*.*
+    r"(?:.*/)?tests/(?:.*/)?[^/]*{name}[^/]*\.[^/]*",     # **/tests/**/*{name}*.*
+)
+FACTORY_PATTERNS = (
+    r"(?:.*/)?[^/]*{name}Factory\.[^/]*",                 # **/*{name}Factory.*
+    r"(?:.*/)?[^/]*{name}[^/]*factory\.[^/]*",            # **/*{name}*factory.*
+    r"(?:.*/)?factories/[^/]*{name}[^/]*\.[^/]*",         # **/factories/*{name}*.*
+)
+SEEDER_PATTERNS = (
+    r"(?:.*/)?[^/]*{name}Seeder\.[^/]*",                  # **/*{name}Seeder.*
+    r"(?:.*/)?[^/]*{name}[^/]*seeder\.[^/]*",             # **/*{name}*seeder.*
+    r"(?:.*/)?seeders/[^/]*{name}[^/]*\.[^/]*",           # **/seeders/*{name}*.*
+)
 
 # Document file patterns for keyword search (default, can be overridden in context.yml)
 DEFAULT_DOCUMENT_PATTERNS = ["**/*.md", "**/README*", "**/docs/**/*"]
@@ -46,10 +77,110 @@ DEFAULT_DOCUMENT_EXCLUDE_PATTERNS = [
 # Extensions to search for document mentions
 DOCUMENT_EXTENSIONS = {".md", ".markdown", ".rst", ".txt"}
 
+# Words never used as document search keywords (compared lowercased)
+_STOP_WORDS: frozenset[str] = frozenset({
+    "the", "a", "an", "is", "are", "was", "were", "be", "been",
+    "to", "of", "in", "for", "on", "with", "at", "by", "from",
+    "this", "that", "these", "those", "it", "its",
+    "and", "or", "but", "if", "then", "else",
+    "add", "remove", "change", "update", "modify", "fix", "delete",
+    "file", "files", "code", "field", "type", "value", "name",
+    "を", "に", "は", "が", "の", "で", "と", "へ", "から", "まで",
+    "する", "した", "します", "される", "された",
+    "追加", "削除", "変更", "修正", "更新", "フィールド", "型",
+})
+
+# Keyword extraction patterns (see ImpactAnalyzer._extract_keywords)
+_QUOTED_RE = re.compile(r'"([^"]+)"|\'([^\']+)\'|`([^`]+)`')
+_WORD_RE = re.compile(r'[a-zA-Z_][a-zA-Z0-9_]*|[ぁ-んァ-ン一-龥]+')
+_CAMEL_CASE_RE = re.compile(r'[A-Z][a-z]+(?:[A-Z][a-z]+)+')
+_SNAKE_CASE_RE = re.compile(r'[a-z]+(?:_[a-z]+)+')
+
 # Limits for document search results
 MAX_MENTIONS_PER_FILE = 3      # Max mentions per file (prevents CHANGELOG domination)
 MAX_TOTAL_FILES = 20           # Max files in results
 MAX_KEYWORDS = 10              # Max keywords to search
+DOCUMENT_RG_MAX_FILES = 500    # Max document paths per ripgrep invocation
+DOCUMENT_SCAN_CONCURRENCY = min(32, (os.cpu_count() or 1) * 4)  # Files scanned at once without rg
+DEFAULT_DOCUMENT_MAX_FILE_SIZE_KB = 5 * 1024  # Larger docs are skipped (document_search.max_file_size_kb)
+
+# Schema the LLM must follow when declaring verification results
+# (shared by every result; treat as read-only)
+CONFIRMATION_SCHEMA = {
+    "verified_files": [
+        {
+            "file": "string",
+            "status": "will_modify | no_change_needed | not_affected",
+            "reason": "string (status != will_modify 時は必須)",
+        }
+    ]
+}
+
+# Limit for static references collected per symbol (common names can match thousands)
+MAX_REFS_PER_SYMBOL = 500
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_naming_convention_res(base_name: str) -> tuple[re.Pattern, ...]:
+    """Compile the (tests, factories, seeders) naming convention regexes for a base name."""
+    name = re.escape(base_name)
+    return tuple(
+        re.compile("|".join(template.format(name=name) for template in templates))
+        for templates in (TEST_PATTERNS, FACTORY_PATTERNS, SEEDER_PATTERNS)
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_glob(pattern: str) -> re.Pattern:
+    """
+    Compile a pathlib-style glob into a regex over repo-relative POSIX paths.
+
+    "*" and "?" do not cross "/", and a "**" segment matches any number of
+    directories (including none).
+    """
+    parts = []
+    segments = pattern.split("/")
+    for i, segment in enumerate(segments):
+        if segment == "**":
+            parts.append("(?:[^/]+/)*" if i < len(segments) - 1 else "(?:[^/]+/)*[^/]+")
+            continue
+        regex = re.escape(segment).replace(r"\*", "[^/]*").replace(r"\?", "[^/]")
+        parts.append(regex if i == len(segments) - 1 else regex + "/")
+    return re.compile("".join(parts))
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_exclude_re(patterns: tuple[str, ...]) -> re.Pattern:
+    """Compile fnmatch-style exclude patterns into one regex (matches nothing if empty)."""
+    if not patterns:
+        return re.compile(r"(?!)")
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile_type_hint_re(symbol: str) -> re.Pattern:
+    """Compile the common type hint patterns for a symbol into one regex."""
+    s = re.escape(symbol)
+    return re.compile(
+        rf":\s*{s}[\s,\)\]]"                # : Symbol or : Symbol,
+        rf"|->\s*{s}"                       # -> Symbol
+        rf"|<{s}>"                          # Generic<Symbol>
+        rf"|\[{s}\]"                        # List[Symbol]
+        rf"|@(?:param|return|var)\s+{s}"    # PHPDoc @param / @return / @var
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _base_name(file_path: str) -> str:
+    """File stem without extensions, snake_case normalized to PascalCase (memoized)."""
+    # Handle multi-part extensions
+    stem = Path(file_path).name.split(".", 1)[0]
+
+    # Convert snake_case to PascalCase for consistency
+    if "_" in stem:
+        stem = "".join(word.capitalize() for word in stem.split("_"))
+
+    return stem
 
 
 @dataclass
@@ -92,28 +223,20 @@ class ImpactAnalysisResult:
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization."""
-        result = {
-            "impact_analysis": {
-                "mode": self.mode,
-                "depth": self.depth,
-                "static_references": self.static_references,
-                "naming_convention_matches": self.naming_convention_matches,
-            }
+        impact_analysis = {
+            "mode": self.mode,
+            "depth": self.depth,
+            "static_references": self.static_references,
+            "naming_convention_matches": self.naming_convention_matches,
+            # v1.1.1: Include document mentions if any
+            **({"document_mentions": self.document_mentions} if self.document_mentions else {}),
+            **({"reason": self.reason} if self.reason else {}),
+            **({"inference_hint": self.inference_hint} if self.inference_hint else {}),
+        }
+        return {
+            "impact_analysis": impact_analysis,
+            "confirmation_required": self.confirmation_required,
         }
-
-        # v1.1.1: Include document mentions if any
-        if self.document_mentions:
-            result["impact_analysis"]["document_mentions"] = self.document_mentions
-
-        if self.reason:
-            result["impact_analysis"]["reason"] = self.reason
-
-        if self.inference_hint:
-            result["impact_analysis"]["inference_hint"] = self.inference_hint
-
-        result["confirmation_required"] = self.confirmation_required
-
-        return result
 
 
 class ImpactAnalyzer:
@@ -128,10 +251,26 @@ class ImpactAnalyzer:
     5. Search for keyword mentions in documentation (v1.1.1)
     """
 
+    # context.yml path -> ((mtime_ns, size), document_search config)
+    _CONFIG_CACHE: dict[str, tuple[tuple[int, int], dict]] = {}
+    _CONFIG_CACHE_LOCK = threading.Lock()
+
     def __init__(self, repo_path: str = "."):
         self.repo_path = Path(repo_path).resolve()
+        self._repo_base = os.fspath(self.repo_path)
+        self._repo_files: asyncio.Future[list[str]] | None = None
+        self._refs_cache: dict[str, asyncio.Future[dict]] = {}
         self._document_config = self._load_document_config()
 
+    def _normalize_path(self, path: str) -> str:
+        """
+        Absolute, normalized form of a path for comparisons.
+
+        Relative paths are taken relative to the repository root. Pure
+        string work, no filesystem access.
+        """
+        return os.path.normpath(os.path.join(self._repo_base, path))
+
     def _load_document_config(self) -> dict:
         """
         Load document_search configuration from context.yml.
@@ -139,13 +278,37 @@ class ImpactAnalyzer:
         Returns empty dict if context.yml doesn't exist or has no document_search section.
         In that case, default patterns will be used.
         """
-        context_file = self.repo_path / ".code-intel" / "context.yml"
-        if not context_file.exists():
+        context_file = os.path.join(self._repo_base, ".code-intel", "context.yml")
+        try:
+            stat = os.stat(context_file)
+        except OSError:
             return {}
 
+        # Parsed configs are shared across instances until the file changes
+        stat_key = (stat.st_mtime_ns, stat.st_size)
+        with self._CONFIG_CACHE_LOCK:
+            cached = self._CONFIG_CACHE.get(context_file)
+        if cached is not None and cached[0] == stat_key:
+            return cached[1]
+
+        config = self._parse_document_config(context_file)
+        with self._CONFIG_CACHE_LOCK:
+            self._CONFIG_CACHE[context_file] = (stat_key, config)
+        return config
+
+    @staticmethod
+    def _parse_document_config(context_file: str) -> dict:
+        """Parse the document_search section of a context.yml file ({} on error)."""
         try:
+            # Imported lazily: only needed when context.yml exists
+            import yaml
+            try:
+                from yaml import CSafeLoader as Loader  # libyaml bindings
+            except ImportError:
+                from yaml import SafeLoader as Loader
+
             with open(context_file, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=Loader)
             return config.get("document_search", {}) if config else {}
         except Exception:
             return {}
@@ -169,37 +332,49 @@ class ImpactAnalyzer:
         if self._should_relax_markup(target_files):
             return await self._create_relaxed_result(target_files, change_description)
 
-        # Analyze each target file
-        all_callers = []
-        all_type_hints = []
-        all_naming_matches = NamingConventionMatches()
+        # Target files that share symbol names (e.g. the same class name in
+        # different directories) need only one lookup; analyze the unique
+        # symbol sets concurrently
+        symbol_sets = dict.fromkeys(
+            symbols for symbols in map(self._reference_symbols, target_files) if symbols
+        )
+        self._prefetch_references(
+            symbol for symbols in symbol_sets for symbol in symbols
+        )
+        results = await asyncio.gather(
+            *[self._analyze_symbols(symbols) for symbols in symbol_sets]
+        )
 
-        for target_file in target_files:
-            # Extract base name and symbols
-            base_name = self._extract_base_name(target_file)
-
-            if base_name:
-                # Find references to symbols in this file
-                refs = await self._find_static_references(target_file, base_name)
-                all_callers.extend(refs.get("callers", []))
-                all_type_hints.extend(refs.get("type_hints", []))
-
-                # Find naming convention matches
-                matches = await self._find_naming_convention_matches(base_name)
-                all_naming_matches.tests.extend(matches.tests)
-                all_naming_matches.factories.extend(matches.factories)
-                all_naming_matches.seeders.extend(matches.seeders)
-
-        # Deduplicate
-        all_callers = self._deduplicate_refs(all_callers)
-        all_type_hints = self._deduplicate_refs(all_type_hints)
-        all_naming_matches.tests = list(set(all_naming_matches.tests))
-        all_naming_matches.factories = list(set(all_naming_matches.factories))
-        all_naming_matches.seeders = list(set(all_naming_matches.seeders))
+        # Accumulate with deduplication (references by file and line,
+        # first occurrence wins and insertion order is kept)
+        callers_by_key: dict[tuple[str, int], dict] = {}
+        type_hints_by_key: dict[tuple[str, int], dict] = {}
+        tests: dict[str, None] = {}
+        factories: dict[str, None] = {}
+        seeders: dict[str, None] = {}
+
+        for refs, matches in results:
+            for ref in refs["callers"]:
+                callers_by_key.setdefault((ref["file"], ref["line"]), ref)
+            for ref in refs["type_hints"]:
+                type_hints_by_key.setdefault((ref["file"], ref["line"]), ref)
+
+            tests.update(dict.fromkeys(matches.tests))
+            factories.update(dict.fromkeys(matches.factories))
+            seeders.update(dict.fromkeys(matches.seeders))
+
+        all_callers = list(callers_by_key.values())
+        all_type_hints = list(type_hints_by_key.values())
+        all_naming_matches = NamingConventionMatches(
+            tests=list(tests),
+            factories=list(factories),
+            seeders=list(seeders),
+        )
 
         # v1.1.1: Search for keywords in documentation
         keywords = self._extract_keywords(change_description, target_files)
-        doc_mentions = await self._find_document_mentions(keywords, target_files)
+        target_set = {self._normalize_path(f) for f in target_files}
+        doc_mentions = await self._find_document_mentions(keywords, target_set)
 
         # Build result
         static_refs = {}
@@ -222,22 +397,17 @@ class ImpactAnalyzer:
         if all_naming_matches.seeders:
             naming_matches["seeders"] = all_naming_matches.seeders
 
-        # Build confirmation requirements
-        must_verify = list(set(r["file"] for r in all_callers))
-        should_verify = list(set(
-            all_naming_matches.tests +
-            all_naming_matches.factories +
-            all_naming_matches.seeders
-        ))
+        # Build confirmation requirements (dict.fromkeys dedupes in a stable
+        # order, so identical inputs give identical responses)
+        must_verify = list(dict.fromkeys(r["file"] for r in all_callers))
 
         # v1.1.1: Add document files to should_verify
-        doc_files = list(set(m["file"] for m in doc_mentions))
-        should_verify.extend(doc_files)
+        doc_files = dict.fromkeys(m["file"] for m in doc_mentions)
+        should_verify = list({**tests, **factories, **seeders, **doc_files})
 
         # Remove target files from verification lists
-        target_set = set(str(Path(f).resolve()) for f in target_files)
-        must_verify = [f for f in must_verify if str(Path(f).resolve()) not in target_set]
-        should_verify = [f for f in should_verify if str(Path(f).resolve()) not in target_set]
+        must_verify = [f for f in must_verify if self._normalize_path(f) not in target_set]
+        should_verify = [f for f in should_verify if self._normalize_path(f) not in target_set]
 
         confirmation = {
             "must_verify": must_verify,
@@ -248,15 +418,7 @@ class ImpactAnalyzer:
             "indirect_note": (
                 "間接参照（2段階以上）が必要な場合は find_references で追加調査してください"
             ),
-            "schema": {
-                "verified_files": [
-                    {
-                        "file": "string",
-                        "status": "will_modify | no_change_needed | not_affected",
-                        "reason": "string (status != will_modify 時は必須)",
-                    }
-                ]
-            },
+            "schema": CONFIRMATION_SCHEMA,
         }
 
         # v1.1.1: Build document mentions dict
@@ -278,6 +440,39 @@ class ImpactAnalyzer:
             confirmation_required=confirmation,
         )
 
+    def _reference_symbols(self, target_file: str) -> tuple[str, ...]:
+        """
+        Symbol names to search for a target file.
+
+        The base name comes first. For snake_case files the original stem is
+        added (e.g. CartService and cart_service), since Python modules and
+        functions keep the snake_case name. Empty if there is no base name.
+        """
+        base_name = self._extract_base_name(target_file)
+        if not base_name:
+            return ()
+
+        stem = Path(target_file).name.split(".", 1)[0]
+        if stem != base_name:
+            return (base_name, stem)
+        return (base_name,)
+
+    async def _analyze_symbols(
+        self,
+        symbols: tuple[str, ...],
+    ) -> tuple[dict, NamingConventionMatches]:
+        """
+        Find static references and naming convention matches for one target.
+
+        Both lookups run concurrently. Naming conventions use the base name
+        (the first symbol).
+        """
+        refs, matches = await asyncio.gather(
+            self._find_static_references(symbols),
+            self._find_naming_convention_matches(symbols[0]),
+        )
+        return refs, matches
+
     def _should_relax_markup(self, target_files: list[str]) -> bool:
         """
         Check if all target files qualify for markup relaxation.
@@ -287,22 +482,9 @@ class ImpactAnalyzer:
         if not target_files:
             return False
 
-        for file_path in target_files:
-            path = Path(file_path)
-            suffix = path.suffix.lower()
-
-            # Check for multi-part extensions like .blade.php
-            full_suffix = "".join(path.suffixes).lower()
-
-            # Logic-containing markup files are NOT relaxed
-            if full_suffix in LOGIC_MARKUP_EXTENSIONS or suffix in LOGIC_MARKUP_EXTENSIONS:
-                return False
-
-            # Only relax pure markup files
-            if suffix not in RELAXED_MARKUP_EXTENSIONS:
-                return False
-
-        return True
+        # Logic-containing markup (LOGIC_MARKUP_EXTENSIONS) never has a relaxed
+        # last suffix, so the last suffix decides
+        return all(Path(f).suffix.lower() in RELAXED_MARKUP_EXTENSIONS for f in target_files)
 
     async def _create_relaxed_result(
         self,
@@ -341,11 +523,13 @@ class ImpactAnalyzer:
 
             elif suffix in {".html", ".htm"}:
                 # HTML file -> find CSS/JS files that might reference classes/ids
-                css_refs = await self._find_markup_cross_references(
-                    target_file, change_description, search_type="html_to_css"
-                )
-                js_refs = await self._find_markup_cross_references(
-                    target_file, change_description, search_type="html_to_js"
+                css_refs, js_refs = await asyncio.gather(
+                    self._find_markup_cross_references(
+                        target_file, change_description, search_type="html_to_css"
+                    ),
+                    self._find_markup_cross_references(
+                        target_file, change_description, search_type="html_to_js"
+                    ),
                 )
                 if css_refs:
                     cross_refs["css_files"] = css_refs
@@ -355,10 +539,10 @@ class ImpactAnalyzer:
                     should_verify.extend(r["file"] for r in js_refs)
 
         # Deduplicate and remove target files
-        target_set = set(str(Path(f).resolve()) for f in target_files)
-        should_verify = list(set(
+        target_set = {self._normalize_path(f) for f in target_files}
+        should_verify = list(dict.fromkeys(
             f for f in should_verify
-            if str(Path(f).resolve()) not in target_set
+            if self._normalize_path(f) not in target_set
         ))
 
         return ImpactAnalysisResult(
@@ -375,15 +559,7 @@ class ImpactAnalyzer:
                 "must_verify": [],
                 "should_verify": should_verify,
                 "llm_should_infer": [],
-                "schema": {
-                    "verified_files": [
-                        {
-                            "file": "string",
-                            "status": "will_modify | no_change_needed | not_affected",
-                            "reason": "string (status != will_modify 時は必須)",
-                        }
-                    ]
-                },
+                "schema": CONFIRMATION_SCHEMA,
             },
         )
 
@@ -429,21 +605,25 @@ class ImpactAnalyzer:
         else:
             return results
 
+        # Glob all patterns concurrently in worker threads
+        file_lists = await asyncio.gather(
+            *[self._glob_files(pattern) for pattern in file_patterns]
+        )
+
         # Search for each identifier in matching files
-        for pattern in file_patterns:
-            for file_path in self.repo_path.glob(pattern):
-                if not file_path.is_file():
-                    continue
+        target_path = self._normalize_path(target_file)
+        for files in file_lists:
+            for file_path in files:
                 # Skip the target file itself
-                if str(file_path.resolve()) == str(Path(target_file).resolve()):
+                if self._normalize_path(file_path) == target_path:
                     continue
 
                 try:
-                    content = file_path.read_text(encoding="utf-8", errors="ignore")
+                    content = Path(file_path).read_text(encoding="utf-8", errors="ignore")
                     for identifier in identifiers[:5]:  # Limit to avoid too many searches
                         if identifier in content:
                             results.append({
-                                "file": str(file_path),
+                                "file": file_path,
                                 "identifier": identifier,
                                 "type": search_type,
                             })
@@ -480,13 +660,8 @@ class ImpactAnalyzer:
         quoted = re.findall(r'["\']([a-zA-Z_][a-zA-Z0-9_-]+)["\']', text)
         identifiers.extend(quoted)
 
-        # Deduplicate and filter
-        seen = set()
-        unique = []
-        for ident in identifiers:
-            if ident not in seen and len(ident) >= 2:
-                seen.add(ident)
-                unique.append(ident)
+        # Deduplicate (keeping first-seen order) and filter
+        unique = list(dict.fromkeys(ident for ident in identifiers if len(ident) >= 2))
 
         return unique[:10]  # Limit to prevent too many searches
 
@@ -523,8 +698,8 @@ class ImpactAnalyzer:
             ids = re.findall(r'id\s*=\s*["\']([^"\']+)["\']', content, re.IGNORECASE)
             identifiers.extend(ids)
 
-        # Deduplicate and limit
-        return list(set(identifiers))[:10]
+        # Deduplicate (keeping first-seen order) and limit
+        return list(dict.fromkeys(identifiers))[:10]
 
     def _extract_base_name(self, file_path: str) -> str:
         """
@@ -535,77 +710,95 @@ class ImpactAnalyzer:
             src/components/UserProfile.tsx -> UserProfile
             services/cart_service.py -> CartService (normalized)
         """
-        path = Path(file_path)
-        stem = path.stem
-
-        # Handle multi-part extensions
-        while stem and "." in stem:
-            stem = Path(stem).stem
-
-        # Convert snake_case to PascalCase for consistency
-        if "_" in stem:
-            stem = "".join(word.capitalize() for word in stem.split("_"))
-
-        return stem
+        return _base_name(file_path)
 
     async def _find_static_references(
         self,
-        target_file: str,
-        base_name: str,
+        symbols: tuple[str, ...],
     ) -> dict:
         """
-        Find static references to the target file/symbol.
+        Find static references to the target file's symbols.
 
         Uses find_references to locate callers and type hints.
+        At most MAX_REFS_PER_SYMBOL unique references are collected per symbol.
         """
         callers = []
         type_hints = []
+        seen: set[tuple[str, int]] = set()
 
-        try:
-            # Search for the base name (class/function name)
-            refs_result = await find_references(
-                symbol=base_name,
-                path=str(self.repo_path),
-            )
+        # Search for the class/function names concurrently
+        results = await asyncio.gather(
+            *[self._find_references_cached(symbol) for symbol in symbols],
+            return_exceptions=True,
+        )
 
-            if "references" in refs_result:
-                for ref in refs_result["references"]:
-                    ref_info = {
-                        "file": ref.get("file", ""),
-                        "line": ref.get("line", 0),
-                        "context": ref.get("content", "")[:100],
-                    }
-
-                    # Basic heuristic to identify type hints
-                    content = ref.get("content", "")
-                    if self._looks_like_type_hint(content, base_name):
-                        type_hints.append(ref_info)
-                    else:
-                        callers.append(ref_info)
+        for symbol, refs_result in zip(symbols, results):
+            if isinstance(refs_result, BaseException) or "references" not in refs_result:
+                continue
 
-        except Exception:
-            pass
+            # Duplicates are skipped across symbols; the cap counts per symbol
+            collected = 0
+            for ref in refs_result["references"]:
+                if collected >= MAX_REFS_PER_SYMBOL:
+                    break
+
+                key = (ref.get("file", ""), ref.get("line", 0))
+                if key in seen:
+                    continue
+                seen.add(key)
+                collected += 1
+
+                ref_info = {
+                    "file": key[0],
+                    "line": key[1],
+                    "context": ref.get("content", "")[:100],
+                }
+
+                # Basic heuristic to identify type hints
+                content = ref.get("content", "")
+                if self._looks_like_type_hint(content, symbol):
+                    type_hints.append(ref_info)
+                else:
+                    callers.append(ref_info)
 
         return {"callers": callers, "type_hints": type_hints}
 
-    def _looks_like_type_hint(self, content: str, symbol: str) -> bool:
-        """Check if a reference looks like a type hint."""
-        # Common type hint patterns
-        type_hint_patterns = [
-            rf":\s*{re.escape(symbol)}[\s,\)\]]",  # : Symbol or : Symbol,
-            rf"->\s*{re.escape(symbol)}",  # -> Symbol
-            rf"<{re.escape(symbol)}>",  # Generic<Symbol>
-            rf"\[{re.escape(symbol)}\]",  # List[Symbol]
-            rf"@param\s+{re.escape(symbol)}",  # PHPDoc @param
-            rf"@return\s+{re.escape(symbol)}",  # PHPDoc @return
-            rf"@var\s+{re.escape(symbol)}",  # PHPDoc @var
-        ]
+    async def _find_references_cached(self, symbol: str) -> dict:
+        """
+        find_references scoped to the repo, cached per symbol for this analyzer.
+
+        Concurrent lookups of the same symbol share a single in-flight query.
+        """
+        if symbol not in self._refs_cache:
+            self._refs_cache[symbol] = asyncio.ensure_future(
+                find_references(symbol=symbol, path=str(self.repo_path))
+            )
+        return await self._refs_cache[symbol]
+
+    def _prefetch_references(self, symbols: Iterable[str]) -> None:
+        """
+        Start one find_references_batch query for all symbols not yet cached.
 
-        for pattern in type_hint_patterns:
-            if re.search(pattern, content):
-                return True
+        Each symbol's cache entry resolves to its part of the batch result,
+        so _find_references_cached callers share the single query.
+        """
+        missing = [s for s in dict.fromkeys(symbols) if s not in self._refs_cache]
+        if not missing:
+            return
+
+        batch = asyncio.ensure_future(
+            find_references_batch(symbols=missing, path=str(self.repo_path))
+        )
 
-        return False
+        async def result_for(symbol: str) -> dict:
+            return (await batch)[symbol]
+
+        for symbol in missing:
+            self._refs_cache[symbol] = asyncio.ensure_future(result_for(symbol))
+
+    def _looks_like_type_hint(self, content: str, symbol: str) -> bool:
+        """Check if a reference looks like a type hint."""
+        return _compile_type_hint_re(symbol).search(content) is not None
 
     async def _find_naming_convention_matches(
         self,
@@ -616,62 +809,108 @@ class ImpactAnalyzer:
 
         Generic patterns only - framework-specific patterns are left to LLM inference.
         """
-        matches = NamingConventionMatches()
+        repo_files = await self._list_repo_files()
+        test_re, factory_re, seeder_re = _compile_naming_convention_res(base_name)
+
+        def collect(pattern: re.Pattern) -> list[str]:
+            # isfile only for the few matches: the git index can list deleted files
+            paths = (os.path.join(base, f) for f in repo_files if pattern.fullmatch(f))
+            return [p for p in paths if os.path.isfile(p)]
+
+        base = str(self.repo_path)
+        return NamingConventionMatches(
+            tests=collect(test_re),
+            factories=collect(factory_re),
+            seeders=collect(seeder_re),
+        )
 
-        # Search for test files
-        test_patterns = [
-            f"**/*{base_name}*Test.*",
-            f"**/*{base_name}*test.*",
-            f"**/test_*{base_name}*.*",
-            f"**/tests/**/*{base_name}*.*",
-        ]
+    async def _list_repo_files(self) -> list[str]:
+        """
+        List repo-relative file paths (POSIX separators).
 
-        # Search for factory files
-        factory_patterns = [
-            f"**/*{base_name}Factory.*",
-            f"**/*{base_name}*factory.*",
-            f"**/factories/*{base_name}*.*",
+        In a git repository the list comes from git ls-files (tracked plus
+        untracked files not ignored by .gitignore); otherwise the tree is
+        walked. Either runs once per analyzer in a worker thread and
+        concurrent callers share the result.
+        """
+        if self._repo_files is None:
+            self._repo_files = asyncio.ensure_future(asyncio.to_thread(self._scan_repo_files))
+        return await self._repo_files
+
+    def _scan_repo_files(self) -> list[str]:
+        """List repository files via git, falling back to a directory walk."""
+        files = self._git_ls_files()
+        if files is None:
+            return self._walk_once()
+        return [
+            f for f in files
+            if NAMING_CONVENTION_PRUNE_DIRS.isdisjoint(f.split("/")[:-1])
         ]
 
-        # Search for seeder files
-        seeder_patterns = [
-            f"**/*{base_name}Seeder.*",
-            f"**/*{base_name}*seeder.*",
-            f"**/seeders/*{base_name}*.*",
+    def _git_ls_files(self) -> list[str] | None:
+        """Files git knows about (not ignored); None outside a git repository."""
+        try:
+            result = subprocess.run(
+                [
+                    "git", "-C", str(self.repo_path), "ls-files", "-z",
+                    "--cached", "--others", "--exclude-standard",
+                ],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+            )
+        except OSError:
+            return None
+        if result.returncode != 0:
+            return None
+        return [
+            os.fsdecode(path) for path in result.stdout.split(b"\x00") if path
         ]
 
-        # Execute glob searches
-        for pattern in test_patterns:
-            matches.tests.extend(self._glob_files(pattern))
-
-        for pattern in factory_patterns:
-            matches.factories.extend(self._glob_files(pattern))
-
-        for pattern in seeder_patterns:
-            matches.seeders.extend(self._glob_files(pattern))
+    def _walk_once(self) -> list[str]:
+        """Walk the repository once, pruning directories in NAMING_CONVENTION_PRUNE_DIRS."""
+        files = []
+        for root, dirs, filenames in os.walk(self.repo_path):
+            dirs[:] = [d for d in dirs if d not in NAMING_CONVENTION_PRUNE_DIRS]
+            rel_root = os.path.relpath(root, self.repo_path)
+            prefix = "" if rel_root == "." else rel_root.replace(os.sep, "/") + "/"
+            files.extend(prefix + filename for filename in filenames)
+        return files
+
+    async def _glob_files(self, pattern: str) -> list[str]:
+        """Glob for files matching pattern (runs in a worker thread)."""
+        return await asyncio.to_thread(self._glob_files_sync, pattern)
+
+    def _glob_files_sync(self, pattern: str) -> list[str]:
+        """
+        Glob for files matching pattern.
 
+        Walks with os.scandir so file types come from the directory listing
+        (no stat per entry), pruning NAMING_CONVENTION_PRUNE_DIRS. Symlinks
+        are not followed.
+        """
+        pattern_re = _compile_glob(pattern)
+        matches = []
+        stack = [(self._repo_base, "")]
+        while stack:
+            directory, prefix = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in NAMING_CONVENTION_PRUNE_DIRS:
+                                    stack.append((entry.path, prefix + entry.name + "/"))
+                            elif (
+                                entry.is_file(follow_symlinks=False)
+                                and pattern_re.fullmatch(prefix + entry.name)
+                            ):
+                                matches.append(entry.path)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
         return matches
 
-    def _glob_files(self, pattern: str) -> list[str]:
-        """Glob for files matching pattern."""
-        try:
-            return [str(p) for p in self.repo_path.glob(pattern) if p.is_file()]
-        except Exception:
-            return []
-
-    def _deduplicate_refs(self, refs: list[dict]) -> list[dict]:
-        """Deduplicate references by file and line."""
-        seen = set()
-        unique = []
-
-        for ref in refs:
-            key = (ref.get("file", ""), ref.get("line", 0))
-            if key not in seen:
-                seen.add(key)
-                unique.append(ref)
-
-        return unique
-
     def _extract_keywords(
         self,
         change_description: str,
@@ -694,68 +933,40 @@ class ImpactAnalyzer:
         Returns:
             List of keywords to search for (prioritized, limited)
         """
-        # Use ordered list to maintain priority
-        high_priority = []    # Quoted strings
-        medium_priority = []  # Technical terms (CamelCase, snake_case)
-        low_priority = []     # File base names
-
-        # HIGH: Extract quoted strings from change_description
-        quoted_patterns = [
-            r'"([^"]+)"',  # "double quoted"
-            r"'([^']+)'",  # 'single quoted'
-            r'`([^`]+)`',  # `backtick`
-        ]
-        for pattern in quoted_patterns:
-            for match in re.findall(pattern, change_description):
-                if len(match) >= 2 and match not in high_priority:
-                    high_priority.append(match)
-
-        # MEDIUM: Extract technical terms (CamelCase, snake_case, specific patterns)
-        stop_words = {
-            "the", "a", "an", "is", "are", "was", "were", "be", "been",
-            "to", "of", "in", "for", "on", "with", "at", "by", "from",
-            "this", "that", "these", "those", "it", "its",
-            "and", "or", "but", "if", "then", "else",
-            "add", "remove", "change", "update", "modify", "fix", "delete",
-            "file", "files", "code", "field", "type", "value", "name",
-            "を", "に", "は", "が", "の", "で", "と", "へ", "から", "まで",
-            "する", "した", "します", "される", "された",
-            "追加", "削除", "変更", "修正", "更新", "フィールド", "型",
-        }
+        # Dicts keep insertion (priority) order and give O(1) dedup
+        # HIGH: Quoted strings ("double", 'single', `backtick`) in one scan
+        high_priority = dict.fromkeys(
+            quoted
+            for match in _QUOTED_RE.finditer(change_description)
+            if len(quoted := match.group(match.lastindex)) >= 2
+        )
 
-        # CamelCase pattern (e.g., ProductPrice, UserAccount)
-        camel_case = re.findall(r'[A-Z][a-z]+(?:[A-Z][a-z]+)+', change_description)
-        for term in camel_case:
-            if term not in medium_priority:
-                medium_priority.append(term)
-
-        # snake_case pattern (e.g., product_price, user_account)
-        snake_case = re.findall(r'[a-z]+(?:_[a-z]+)+', change_description)
-        for term in snake_case:
-            if term not in medium_priority:
-                medium_priority.append(term)
-
-        # Other significant words (4+ chars, not stop words)
-        words = re.findall(r'[a-zA-Z_][a-zA-Z0-9_]*|[ぁ-んァ-ン一-龥]+', change_description)
-        for word in words:
-            if (len(word) >= 4 and
-                word.lower() not in stop_words and
-                word not in medium_priority and
-                word not in high_priority):
-                medium_priority.append(word)
+        # MEDIUM: Technical terms from one tokenizer scan. CamelCase and
+        # snake_case terms never span tokens, so they are found within each
+        # word; they still rank before other words.
+        camel_case = {}  # e.g., ProductPrice, UserAccount
+        snake_case = {}  # e.g., product_price, user_account
+        words = {}       # Other significant words (4+ chars, not stop words)
+        for token in _WORD_RE.findall(change_description):
+            if not token.islower():
+                camel_case.update(dict.fromkeys(_CAMEL_CASE_RE.findall(token)))
+            if "_" in token:
+                snake_case.update(dict.fromkeys(_SNAKE_CASE_RE.findall(token)))
+            if (len(token) >= 4 and
+                token.lower() not in _STOP_WORDS and
+                token not in high_priority):
+                words.setdefault(token)
+        medium_priority = {**camel_case, **snake_case, **words}
 
         # LOW: Extract base names from target files (often too generic)
-        for target_file in target_files:
-            base_name = self._extract_base_name(target_file)
-            if (base_name and
-                len(base_name) >= 4 and
-                base_name not in low_priority and
-                base_name not in medium_priority and
-                base_name not in high_priority):
-                low_priority.append(base_name)
-
-        # Combine with priority order, respecting limit
-        all_keywords = high_priority + medium_priority + low_priority
+        low_priority = dict.fromkeys(
+            base_name
+            for base_name in map(self._extract_base_name, target_files)
+            if base_name and len(base_name) >= 4
+        )
+
+        # Combine with priority order (a keyword keeps its highest priority), respecting limit
+        all_keywords = list({**high_priority, **medium_priority, **low_priority})
         return all_keywords[:MAX_KEYWORDS]
 
     def _matches_exclude_pattern(self, file_path: str, exclude_patterns: list[str]) -> bool:
@@ -766,18 +977,14 @@ class ImpactAnalyzer:
         except ValueError:
             rel_path = file_path
 
-        for pattern in exclude_patterns:
-            if fnmatch(rel_path, pattern):
-                return True
-            # Also check just the filename for simple patterns
-            if fnmatch(Path(file_path).name, pattern):
-                return True
-        return False
+        exclude_re = _compile_exclude_re(tuple(exclude_patterns))
+        # Also check just the filename for simple patterns
+        return bool(exclude_re.match(rel_path) or exclude_re.match(Path(file_path).name))
 
     async def _find_document_mentions(
         self,
         keywords: list[str],
-        target_files: list[str],
+        target_set: set[str],
     ) -> list[dict]:
         """
         Search for keyword mentions in documentation files.
@@ -788,10 +995,11 @@ class ImpactAnalyzer:
         Configuration from context.yml document_search section:
         - include_patterns: Glob patterns for files to search (default: ["**/*.md", ...])
         - exclude_patterns: Glob patterns for files to exclude (default: ["node_modules/**", ...])
+        - max_file_size_kb: Documents larger than this are skipped (default: 5120)
 
         Args:
             keywords: Keywords to search for
-            target_files: Target files (excluded from results)
+            target_set: Normalized target file paths (excluded from results)
 
         Returns:
             List of document mentions aggregated by file:
@@ -800,8 +1008,6 @@ class ImpactAnalyzer:
         if not keywords:
             return []
 
-        target_set = set(str(Path(f).resolve()) for f in target_files)
-
         # Get patterns from config or use defaults
         include_patterns = self._document_config.get(
             "include_patterns", DEFAULT_DOCUMENT_PATTERNS
@@ -810,69 +1016,37 @@ class ImpactAnalyzer:
             "exclude_patterns", DEFAULT_DOCUMENT_EXCLUDE_PATTERNS
         )
 
-        # Find all document files
-        doc_files = []
-        for pattern in include_patterns:
-            doc_files.extend(self._glob_files(pattern))
-
-        # Filter to document extensions only
+        # Find all document files in one pass over the repository file list
+        # (repo-relative POSIX paths): document extension, include and exclude
+        # patterns (exclude also checked against the file name alone)
+        repo_files = await self._list_repo_files()
+        include_res = [_compile_glob(pattern) for pattern in include_patterns]
+        exclude_re = _compile_exclude_re(tuple(exclude_patterns))
         doc_files = [
-            f for f in doc_files
-            if Path(f).suffix.lower() in DOCUMENT_EXTENSIONS
-        ]
-
-        # Apply exclude patterns
-        doc_files = [
-            f for f in doc_files
-            if not self._matches_exclude_pattern(f, exclude_patterns)
+            os.path.join(self._repo_base, f) for f in repo_files
+            if os.path.splitext(f)[1].lower() in DOCUMENT_EXTENSIONS
+            and any(include_re.fullmatch(f) for include_re in include_res)
+            and not exclude_re.match(f)
+            and not exclude_re.match(f.rpartition("/")[2])
         ]
 
         # Deduplicate and exclude target files
-        doc_files = list(set(
+        doc_files = list(dict.fromkeys(
             f for f in doc_files
-            if str(Path(f).resolve()) not in target_set
+            if f not in target_set  # Already normalized (repo root + relative path)
         ))
 
         # Search each document for keywords, aggregate by file
-        file_results: dict[str, dict] = {}
-
-        for doc_file in doc_files:
-            try:
-                path = Path(doc_file)
-                if not path.exists() or not path.is_file():
-                    continue
-
-                content = path.read_text(encoding="utf-8", errors="ignore")
-                lines = content.split("\n")
-
-                file_matches = {
-                    "keywords_found": set(),
-                    "sample_lines": [],
-                    "match_count": 0,
-                }
-
-                for keyword in keywords:
-                    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-
-                    for line_num, line in enumerate(lines, start=1):
-                        if pattern.search(line):
-                            file_matches["match_count"] += 1
-                            file_matches["keywords_found"].add(keyword)
-
-                            # Keep sample lines (up to MAX_MENTIONS_PER_FILE)
-                            if len(file_matches["sample_lines"]) < MAX_MENTIONS_PER_FILE:
-                                file_matches["sample_lines"].append({
-                                    "line": line_num,
-                                    "content": line.strip()[:80],
-                                    "keyword": keyword,
-                                })
-
-                # Only include files with matches
-                if file_matches["match_count"] > 0:
-                    file_results[str(path)] = file_matches
-
-            except Exception:
-                continue
+        keyword_patterns = tuple(
+            (keyword, re.compile(re.escape(keyword), re.IGNORECASE))
+            for keyword in keywords
+        )
+        max_size = self._document_config.get(
+            "max_file_size_kb", DEFAULT_DOCUMENT_MAX_FILE_SIZE_KB
+        ) * 1024
+        file_results = await self._scan_documents_rg(doc_files, keyword_patterns, max_size)
+        if file_results is None:
+            file_results = await self._scan_documents(doc_files, keyword_patterns, max_size)
 
         # Sort by match count (most relevant first) and limit
         sorted_files = sorted(
@@ -881,17 +1055,315 @@ class ImpactAnalyzer:
             reverse=True,
         )[:MAX_TOTAL_FILES]
 
-        # Convert to output format
+        # Convert to output format (copies: scan results are cached and shared)
         return [
             {
                 "file": file_path,
                 "match_count": data["match_count"],
                 "keywords": list(data["keywords_found"]),
-                "sample_lines": data["sample_lines"],
+                "sample_lines": [dict(line) for line in data["sample_lines"]],
             }
             for file_path, data in sorted_files
         ]
 
+    async def _scan_documents(
+        self,
+        doc_files: list[str],
+        keyword_patterns: tuple[tuple[str, re.Pattern], ...],
+        max_size: int,
+    ) -> dict[str, dict]:
+        """
+        Scan documents line by line in Python (used when ripgrep is unavailable).
+
+        Files are read and scanned concurrently in worker threads, with at
+        most DOCUMENT_SCAN_CONCURRENCY open at a time. Files larger than
+        max_size bytes are skipped, and results for unchanged files are
+        served from an in-process cache.
+        """
+        semaphore = asyncio.Semaphore(DOCUMENT_SCAN_CONCURRENCY)
+
+        # Keywords that only need ASCII case folding are found with bytes.find on
+        # the lowered raw content (combined_re=None). Keywords with non-ASCII
+        # cased letters need Unicode folding: one str alternation finds candidate
+        # lines, and each keyword is checked on those only.
+        keywords = [keyword for keyword, _ in keyword_patterns]
+        if all(k.isascii() or k.lower() == k.upper() for k in keywords):
+            combined_re = None
+        else:
+            combined_re = re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE)
+
+        # Only the top MAX_TOTAL_FILES match counts are returned, so once that
+        # many files have matched, a file whose size cannot hold more matches
+        # than the smallest of them is not read at all.
+        top_counts: list[int] = []  # Min-heap of the best match counts so far
+
+        async def scan(doc_file: str) -> dict | None:
+            async with semaphore:
+                min_count = top_counts[0] if len(top_counts) >= MAX_TOTAL_FILES else 0
+                file_matches = await asyncio.to_thread(
+                    _scan_document, doc_file, combined_re, keyword_patterns, max_size, min_count
+                )
+            if file_matches:
+                if len(top_counts) < MAX_TOTAL_FILES:
+                    heapq.heappush(top_counts, file_matches["match_count"])
+                elif file_matches["match_count"] > top_counts[0]:
+                    heapq.heapreplace(top_counts, file_matches["match_count"])
+            return file_matches
+
+        results = await asyncio.gather(*[scan(doc_file) for doc_file in doc_files])
+
+        # Only include files with matches
+        return {
+            doc_file: file_matches
+            for doc_file, file_matches in zip(doc_files, results)
+            if file_matches
+        }
+
+    async def _scan_documents_rg(
+        self,
+        doc_files: list[str],
+        keyword_patterns: tuple[tuple[str, re.Pattern], ...],
+        max_size: int,
+    ) -> dict[str, dict] | None:
+        """
+        Scan documents with a single ripgrep pass per chunk of files.
+
+        ripgrep (fixed-string, case-insensitive) finds the matching lines;
+        they are then attributed to keywords exactly as in _scan_documents.
+
+        Returns:
+            Same shape as _scan_documents, or None if ripgrep is not installed
+        """
+        if not doc_files or not _has_ripgrep():
+            return None
+
+        cmd = [
+            "rg", "--json", "--ignore-case", "--fixed-strings",
+            "--max-filesize", str(max_size),
+        ]
+        for keyword, _ in keyword_patterns:
+            cmd.extend(["-e", keyword])
+        cmd.append("--")
+
+        chunks = [
+            doc_files[i:i + DOCUMENT_RG_MAX_FILES]
+            for i in range(0, len(doc_files), DOCUMENT_RG_MAX_FILES)
+        ]
+        try:
+            outputs = await asyncio.gather(*[
+                asyncio.to_thread(
+                    subprocess.run,
+                    cmd + chunk,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+                for chunk in chunks
+            ])
+        except OSError:
+            return None
+
+        file_results: dict[str, dict] = {}
+        for result in outputs:
+            for file_path, lines in _parse_rg_matching_lines(result.stdout).items():
+                file_matches = _aggregate_mentions(lines, keyword_patterns)
+                if file_matches:
+                    file_results[file_path] = file_matches
+
+        return file_results
+
+
+def _scan_document(
+    doc_file: str,
+    combined_re: re.Pattern | None,
+    keyword_patterns: tuple[tuple[str, re.Pattern], ...],
+    max_size: int,
+    min_count: int = 0,
+) -> dict | None:
+    """
+    Read one document and aggregate its keyword matches (None if no match).
+
+    Files too small to reach min_count matches are not read (None).
+    """
+    try:
+        stat = os.stat(doc_file)
+    except OSError:
+        return None
+    if not S_ISREG(stat.st_mode) or stat.st_size > max_size:
+        return None
+    if min_count and _max_match_count(stat.st_size, keyword_patterns) < min_count:
+        return None
+
+    return _scan_document_cached(
+        doc_file, stat.st_mtime_ns, stat.st_size, combined_re, keyword_patterns
+    )
+
+
+def _max_match_count(size: int, keyword_patterns: tuple[tuple[str, re.Pattern], ...]) -> int:
+    """
+    Upper bound on the match_count of a file of `size` bytes.
+
+    Each (keyword, line) match spans at least len(keyword) bytes of its own line.
+    """
+    return sum(size // max(len(keyword), 1) for keyword, _ in keyword_patterns)
+
+
+@functools.lru_cache(maxsize=1024)
+def _scan_document_cached(
+    doc_file: str,
+    mtime_ns: int,
+    size: int,
+    combined_re: re.Pattern | None,
+    keyword_patterns: tuple[tuple[str, re.Pattern], ...],
+) -> dict | None:
+    """
+    Scan one document, memoized per (path, mtime, size, keywords).
+
+    mtime_ns and size are part of the key so edited files are rescanned.
+    The returned dict is shared between calls and must not be mutated.
+    """
+    try:
+        data = Path(doc_file).read_bytes()
+        if combined_re is None:
+            return _aggregate_literal_mentions(data, keyword_patterns)
+        content = data.decode("utf-8", errors="ignore")
+        lines = _find_matching_lines(content, combined_re)
+        return _aggregate_mentions(lines, keyword_patterns)
+
+    except Exception:
+        return None
+
+
+def _find_matching_lines(
+    content: str | bytes,
+    combined_re: re.Pattern,
+) -> list[tuple[int, str | bytes]]:
+    """
+    Find the lines matching any keyword with one pass of the combined regex.
+
+    Works on str or bytes content (with a pattern of the same type). Line
+    numbers are counted incrementally between matches, so the content is
+    never split into a list of lines.
+    """
+    newline = b"\n" if isinstance(content, bytes) else "\n"
+    lines = []
+    line_num, pos = 1, 0
+    for match in combined_re.finditer(content):
+        start = match.start()
+        line_num += content.count(newline, pos, start)
+        pos = start
+        if lines and lines[-1][0] == line_num:
+            continue
+
+        line_start = content.rfind(newline, 0, start) + 1
+        line_end = content.find(newline, start)
+        lines.append((line_num, content[line_start:line_end if line_end != -1 else None]))
+
+    return lines
+
+
+def _has_ripgrep() -> bool:
+    """Check if ripgrep (rg) is installed."""
+    return shutil.which("rg") is not None
+
+
+def _parse_rg_matching_lines(stdout: bytes) -> dict[str, list[tuple[int, str]]]:
+    """Group `rg --json` match events into (line_num, line) pairs per file."""
+    lines_by_file: dict[str, list[tuple[int, str]]] = {}
+    for raw in stdout.splitlines():
+        try:
+            event = json.loads(raw)
+        except json.JSONDecodeError:
+            continue
+        if event.get("type") != "match":
+            continue
+
+        data = event["data"]
+        file_path = data["path"].get("text")
+        line = data["lines"].get("text")
+        if file_path is None or line is None:
+            continue  # Non-UTF-8 path or content (reported as base64 bytes)
+        lines_by_file.setdefault(file_path, []).append((data["line_number"], line))
+
+    return lines_by_file
+
+
+def _aggregate_mentions(
+    lines: list[tuple[int, str]],
+    keyword_patterns: tuple[tuple[str, re.Pattern], ...],
+) -> dict | None:
+    """
+    Aggregate keyword matches over the (line_num, line) pairs of one file.
+
+    Every (keyword, line) match counts once; sample lines are kept in keyword
+    order, up to MAX_MENTIONS_PER_FILE. Returns None if nothing matched.
+    """
+    file_matches = {
+        "keywords_found": {},  # Ordered set (keys)
+        "sample_lines": [],
+        "match_count": 0,
+    }
+
+    for keyword, pattern in keyword_patterns:
+        for line_num, line in lines:
+            if pattern.search(line):
+                file_matches["match_count"] += 1
+                file_matches["keywords_found"][keyword] = None
+
+                # Keep sample lines (up to MAX_MENTIONS_PER_FILE)
+                if len(file_matches["sample_lines"]) < MAX_MENTIONS_PER_FILE:
+                    file_matches["sample_lines"].append({
+                        "line": line_num,
+                        "content": line.strip()[:80],
+                        "keyword": keyword,
+                    })
+
+    return file_matches if file_matches["match_count"] else None
+
+
+def _aggregate_literal_mentions(
+    data: bytes,
+    keyword_patterns: tuple[tuple[str, re.Pattern], ...],
+) -> dict | None:
+    """
+    Aggregate matches of ASCII-foldable keywords in raw file content.
+
+    Gives the same result as _aggregate_mentions over the matching lines,
+    but each keyword is located with bytes.find on the lowered content and
+    only sampled lines are decoded.
+    """
+    lower = data.lower()
+    file_matches = {
+        "keywords_found": {},  # Ordered set (keys)
+        "sample_lines": [],
+        "match_count": 0,
+    }
+
+    for keyword, _ in keyword_patterns:
+        needle = keyword.lower().encode("utf-8")
+        line_num, line_start = 1, 0
+        pos = lower.find(needle)
+        while pos != -1:
+            line_num += lower.count(b"\n", line_start, pos)
+            line_start = lower.rfind(b"\n", 0, pos) + 1
+            line_end = lower.find(b"\n", pos)
+            if line_end == -1:
+                line_end = len(lower)
+
+            file_matches["match_count"] += 1
+            file_matches["keywords_found"][keyword] = None
+            if len(file_matches["sample_lines"]) < MAX_MENTIONS_PER_FILE:
+                line = data[line_start:line_end].decode("utf-8", errors="ignore")
+                file_matches["sample_lines"].append({
+                    "line": line_num,
+                    "content": line.strip()[:80],
+                    "keyword": keyword,
+                })
+
+            # Each (keyword, line) counts once: resume on the next line
+            pos = lower.find(needle, line_end + 1)
+
+    return file_matches if file_matches["match_count"] else None
+
 
 async def analyze_impact(
     target_files: list[str],
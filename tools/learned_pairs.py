@@ -7,16 +7,36 @@ v3.7: 成功したNL→Symbolペアを自動キャッシュ
 - 有効期限とクリーンアップ機構
 """
 
+import atexit
+import functools
 import json
-from dataclasses import dataclass, asdict
+import os
+import sys
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
+try:
+    import orjson
 
-@dataclass
+    _json_loads = orjson.loads
+
+    def _json_line(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    # orjson is optional; stdlib json produces equivalent lines, just slower
+    _json_loads = json.loads
+
+    def _json_line(obj) -> bytes:
+        return (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+@dataclass(slots=True)
 class LearnedPair:
-    """学習されたNL→Symbolペア"""
+    """学習されたNL→Symbolペア（__slots__ でインスタンスごとの __dict__ を持たない）"""
     nl_term: str
     symbol: str
     similarity: float
@@ -25,28 +45,60 @@ class LearnedPair:
     learned_at: str
 
     def to_dict(self) -> dict:
-        return asdict(self)
+        return {
+            "nl_term": self.nl_term,
+            "symbol": self.symbol,
+            "similarity": self.similarity,
+            "code_evidence": self.code_evidence,
+            "session_id": self.session_id,
+            "learned_at": self.learned_at,
+        }
 
     @classmethod
     def from_dict(cls, data: dict) -> "LearnedPair":
-        return cls(**data)
+        pair = cls(**data)
+        # 重複の多い文字列は intern して共有（同一性比較でハッシュ照合も速くなる）
+        pair.nl_term = sys.intern(pair.nl_term)
+        pair.symbol = sys.intern(pair.symbol)
+        pair.session_id = sys.intern(pair.session_id)
+        return pair
 
 
 class LearnedPairsCache:
     """
     成功ペアのキャッシュ管理。
 
-    プロジェクトルートの .code-intel/learned_pairs.json に保存。
+    プロジェクトルートの .code-intel/learned_pairs.jsonl に保存。
+    追加・更新は1ペア1行で追記し（同じキーは後勝ち）、行数が
+    有効ペア数の COMPACT_RATIO 倍を超えたらスナップショットに書き直す。
     """
 
-    DEFAULT_PATH = ".code-intel/learned_pairs.json"
+    DEFAULT_PATH = ".code-intel/learned_pairs.jsonl"
+    LEGACY_PATH = ".code-intel/learned_pairs.json"  # v3.7 の JSON 形式（初回ロード時に移行）
     MAX_AGE_DAYS = 30  # 30日経過したペアは削除
+    MAX_PAIRS = 10_000  # 件数の上限（超えたら最も長く使われていないペアから削除）
+    COMPACT_RATIO = 2
 
-    def __init__(self, project_root: str = "."):
+    def __init__(self, project_root: str = ".", flush_each: bool = False):
         self.project_root = Path(project_root).resolve()
+        # True なら add_pair ごとに即保存（クラッシュ耐性優先）
+        self.flush_each = flush_each
+        self._dirty = False
         self.cache_path = self.project_root / self.DEFAULT_PATH
-        self._pairs: list[LearnedPair] = []
+        self.legacy_path = self.project_root / self.LEGACY_PATH
+        # (nl_term, symbol) -> ペア、nl_term -> シンボル集合 の索引
+        # _by_key は LRU 順（末尾が最近追加・参照されたペア）
+        self._by_key: OrderedDict[tuple[str, str], LearnedPair] = OrderedDict()
+        self._by_term: dict[str, set[str]] = {}
+        # 最古の learned_at の下限（これより新しければ cleanup は全件走査しない）
+        self._oldest_learned_at: Optional[str] = None
+        # 未追記のペア（flush で追記）と、ファイル上の行数
+        self._pending: dict[tuple[str, str], LearnedPair] = {}
+        self._log_lines = 0
+        # LRU で追い出したペアがある（ファイル上に残る行はスナップショットで消す）
+        self._evicted = False
         self._loaded = False
+        _open_caches.add(self)
 
     def _ensure_dir(self) -> None:
         """キャッシュディレクトリを作成"""
@@ -58,29 +110,90 @@ class LearnedPairsCache:
             return
 
         if self.cache_path.exists():
+            pairs = []
+            with open(self.cache_path, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    self._log_lines += 1
+                    try:
+                        pairs.append(LearnedPair.from_dict(_json_loads(line)))
+                    except (json.JSONDecodeError, UnicodeDecodeError, TypeError):
+                        continue
+            self._set_pairs(pairs)
+        elif self.legacy_path.exists():
+            # 旧形式から移行（次回の flush でスナップショットを書き出す）
             try:
-                data = json.loads(self.cache_path.read_text(encoding="utf-8"))
-                self._pairs = [
+                data = json.loads(self.legacy_path.read_text(encoding="utf-8"))
+                self._set_pairs(
                     LearnedPair.from_dict(p)
                     for p in data.get("pairs", [])
-                ]
-            except (json.JSONDecodeError, KeyError):
-                self._pairs = []
+                )
+            except (json.JSONDecodeError, KeyError, TypeError):
+                self._set_pairs([])
 
         self._loaded = True
 
+    def _set_pairs(self, pairs: Iterable[LearnedPair]) -> None:
+        """ペア一覧から索引を再構築（同じキーは後勝ち）"""
+        self._by_key = OrderedDict()
+        for p in pairs:
+            key = (p.nl_term, p.symbol)
+            if key in self._by_key:
+                self._by_key.move_to_end(key)
+            self._by_key[key] = p
+        self._by_term = {}
+        for nl_term, symbol in self._by_key:
+            self._by_term.setdefault(nl_term, set()).add(symbol)
+        self._evict_overflow()
+        self._oldest_learned_at = min(
+            (p.learned_at for p in self._by_key.values()), default=None
+        )
+
     def save(self) -> None:
-        """キャッシュを保存"""
+        """全ペアのスナップショットを書き出す（一時ファイル + os.replace で置換）"""
         self._ensure_dir()
-        data = {
-            "version": 1,
-            "updated_at": datetime.now().isoformat(),
-            "pairs": [p.to_dict() for p in self._pairs],
-        }
-        self.cache_path.write_text(
-            json.dumps(data, indent=2, ensure_ascii=False),
-            encoding="utf-8",
-        )
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.writelines(_json_line(p.to_dict()) for p in self._by_key.values())
+        os.replace(tmp_path, self.cache_path)
+        self._log_lines = len(self._by_key)
+        self._evicted = False
+        self._pending.clear()
+        self._dirty = False
+
+    def flush(self) -> None:
+        """未保存の変更を追記し、必要ならコンパクション"""
+        if not self._dirty:
+            return
+        if self._evicted or not self.cache_path.exists():
+            # 初回（または旧形式からの移行）と LRU 削除後はスナップショット
+            self.save()
+            return
+
+        with open(self.cache_path, "ab") as f:
+            f.writelines(_json_line(p.to_dict()) for p in self._pending.values())
+        self._log_lines += len(self._pending)
+        self._pending.clear()
+        self._dirty = False
+        self._maybe_compact()
+
+    def _maybe_compact(self) -> None:
+        """上書きで溜まった古い行が多ければスナップショットに書き直す"""
+        if self._log_lines > self.COMPACT_RATIO * len(self._by_key):
+            self.save()
+
+    def _evict_overflow(self) -> None:
+        """MAX_PAIRS を超えた分を LRU 順に削除"""
+        while len(self._by_key) > self.MAX_PAIRS:
+            (nl_term, symbol), _ = self._by_key.popitem(last=False)
+            self._pending.pop((nl_term, symbol), None)
+            symbols = self._by_term[nl_term]
+            symbols.discard(symbol)
+            if not symbols:
+                del self._by_term[nl_term]
+            self._evicted = True
+            self._dirty = True
 
     def add_pair(
         self,
@@ -89,101 +202,202 @@ class LearnedPairsCache:
         similarity: float,
         code_evidence: Optional[str],
         session_id: str,
+        learned_at: Optional[str] = None,
     ) -> None:
-        """ペアを追加（重複チェック付き）"""
+        """
+        ペアを追加（重複チェック付き）。
+
+        保存は flush() まで遅延する（flush_each=True なら即保存）。
+        learned_at を省略すると現在時刻。
+        """
         self.load()
+        self._dirty = True
+        nl_term = sys.intern(nl_term)
+        symbol = sys.intern(symbol)
+        session_id = sys.intern(session_id)
+        if learned_at is None:
+            learned_at = datetime.now().isoformat()
+
+        if self._oldest_learned_at is None or learned_at < self._oldest_learned_at:
+            self._oldest_learned_at = learned_at
 
         # 既存のペアをチェック
-        for pair in self._pairs:
-            if pair.nl_term == nl_term and pair.symbol == symbol:
-                # 既存ペアを更新
-                pair.similarity = similarity
-                pair.code_evidence = code_evidence
-                pair.session_id = session_id
-                pair.learned_at = datetime.now().isoformat()
-                self.save()
-                return
-
-        # 新規ペアを追加
-        self._pairs.append(LearnedPair(
-            nl_term=nl_term,
-            symbol=symbol,
-            similarity=similarity,
-            code_evidence=code_evidence,
-            session_id=session_id,
-            learned_at=datetime.now().isoformat(),
-        ))
-        self.save()
+        key = (nl_term, symbol)
+        pair = self._by_key.get(key)
+        if pair is not None:
+            # 既存ペアを更新
+            self._by_key.move_to_end(key)
+            pair.similarity = similarity
+            pair.code_evidence = code_evidence
+            pair.session_id = session_id
+            pair.learned_at = learned_at
+        else:
+            # 新規ペアを追加
+            pair = self._by_key[key] = LearnedPair(
+                nl_term=nl_term,
+                symbol=symbol,
+                similarity=similarity,
+                code_evidence=code_evidence,
+                session_id=session_id,
+                learned_at=learned_at,
+            )
+            self._by_term.setdefault(nl_term, set()).add(symbol)
+        self._pending[key] = pair
+        self._evict_overflow()
+
+        if self.flush_each:
+            self.flush()
+
+    def add_pairs(
+        self,
+        pairs: Iterable[tuple[str, str, float, Optional[str], str]],
+    ) -> int:
+        """
+        複数ペアをまとめて追加し、1回だけ保存。
+
+        learned_at はバッチ内で共通（時刻の取得・整形は1回）。
+
+        Args:
+            pairs: (nl_term, symbol, similarity, code_evidence, session_id) のタプル
+
+        Returns:
+            追加・更新したペア数
+        """
+        learned_at = datetime.now().isoformat()
+        count = 0
+        for pair in pairs:
+            self.add_pair(*pair, learned_at=learned_at)
+            count += 1
+        self.flush()
+        return count
 
     def find_matches(
         self,
         nl_term: str,
-        symbols: list[str],
+        symbols: Iterable[str],
     ) -> list[LearnedPair]:
         """
         キャッシュからマッチするペアを検索。
 
         Args:
             nl_term: 自然言語の用語
-            symbols: 探索で見つかったシンボルのリスト
+            symbols: 探索で見つかったシンボルのリスト（set / frozenset も可）
 
         Returns:
             マッチしたペアのリスト
         """
         self.load()
+        learned_symbols = self._by_term.get(nl_term)
+        if not learned_symbols:
+            return []
+
+        # 順序を持たない入力は積集合で引く
+        if isinstance(symbols, (set, frozenset)):
+            matched = learned_symbols & symbols
+        else:
+            # 索引に載っているシンボルだけを引く（探索結果の順序を保持、全件見つかれば打ち切り）
+            matched = {}
+            for symbol in symbols:
+                if symbol in learned_symbols and symbol not in matched:
+                    matched[symbol] = None
+                    if len(matched) == len(learned_symbols):
+                        break
+
+        # ヒットしたペアは LRU の末尾へ
         matches = []
-
-        for pair in self._pairs:
-            if pair.nl_term == nl_term and pair.symbol in symbols:
-                matches.append(pair)
-
+        for symbol in matched:
+            key = (nl_term, symbol)
+            self._by_key.move_to_end(key)
+            matches.append(self._by_key[key])
         return matches
 
     def cleanup_old_pairs(self) -> int:
         """古いペアを削除"""
         self.load()
-        cutoff = datetime.now() - timedelta(days=self.MAX_AGE_DAYS)
-        original_count = len(self._pairs)
-
-        self._pairs = [
-            p for p in self._pairs
-            if datetime.fromisoformat(p.learned_at) > cutoff
-        ]
-
-        removed = original_count - len(self._pairs)
-        if removed > 0:
+        # learned_at は datetime.isoformat() の文字列なので、文字列比較で
+        # 時刻順になる（ペアごとの fromisoformat は不要）
+        cutoff_iso = (datetime.now() - timedelta(days=self.MAX_AGE_DAYS)).isoformat()
+        if self._oldest_learned_at is None or self._oldest_learned_at > cutoff_iso:
+            return 0
+
+        # learned_at の列だけを1回走査し、期限切れのキーと残りの最古値を求める
+        expired = []
+        oldest = None
+        for key, pair in self._by_key.items():
+            learned_at = pair.learned_at
+            if learned_at <= cutoff_iso:
+                expired.append(key)
+            elif oldest is None or learned_at < oldest:
+                oldest = learned_at
+        self._oldest_learned_at = oldest
+
+        # 索引は期限切れのキーだけ取り除く（全体の再構築はしない）
+        for nl_term, symbol in expired:
+            del self._by_key[(nl_term, symbol)]
+            symbols = self._by_term[nl_term]
+            symbols.discard(symbol)
+            if not symbols:
+                del self._by_term[nl_term]
+
+        if expired:
             self.save()
 
-        return removed
+        return len(expired)
 
     def get_stats(self) -> dict:
         """キャッシュ統計を取得"""
         self.load()
         return {
-            "total_pairs": len(self._pairs),
-            "unique_nl_terms": len(set(p.nl_term for p in self._pairs)),
-            "unique_symbols": len(set(p.symbol for p in self._pairs)),
+            "total_pairs": len(self._by_key),
+            "unique_nl_terms": len(self._by_term),
+            "unique_symbols": len(set(symbol for _, symbol in self._by_key)),
             "cache_path": str(self.cache_path),
         }
 
     def clear(self) -> None:
         """キャッシュをクリア"""
-        self._pairs = []
-        if self.cache_path.exists():
-            self.cache_path.unlink()
+        self._set_pairs([])
+        self._pending.clear()
+        self._log_lines = 0
+        self._dirty = False
+        for path in (self.cache_path, self.legacy_path):
+            if path.exists():
+                path.unlink()
         self._loaded = False
 
 
-# シングルトンインスタンス
-_cache_instance: Optional[LearnedPairsCache] = None
+# 終了時に未保存の変更を書き出す対象
+_open_caches: "weakref.WeakSet[LearnedPairsCache]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_caches() -> None:
+    """プロセス終了時に未保存のキャッシュを保存"""
+    for cache in list(_open_caches):
+        try:
+            cache.flush()
+        except OSError:
+            pass
+
+
+# プロジェクトルート（解決済みパス）ごとのインスタンス
+_cache_instances: dict[Path, LearnedPairsCache] = {}
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_root(project_root: str, cwd: str) -> Path:
+    """project_root を解決（相対パスは cwd ごとにキャッシュ）"""
+    return Path(cwd, project_root).resolve()
 
 
 def get_learned_pairs_cache(project_root: str = ".") -> LearnedPairsCache:
-    """LearnedPairsCacheのシングルトンを取得"""
-    global _cache_instance
-    if _cache_instance is None or str(_cache_instance.project_root) != str(Path(project_root).resolve()):
-        _cache_instance = LearnedPairsCache(project_root)
-    return _cache_instance
+    """プロジェクトごとの LearnedPairsCache を取得（毎回の resolve() は行わない）"""
+    cwd = "" if os.path.isabs(project_root) else os.getcwd()
+    root = _resolve_root(project_root, cwd)
+    cache = _cache_instances.get(root)
+    if cache is None:
+        cache = _cache_instances[root] = LearnedPairsCache(str(root))
+    return cache
 
 
 def cache_successful_pair(
@@ -197,6 +411,25 @@ def cache_successful_pair(
     """成功ペアをキャッシュに追加（ヘルパー関数）"""
     cache = get_learned_pairs_cache(project_root)
     cache.add_pair(nl_term, symbol, similarity, code_evidence, session_id)
+    cache.flush()
+
+
+def cache_successful_pairs(
+    pairs: Iterable[tuple[str, str, float, Optional[str], str]],
+    project_root: str = ".",
+) -> int:
+    """
+    同一セッションの成功ペアをまとめてキャッシュに追加（ヘルパー関数）。
+
+    Args:
+        pairs: (nl_term, symbol, similarity, code_evidence, session_id) のタプル
+        project_root: プロジェクトルート
+
+    Returns:
+        追加・更新したペア数
+    """
+    cache = get_learned_pairs_cache(project_root)
+    return cache.add_pairs(pairs)
 
 
 def find_cached_matches(
@@ -19,10 +19,21 @@ Improvement cycle:
 
 import json
 import os
-from dataclasses import dataclass, field, asdict
+import re
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Literal
+from typing import Any, Callable, Iterable, Iterator, Literal
+
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:
+    # orjson is optional; stdlib json parses the same records, just slower
+    _json_loads = json.loads
 
 
 # Log file location (inside .code-intel for project isolation)
@@ -30,8 +41,11 @@ LOG_DIR = Path(__file__).parent.parent / ".code-intel" / "logs"
 DECISION_LOG_FILE = LOG_DIR / "decisions.jsonl"
 OUTCOME_LOG_FILE = LOG_DIR / "outcomes.jsonl"
 
+# Block size used when reading recent records backwards from the end of a log
+LOG_TAIL_BLOCK_SIZE = 64 * 1024
+
 
-@dataclass
+@dataclass(slots=True)
 class OutcomeAnalysis:
     """
     LLM's analysis of why the session failed/succeeded.
@@ -44,8 +58,18 @@ class OutcomeAnalysis:
     related_files: list[str] = field(default_factory=list)
     user_feedback_summary: str = ""  # Summary of user's complaint/praise
 
+    def to_dict(self) -> dict:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "root_cause": self.root_cause,
+            "failure_point": self.failure_point,
+            "related_symbols": list(self.related_symbols),
+            "related_files": list(self.related_files),
+            "user_feedback_summary": self.user_feedback_summary,
+        }
+
 
-@dataclass
+@dataclass(slots=True)
 class OutcomeLog:
     """
     A single outcome record.
@@ -78,10 +102,122 @@ class OutcomeLog:
             "trigger_message": self.trigger_message,
         }
         if self.analysis:
-            result["analysis"] = asdict(self.analysis)
+            result["analysis"] = self.analysis.to_dict()
         return result
 
 
+class _SessionIndex:
+    """
+    In-memory index of session_id -> line offsets for one append-only JSONL log.
+
+    The index is extended from the last indexed offset when the file grows,
+    so each byte is parsed for indexing once per process. A file that shrank
+    (truncated or rotated) is re-indexed from the start. Every record read
+    through an offset is checked against its session_id, and the file is
+    re-indexed if one does not match (replaced or rewritten in place).
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.offsets: dict[str, list[int]] = {}
+        self.indexed_size = 0
+
+    def lookup(self, session_id: str) -> list[int]:
+        """Offsets of the lines recorded for session_id, in file order."""
+        self._refresh()
+        return self.offsets.get(session_id, [])
+
+    def _refresh(self) -> None:
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size < self.indexed_size:
+            self.offsets.clear()
+            self.indexed_size = 0
+        if size == self.indexed_size:
+            return
+
+        with open(self.path, "rb") as f:
+            f.seek(self.indexed_size)
+            offset = self.indexed_size
+            for line in f:
+                try:
+                    session_id = _json_loads(line).get("session_id")
+                except (json.JSONDecodeError, UnicodeDecodeError, AttributeError):
+                    if not line.endswith(b"\n"):
+                        break  # Partially written last line; index it once complete
+                    session_id = None
+                if session_id and isinstance(session_id, str):
+                    self.offsets.setdefault(sys.intern(session_id), []).append(offset)
+                offset += len(line)
+        self.indexed_size = offset
+
+    def _reindex(self) -> None:
+        self.offsets.clear()
+        self.indexed_size = 0
+        self._refresh()
+
+    def _seek_records(self, targets: list[tuple[int, str]]) -> list[tuple[str, dict]] | None:
+        """
+        Read the record at each (offset, session_id) target.
+
+        Returns None if a line no longer holds a record of its session.
+        """
+        if not targets:
+            return []
+
+        records = []
+        with open(self.path, "rb") as f:
+            for offset, session_id in targets:
+                f.seek(offset)
+                try:
+                    record = _json_loads(f.readline())
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    return None
+                if not isinstance(record, dict) or record.get("session_id") != session_id:
+                    return None
+                records.append((session_id, record))
+        return records
+
+    def read(self, session_id: str) -> list[dict]:
+        """Records for session_id, read by seeking to the indexed offsets."""
+        records = self._seek_records([(offset, session_id) for offset in self.lookup(session_id)])
+        if records is None:
+            self._reindex()
+            records = self._seek_records(
+                [(offset, session_id) for offset in self.offsets.get(session_id, [])]
+            ) or []
+        return [record for _, record in records]
+
+    def read_latest(self, session_ids: Iterable[str]) -> dict[str, dict]:
+        """Last record of each given session, read by seeking to its indexed offset."""
+        session_ids = list(session_ids)
+        self._refresh()
+        records = self._seek_records(self._latest_targets(session_ids))
+        if records is None:
+            self._reindex()
+            records = self._seek_records(self._latest_targets(session_ids)) or []
+        return dict(records)
+
+    def _latest_targets(self, session_ids: list[str]) -> list[tuple[int, str]]:
+        """(offset, session_id) of each session's last record, in file order."""
+        return sorted(
+            (self.offsets[sid][-1], sid) for sid in session_ids if sid in self.offsets
+        )
+
+
+_session_indexes: dict[Path, _SessionIndex] = {}
+
+
+def _session_index(path: Path) -> _SessionIndex:
+    """Get the (process-wide) session index for a log file."""
+    index = _session_indexes.get(path)
+    if index is None:
+        index = _session_indexes[path] = _SessionIndex(path)
+    return index
+
+
 def ensure_log_dir() -> None:
     """Ensure log directory exists."""
     LOG_DIR.mkdir(parents=True, exist_ok=True)
@@ -125,51 +261,121 @@ def get_outcomes_for_session(session_id: str) -> list[dict]:
     """
     Get all outcomes for a session.
 
-    Used for analysis and debugging.
+    Used for analysis and debugging. Looks records up through the
+    session index instead of scanning the whole log.
     """
     if not OUTCOME_LOG_FILE.exists():
         return []
 
-    outcomes = []
-    with open(OUTCOME_LOG_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                record = json.loads(line)
-                if record.get("session_id") == session_id:
-                    outcomes.append(record)
-            except json.JSONDecodeError:
-                continue
+    return _session_index(OUTCOME_LOG_FILE).read(session_id)
+
+
+def _iter_tail_jsonl(
+    path: Path, limit: int, parse: Callable[[bytes], Any] = _json_loads
+) -> Iterator:
+    """
+    Yield the last `limit` valid records of a JSONL file, newest first.
+
+    Reads fixed-size blocks backwards from the end of the file, so the work
+    is bounded by `limit` rather than by the size of the log. `parse` turns
+    one line into a record (lines it cannot parse are skipped).
+    """
+    count = 0
+    with open(path, "rb") as f:
+        pos = f.seek(0, os.SEEK_END)
+        partial = b""
+        while pos > 0:
+            step = min(LOG_TAIL_BLOCK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            lines = (f.read(step) + partial).split(b"\n")
+            # The first piece may start mid-line until the start of the file is reached
+            partial = lines.pop(0) if pos > 0 else b""
+            for line in reversed(lines):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = parse(line)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    continue
+                yield record
+                count += 1
+                if count >= limit:
+                    return
+
 
-    return outcomes
+def _tail_jsonl(path: Path, limit: int, parse: Callable[[bytes], Any] = _json_loads) -> list:
+    """The last `limit` valid records of a JSONL file, oldest first."""
+    records = list(_iter_tail_jsonl(path, limit, parse))
+    records.reverse()
+    return records
 
 
 def get_recent_outcomes(limit: int = 100) -> list[dict]:
     """
     Get recent outcomes for analysis.
 
-    Returns most recent `limit` records.
+    Returns most recent `limit` records (read from the end of the log).
     """
     if not OUTCOME_LOG_FILE.exists():
         return []
 
+    if limit > 0:
+        return _tail_jsonl(OUTCOME_LOG_FILE, limit)
+
     outcomes = []
-    with open(OUTCOME_LOG_FILE, "r", encoding="utf-8") as f:
+    with open(OUTCOME_LOG_FILE, "rb") as f:
         for line in f:
             line = line.strip()
             if not line:
                 continue
             try:
-                outcomes.append(json.loads(line))
-            except json.JSONDecodeError:
+                outcomes.append(_json_loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
                 continue
 
-    # Return most recent
+    # Non-positive limits keep the slicing semantics of the full read
     return outcomes[-limit:]
 
 
+# The fields read by get_failure_stats, in the order OutcomeLog.to_dict writes them
+_STATS_FIELDS_RE = re.compile(
+    rb'"outcome":\s*"([^"\\]*)",\s*"phase_at_outcome":\s*"([^"\\]*)",\s*'
+    rb'"intent":\s*"([^"\\]*)",\s*"semantic_used":\s*(true|false),\s*'
+    rb'"confidence_was":\s*"([^"\\]*)"'
+)
+
+
+def _parse_stats_fields(line: bytes) -> tuple:
+    """
+    Extract (outcome, intent, phase, semantic_used, confidence) from one line.
+
+    Records written by record_outcome are matched by regex without building
+    the full dict; anything else (escapes, other key order, missing fields)
+    falls back to a full JSON parse.
+    """
+    m = _STATS_FIELDS_RE.search(line)
+    if m:
+        outcome, phase, intent, semantic, confidence = m.groups()
+        return (
+            outcome.decode(),
+            intent.decode(),
+            phase.decode(),
+            semantic == b"true",
+            confidence.decode(),
+        )
+
+    o = _json_loads(line)
+    return (
+        o.get("outcome", "unknown"),
+        o.get("intent", "unknown"),
+        o.get("phase_at_outcome", "unknown"),
+        bool(o.get("semantic_used", False)),
+        o.get("confidence_was", "unknown"),
+    )
+
+
 def get_failure_stats() -> dict:
     """
     Get statistics about failures for improvement analysis.
@@ -180,10 +386,19 @@ def get_failure_stats() -> dict:
     - semantic search usage
     - confidence level
     """
-    outcomes = get_recent_outcomes(limit=1000)
+    # Stream the five fields used below from the recent records (newest first),
+    # tallying each distinct field combination; memory is O(distinct combinations)
+    tally: Counter[tuple] = Counter()
+    oldest_position: dict[tuple, int] = {}
+    if OUTCOME_LOG_FILE.exists():
+        for position, fields in enumerate(
+            _iter_tail_jsonl(OUTCOME_LOG_FILE, 1000, _parse_stats_fields)
+        ):
+            tally[fields] += 1
+            oldest_position[fields] = position
 
     stats = {
-        "total": len(outcomes),
+        "total": sum(tally.values()),
         "by_outcome": {"success": 0, "failure": 0, "partial": 0},
         "by_intent": {},
         "by_phase": {},
@@ -191,37 +406,31 @@ def get_failure_stats() -> dict:
         "confidence_correlation": {"high": {"success": 0, "failure": 0}, "low": {"success": 0, "failure": 0}},
     }
 
-    for o in outcomes:
-        outcome = o.get("outcome", "unknown")
-        intent = o.get("intent", "unknown")
-        phase = o.get("phase_at_outcome", "unknown")
-        semantic = o.get("semantic_used", False)
-        confidence = o.get("confidence_was", "unknown")
+    # Expand into the breakdowns in chronological first-seen order
+    for fields in sorted(oldest_position, key=oldest_position.__getitem__, reverse=True):
+        outcome, intent, phase, semantic, confidence = fields
+        count = tally[fields]
+        # Count by intent / phase (first-seen order)
+        by_intent = stats["by_intent"].setdefault(intent, {"success": 0, "failure": 0, "partial": 0})
+        by_phase = stats["by_phase"].setdefault(phase, {"success": 0, "failure": 0, "partial": 0})
 
         # Count by outcome
-        if outcome in stats["by_outcome"]:
-            stats["by_outcome"][outcome] += 1
-
-        # Count by intent
-        if intent not in stats["by_intent"]:
-            stats["by_intent"][intent] = {"success": 0, "failure": 0, "partial": 0}
-        if outcome in stats["by_intent"][intent]:
-            stats["by_intent"][intent][outcome] += 1
+        if outcome not in stats["by_outcome"]:
+            continue
+        stats["by_outcome"][outcome] += count
+        by_intent[outcome] += count
+        by_phase[outcome] += count
 
-        # Count by phase
-        if phase not in stats["by_phase"]:
-            stats["by_phase"][phase] = {"success": 0, "failure": 0, "partial": 0}
-        if outcome in stats["by_phase"][phase]:
-            stats["by_phase"][phase][outcome] += 1
+        if outcome == "partial":
+            continue
 
         # Semantic search correlation
         semantic_key = "with_semantic" if semantic else "without_semantic"
-        if outcome in ("success", "failure"):
-            stats["semantic_correlation"][semantic_key][outcome] += 1
+        stats["semantic_correlation"][semantic_key][outcome] += count
 
         # Confidence correlation
-        if confidence in ("high", "low") and outcome in ("success", "failure"):
-            stats["confidence_correlation"][confidence][outcome] += 1
+        if confidence in ("high", "low"):
+            stats["confidence_correlation"][confidence][outcome] += count
 
     return stats
 
@@ -255,7 +464,10 @@ def record_decision(decision_log: dict) -> dict:
         ensure_log_dir()
 
         session_id = decision_log.get("session_id", "unknown")
-        timestamp = decision_log.get("timestamp", datetime.now().isoformat())
+        timestamp = (
+            decision_log["timestamp"] if "timestamp" in decision_log
+            else datetime.now().isoformat()
+        )
         record_id = f"decision_{session_id}_{timestamp}"
         decision_log["record_id"] = record_id
 
@@ -286,19 +498,8 @@ def get_decision_for_session(session_id: str) -> dict | None:
     if not DECISION_LOG_FILE.exists():
         return None
 
-    with open(DECISION_LOG_FILE, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                record = json.loads(line)
-                if record.get("session_id") == session_id:
-                    return record
-            except json.JSONDecodeError:
-                continue
-
-    return None
+    records = _session_index(DECISION_LOG_FILE).read(session_id)
+    return records[0] if records else None
 
 
 def get_session_analysis(session_id: str) -> dict:
@@ -348,6 +549,42 @@ def get_session_analysis(session_id: str) -> dict:
     }
 
 
+def _load_decision_index(session_ids: set) -> dict[str, tuple[str, tuple]]:
+    """
+    Map session_id -> (risk_level, tools_planned) for the given sessions.
+
+    Only the fields used by get_improvement_insights are kept. The last
+    decision recorded for a session wins. Records are read through the
+    session index, so only the requested sessions' lines are parsed.
+    """
+    if not session_ids or not DECISION_LOG_FILE.exists():
+        return {}
+
+    # Risk levels and tool names repeat across sessions; share one copy.
+    # Malformed values (null risk level, non-string tools) are tolerated.
+    decisions = {}
+    for sid, record in _session_index(DECISION_LOG_FILE).read_latest(session_ids).items():
+        risk = record.get("risk_level")
+        tools = record.get("tools_planned")
+        decisions[sid] = (
+            sys.intern(risk) if isinstance(risk, str) else "UNKNOWN",
+            tuple(
+                sys.intern(tool) for tool in tools if isinstance(tool, str)
+            ) if isinstance(tools, list) else (),
+        )
+    return decisions
+
+
+def _insight_fields(outcome: dict) -> tuple:
+    """(session_id, outcome, failure_point) of an outcome record."""
+    analysis = outcome.get("analysis")
+    return (
+        outcome.get("session_id"),
+        outcome.get("outcome", "unknown"),
+        analysis.get("failure_point", "unknown") if analysis else None,
+    )
+
+
 def get_improvement_insights(limit: int = 100) -> dict:
     """
     Analyze recent sessions to find improvement opportunities.
@@ -359,63 +596,48 @@ def get_improvement_insights(limit: int = 100) -> dict:
 
     Returns actionable insights for system improvement.
     """
-    # Get recent decisions
-    decisions = {}
-    if DECISION_LOG_FILE.exists():
-        with open(DECISION_LOG_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    record = json.loads(line)
-                    sid = record.get("session_id")
-                    if sid:
-                        decisions[sid] = record
-                except json.JSONDecodeError:
-                    continue
-
-    # Get recent outcomes
-    outcomes = get_recent_outcomes(limit=limit)
+    # Get recent outcomes (only the joined fields), then only the decisions of those sessions
+    if limit > 0 and OUTCOME_LOG_FILE.exists():
+        outcomes = _tail_jsonl(
+            OUTCOME_LOG_FILE, limit, lambda line: _insight_fields(_json_loads(line))
+        )
+    else:
+        outcomes = [_insight_fields(o) for o in get_recent_outcomes(limit=limit)]
+    decisions = _load_decision_index({sid for sid, _, _ in outcomes})
 
     # Match and analyze
-    insights = {
-        "total_sessions_with_outcomes": len(outcomes),
-        "sessions_with_decisions": 0,
-        "tool_failure_correlation": {},
-        "risk_level_correlation": {"HIGH": {"success": 0, "failure": 0},
-                                    "MEDIUM": {"success": 0, "failure": 0},
-                                    "LOW": {"success": 0, "failure": 0}},
-        "common_failure_points": {},
-    }
+    risk_outcomes: Counter[tuple[str, str]] = Counter()
+    tool_failures: Counter[str] = Counter()
+    failure_points: Counter[str] = Counter()
+    sessions_with_decisions = 0
 
-    for outcome in outcomes:
-        sid = outcome.get("session_id")
-        outcome_result = outcome.get("outcome", "unknown")
+    for sid, outcome_result, failure_point in outcomes:
+        decision = decisions.get(sid)
 
-        if sid in decisions:
-            insights["sessions_with_decisions"] += 1
-            decision = decisions[sid]
+        if decision is not None:
+            sessions_with_decisions += 1
+            risk, tools_planned = decision
 
             # Risk level correlation
-            risk = decision.get("risk_level", "UNKNOWN")
-            if risk in insights["risk_level_correlation"]:
-                if outcome_result in ("success", "failure"):
-                    insights["risk_level_correlation"][risk][outcome_result] += 1
+            risk_outcomes[risk, outcome_result] += 1
 
             # Tool failure correlation
             if outcome_result == "failure":
-                for tool in decision.get("tools_planned", []):
-                    if tool not in insights["tool_failure_correlation"]:
-                        insights["tool_failure_correlation"][tool] = 0
-                    insights["tool_failure_correlation"][tool] += 1
+                tool_failures.update(tools_planned)
 
         # Common failure points
-        if outcome_result == "failure" and outcome.get("analysis"):
-            fp = outcome["analysis"].get("failure_point", "unknown")
-            if fp:
-                if fp not in insights["common_failure_points"]:
-                    insights["common_failure_points"][fp] = 0
-                insights["common_failure_points"][fp] += 1
-
-    return insights
+        if outcome_result == "failure" and failure_point:
+            failure_points[failure_point] += 1
+
+    risk_level_correlation = {
+        risk: {result: risk_outcomes[risk, result] for result in ("success", "failure")}
+        for risk in ("HIGH", "MEDIUM", "LOW")
+    }
+
+    return {
+        "total_sessions_with_outcomes": len(outcomes),
+        "sessions_with_decisions": sessions_with_decisions,
+        "tool_failure_correlation": dict(tool_failures),
+        "risk_level_correlation": risk_level_correlation,
+        "common_failure_points": dict(failure_points),
+    }
@@ -4,6 +4,13 @@ import asyncio
 import json
 from pathlib import Path
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # orjson is optional; stdlib json parses the same output, just slower
+    _json_loads = json.loads
+
 
 async def _search_single(
     pattern: str,
@@ -70,11 +77,11 @@ async def _search_single(
 
         # Parse JSON output
         results = []
-        for line in stdout.decode().strip().split("\n"):
+        for line in stdout.splitlines():
             if not line:
                 continue
             try:
-                data = json.loads(line)
+                data = _json_loads(line)
                 if data.get("type") == "match":
                     match_data = data["data"]
                     results.append({
@@ -149,9 +156,10 @@ async def search_text(
             "provided_patterns": pattern
         }
 
-    # Multiple patterns: parallel execution
+    # Multiple patterns: parallel execution (resolve the path only once)
+    search_path_str = str(Path(path).resolve())
     tasks = [
-        _search_single(p, path, file_type, case_sensitive,
+        _search_single(p, search_path_str, file_type, case_sensitive,
                       context_lines, max_results, regex)
         for p in pattern
     ]
@@ -159,7 +167,7 @@ async def search_text(
 
     return {
         "patterns": pattern,
-        "path": str(Path(path).resolve()),
+        "path": search_path_str,
         "results": {
             p: r for p, r in zip(pattern, results)
         },
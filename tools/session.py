@@ -812,6 +812,7 @@ class SessionState:
 
     # v1.7: Ctags Performance Optimization
     definitions_cache: dict[tuple[str, str, str | None, bool], dict] = field(default_factory=dict)
+    ref_def_locs_cache: dict[tuple[str, str, str | None], frozenset[tuple[str, int]]] = field(default_factory=dict)
     cache_stats: dict[str, int] = field(default_factory=lambda: {"hits": 0, "misses": 0})
 
     @property